@@ -2,27 +2,29 @@ from __future__ import annotations
 
 import functools
 import logging
+import resource
 import time
 from datetime import datetime, timedelta
 from typing import Mapping
 
 import sentry_sdk
 from django.conf import settings
-from django.http import HttpResponse
+from django.http import HttpResponse, StreamingHttpResponse
 from django.utils.http import urlquote
 from django.views.decorators.csrf import csrf_exempt
 from pytz import utc
 from rest_framework.authentication import SessionAuthentication
 from rest_framework.exceptions import ParseError
+from rest_framework.renderers import JSONRenderer
 from rest_framework.request import Request
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
-from sentry import analytics, tsdb
+from sentry import analytics, options, tsdb
 from sentry.auth import access
 from sentry.models import Environment
 from sentry.types.ratelimit import RateLimit, RateLimitCategory
-from sentry.utils import json
+from sentry.utils import json, metrics
 from sentry.utils.audit import create_audit_entry
 from sentry.utils.cursors import Cursor
 from sentry.utils.dates import to_datetime
@@ -43,6 +45,9 @@ LINK_HEADER = '<{uri}&cursor={cursor}>; rel="{name}"; results="{has_results}"; c
 
 DEFAULT_AUTHENTICATION = (TokenAuthentication, ApiKeyAuthentication, SessionAuthentication)
 
+# Streamed responses are sent in chunks of about this many bytes.
+STREAM_BUFFER_SIZE = 64 * 1024
+
 logger = logging.getLogger(__name__)
 audit_logger = logging.getLogger("sentry.audit.api")
 api_access_logger = logging.getLogger("sentry.access.api")
@@ -335,6 +340,24 @@ class Endpoint(APIView):
     def respond_with_text(self, text):
         return self.respond({"text": text})
 
+    def respond_stream(self, results, status=200):
+        """
+        Respond with a JSON list of `results`, an iterable of serialized
+        objects such as the one returned by `serialize_iter`.
+
+        For endpoints listed in the `api.stream-responses` option, the list is
+        encoded and sent while it is iterated, instead of being built in
+        memory first.
+        """
+        if type(self).__name__ not in options.get("api.stream-responses"):
+            return self.respond(list(results), status=status)
+
+        return StreamingHttpResponse(
+            stream_json_list(results, type(self).__name__, start=time.time()),
+            status=status,
+            content_type="application/json",
+        )
+
     def get_per_page(self, request: Request, default_per_page=100, max_per_page=100):
         try:
             per_page = int(request.GET.get("per_page", default_per_page))
@@ -403,6 +426,53 @@ class Endpoint(APIView):
         return response
 
 
+def stream_json_list(items, name, start=None, buffer_size=STREAM_BUFFER_SIZE):
+    """
+    Encode `items` as a JSON list, yielding chunks of about `buffer_size`
+    bytes. The output is the same as that of rendering a `Response` of the list.
+    Time to first byte is measured from `start`, which defaults to the time
+    the first chunk is requested.
+    """
+    renderer = JSONRenderer()
+    if start is None:
+        start = time.time()
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    tags = {"endpoint": name}
+
+    first_chunk = True
+    buffer = [b"["]
+    buffered = 1
+    try:
+        for i, item in enumerate(items):
+            if i > 0:
+                buffer.append(b",")
+            encoded = renderer.render(item)
+            buffer.append(encoded)
+            buffered += len(encoded) + 1
+
+            if buffered >= buffer_size:
+                if first_chunk:
+                    metrics.timing("api.stream.time_to_first_byte", time.time() - start, tags=tags)
+                    first_chunk = False
+                yield b"".join(buffer)
+                buffer = []
+                buffered = 0
+
+        buffer.append(b"]")
+        if first_chunk:
+            metrics.timing("api.stream.time_to_first_byte", time.time() - start, tags=tags)
+        yield b"".join(buffer)
+    finally:
+        metrics.timing("api.stream.duration", time.time() - start, tags=tags)
+        # The peak memory usage of the process only grows if this response
+        # exceeded all previous peaks.
+        metrics.timing(
+            "api.stream.max_rss_increase",
+            resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - max_rss,
+            tags=tags,
+        )
+
+
 class EnvironmentMixin:
     def _get_environment_func(self, request: Request, organization_id):
         """\
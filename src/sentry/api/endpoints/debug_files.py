@@ -3,6 +3,7 @@ import posixpath
 import re
 
 import jsonschema
+from django.conf import settings
 from django.db import router
 from django.db.models import Q
 from django.http import Http404, HttpResponse, StreamingHttpResponse
@@ -100,7 +101,7 @@ class DebugFilesEndpoint(ProjectEndpoint):
             raise Http404
 
         try:
-            fp = debug_file.file.getfile()
+            fp = debug_file.file.getfile(read_ahead=settings.SENTRY_FILE_READ_AHEAD_BLOBS)
             response = StreamingHttpResponse(
                 iter(lambda: fp.read(4096), b""), content_type="application/octet-stream"
             )
@@ -39,7 +39,10 @@ class GroupSimilarIssuesEndpoint(GroupEndpoint):
         group_ids = []
         group_scores = []
 
-        for group_id, scores in features.compare(group, limit=limit):
+        # Use the batched query path, which allows similarity results to be
+        # briefly cached for each group by the index.
+        [similar] = features.compare_many([group], limit=limit)
+        for group_id, scores in similar:
             if group_id != group.id:
                 group_ids.append(group_id)
                 group_scores.append(scores)
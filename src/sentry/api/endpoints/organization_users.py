@@ -4,7 +4,7 @@ from rest_framework.response import Response
 
 from sentry.api.base import EnvironmentMixin
 from sentry.api.bases.organization import OrganizationEndpoint
-from sentry.api.serializers import serialize
+from sentry.api.serializers import serialize_iter
 from sentry.api.serializers.models import OrganizationMemberWithProjectsSerializer
 from sentry.models import OrganizationMember, OrganizationMemberTeam, ProjectTeam
 
@@ -46,8 +46,8 @@ class OrganizationUsersEndpoint(OrganizationEndpoint, EnvironmentMixin):
             span.set_data("Project Count", len(projects))
             span.set_data("Member Count", len(organization_members))
 
-        return Response(
-            serialize(
+        return self.respond_stream(
+            serialize_iter(
                 organization_members,
                 request.user,
                 serializer=OrganizationMemberWithProjectsSerializer(
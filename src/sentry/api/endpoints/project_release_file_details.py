@@ -2,6 +2,7 @@ import posixpath
 from typing import Optional
 from zipfile import ZipFile
 
+from django.conf import settings
 from django.http.response import FileResponse
 from rest_framework import serializers
 from rest_framework.exceptions import ParseError
@@ -49,7 +50,7 @@ class ReleaseFileDetailsMixin:
     @staticmethod
     def download(releasefile):
         file = releasefile.file
-        fp = file.getfile()
+        fp = file.getfile(read_ahead=settings.SENTRY_FILE_READ_AHEAD_BLOBS)
         response = FileResponse(
             fp,
             content_type=file.headers.get("content-type", "application/octet-stream"),
@@ -66,7 +67,9 @@ class ReleaseFileDetailsMixin:
 
         # Do not use ReleaseFileCache here, we view download as a singular event
         archive_file = ReleaseFile.objects.get(release_id=release.id, ident=archive_ident)
-        archive = ZipFile(archive_file.file.getfile())
+        archive = ZipFile(
+            archive_file.file.getfile(read_ahead=settings.SENTRY_FILE_READ_AHEAD_BLOBS)
+        )
         fp = archive.open(entry["filename"])
         headers = entry.get("headers", {})
 
@@ -1,6 +1,8 @@
 from typing import (
     Any,
     Callable,
+    Iterable,
+    Iterator,
     List,
     Mapping,
     MutableMapping,
@@ -14,10 +16,13 @@ from typing import (
 import sentry_sdk
 from django.contrib.auth.models import AnonymousUser
 
+from sentry.utils.iterators import chunked
 from sentry.utils.json import JSONData
 
 K = TypeVar("K")
 
+STREAMING_CHUNK_SIZE = 100
+
 registry: MutableMapping[Any, Any] = {}
 
 
@@ -85,6 +90,25 @@ def serialize(
             return [serializer(o, attrs=attrs.get(o, {}), user=user, **kwargs) for o in objects]
 
 
+def serialize_iter(
+    objects: Iterable[Any],
+    user: Optional[Any] = None,
+    serializer: Optional[Any] = None,
+    chunk_size: int = STREAMING_CHUNK_SIZE,
+    **kwargs: Any,
+) -> Iterator[Any]:
+    """
+    Lazily turn an iterable of models into python objects made entirely of primitives.
+
+    Unlike `serialize`, `objects` are serialized in chunks of `chunk_size`
+    with one call to `get_attrs` per chunk, so that only a single chunk of
+    serialized objects is held in memory at a time. See `serialize` for the
+    other parameters.
+    """
+    for chunk in chunked(objects, chunk_size):
+        yield from serialize(chunk, user=user, serializer=serializer, **kwargs)
+
+
 class Serializer:
     """A Serializer class contains the logic to serialize a specific type of object."""
 
@@ -60,3 +60,41 @@ class RedisClusterCache(CommonRedisCache):
     def __init__(self, cluster_id, **options):
         client = redis_clusters.get(cluster_id)
         CommonRedisCache.__init__(self, client=client, **options)
+
+    def get_many(self, keys, version=None, raw=False):
+        keys = list(keys)
+        with self.client.pipeline(transaction=False) as pipeline:
+            for key in keys:
+                pipeline.get(self.make_key(key, version=version))
+            values = pipeline.execute()
+
+        self._mark_transaction("get")
+
+        return {
+            key: value if raw else json.loads(value)
+            for key, value in zip(keys, values)
+            if value is not None
+        }
+
+    def set_many(self, items, timeout, version=None, raw=False):
+        with self.client.pipeline(transaction=False) as pipeline:
+            for key, value in items.items():
+                key = self.make_key(key, version=version)
+                v = json.dumps(value) if not raw else value
+                if len(v) > self.max_size:
+                    raise ValueTooLarge(f"Cache key too large: {key!r} {len(v)!r}")
+                if timeout:
+                    pipeline.setex(key, int(timeout), v)
+                else:
+                    pipeline.set(key, v)
+            pipeline.execute()
+
+        self._mark_transaction("set")
+
+    def delete_many(self, keys, version=None):
+        with self.client.pipeline(transaction=False) as pipeline:
+            for key in keys:
+                pipeline.delete(self.make_key(key, version=version))
+            pipeline.execute()
+
+        self._mark_transaction("delete")
@@ -604,6 +604,7 @@ CELERY_QUEUES = [
     Queue("digests.delivery", routing_key="digests.delivery"),
     Queue("digests.scheduling", routing_key="digests.scheduling"),
     Queue("email", routing_key="email"),
+    Queue("events.post_process_deferred_stage", routing_key="events.post_process_deferred_stage"),
     Queue("events.preprocess_event", routing_key="events.preprocess_event"),
     Queue("events.process_event", routing_key="events.process_event"),
     Queue("events.reprocess_events", routing_key="events.reprocess_events"),
@@ -1308,6 +1309,19 @@ SENTRY_ATTACHMENTS_OPTIONS = {}
 SENTRY_EVENT_PROCESSING_STORE = "sentry.eventstore.processing.default.DefaultEventProcessingStore"
 SENTRY_EVENT_PROCESSING_STORE_OPTIONS = {}
 
+# Number of threads each worker uses to run independent stages of
+# `post_process_group` concurrently. 0 runs all stages in sequence.
+SENTRY_POST_PROCESS_STAGE_WORKERS = 4
+
+# Budgets (in seconds) for stages of `post_process_group` that don't affect
+# alerting. A stage that has recently been slower than its budget is deferred
+# to a follow-up task.
+SENTRY_POST_PROCESS_STAGE_BUDGETS = {
+    "suspect_commits": 0.5,
+    "plugins": 1.0,
+    "similarity": 0.5,
+}
+
 # The internal Django cache is still used in many places
 # TODO(dcramer): convert uses over to Sentry's backend
 CACHES = {"default": {"BACKEND": "django.core.cache.backends.dummy.DummyCache"}}
@@ -1451,6 +1465,18 @@ SENTRY_SOURCE_FETCH_SOCKET_TIMEOUT = 2
 # Maximum content length for source files before we abort fetching
 SENTRY_SOURCE_FETCH_MAX_SIZE = 40 * 1024 * 1024
 
+# Total size (in bytes) of the raw source files and source maps whose parsed
+# representations each worker keeps in memory across events. 0 disables it.
+SENTRY_JS_PARSED_SOURCE_CACHE_SIZE = 256 * 1024 * 1024
+
+# Number of frame grouping components each worker keeps in memory across events,
+# so that frames seen before are not grouped again. 0 disables it.
+SENTRY_GROUPING_FRAME_CACHE_SIZE = 50000
+
+# Number of blobs fetched in the background ahead of the read position when
+# streaming large files (release archives, debug files). 0 disables it.
+SENTRY_FILE_READ_AHEAD_BLOBS = 4
+
 # Maximum content length for cache value.  Currently used only to avoid
 # pointless compression of sourcemaps and other release files because we
 # silently fail to cache the compressed result anyway.  Defaults to None which
@@ -2344,6 +2370,17 @@ SYMBOLICATOR_POLL_TIMEOUT = 10
 # max number of second to wait between subsequent attempts.
 SYMBOLICATOR_MAX_RETRY_AFTER = 5
 
+# When querying symbolicator for the result of a pending request, let
+# symbolicator hold on to the query for up to this many seconds until the
+# result is ready, instead of sleeping between short polls. Set to 0 to disable
+# long polling.
+SYMBOLICATOR_LONG_POLL_TIMEOUT = 30
+
+# Reuse the symbolication result of native events for this many seconds for
+# other events of the same project with identical stack traces and modules.
+# Set to 0 to disable.
+SYMBOLICATOR_PAYLOAD_CACHE_TTL = 60
+
 SENTRY_REQUEST_METRIC_ALLOWED_PATHS = (
     "sentry.web.api",
     "sentry.web.frontend",
@@ -2365,6 +2402,8 @@ SENTRY_SYNTHETIC_MONITORING_PROJECT_ID = None
 SENTRY_SIMILARITY_INDEX_REDIS_CLUSTER = "default"
 # Similarity-v2: uses grouping components for diffing (None = fallback to setting for v1)
 SENTRY_SIMILARITY2_INDEX_REDIS_CLUSTER = None
+# How long (in seconds) batched similarity query results are cached for each group
+SENTRY_SIMILARITY_RESULT_CACHE_TTL = 60
 
 # The grouping strategy to use for driving similarity-v2. You can add multiple
 # strategies here to index them all. This is useful for transitioning a
@@ -2405,7 +2444,11 @@ SENTRY_REPROCESSING_REMAINING_EVENTS_BUF_SIZE = 500
 
 # Which backend to use for RealtimeMetricsStore.
 #
-# Currently, only redis is supported.
+# Currently, only redis is supported, either with bucketed metrics
+# (sentry.processing.realtime_metrics.redis.RedisRealtimeMetricsStore) or with
+# decayed rates and duration sketches that allow computing the LPQ for all
+# projects at once
+# (sentry.processing.realtime_metrics.decaying.DecayingRedisRealtimeMetricsStore).
 SENTRY_REALTIME_METRICS_BACKEND = (
     "sentry.processing.realtime_metrics.dummy.DummyRealtimeMetricsStore"
 )
@@ -6,6 +6,9 @@ MAX_FRAGMENTS_PER_BATCH = 10
 EXPORTED_ROWS_LIMIT = 10000000
 SNUBA_MAX_RESULTS = 10000
 DEFAULT_EXPIRATION = timedelta(weeks=4)
+# Blobs of parallel export fragments are placed at offsets this far apart, which
+# is larger than any export file.
+FRAGMENT_OFFSET_STRIDE = 2 ** 40
 
 
 class ExportError(Exception):
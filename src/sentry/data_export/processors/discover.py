@@ -2,7 +2,7 @@ import logging
 
 from sentry.api.utils import get_date_range_from_params
 from sentry.models import Environment, Group, Project
-from sentry.search.events.fields import get_function_alias
+from sentry.search.events.fields import get_function_alias, is_function
 from sentry.snuba import discover
 from sentry.utils.compat import map
 
@@ -10,6 +10,12 @@ from ..base import ExportError
 
 logger = logging.getLogger(__name__)
 
+# Sorts of queries which can be exported with a keyset cursor on (timestamp, id)
+KEYSET_ORDERBYS = {
+    "timestamp": ["timestamp", "id"],
+    "-timestamp": ["-timestamp", "-id"],
+}
+
 
 class DiscoverProcessor:
     """
@@ -46,6 +52,19 @@ class DiscoverProcessor:
             sort=discover_query.get("sort"),
             use_snql=discover_query.get("use_snql", False),
         )
+        self.keyset_orderby = self.get_keyset_orderby(
+            fields=discover_query["field"],
+            equations=equations,
+            sort=discover_query.get("sort"),
+        )
+        if self.keyset_orderby is not None:
+            self.keyset_data_fn = self.get_keyset_data_fn(
+                fields=discover_query["field"],
+                query=discover_query["query"],
+                params=self.params,
+                orderby=self.keyset_orderby,
+                use_snql=discover_query.get("use_snql", False),
+            )
 
     @staticmethod
     def get_projects(organization_id, query):
@@ -95,6 +114,41 @@ class DiscoverProcessor:
 
         return data_fn
 
+    @staticmethod
+    def get_keyset_orderby(fields, equations, sort):
+        """
+        Returns the order in which a query is exported with a keyset cursor, or
+        None if the query cannot be. This requires a query without aggregates,
+        which is either unsorted or sorted by timestamp.
+        """
+        if equations or any(is_function(field) for field in fields):
+            return None
+        if isinstance(sort, (list, tuple)):
+            if len(sort) > 1:
+                return None
+            sort = sort[0] if sort else None
+        return KEYSET_ORDERBYS.get(sort or "-timestamp")
+
+    @staticmethod
+    def get_keyset_data_fn(fields, query, params, orderby, use_snql=False):
+        # the keyset cursor needs the timestamp of every row
+        selected_columns = fields + [f for f in ("timestamp", "id") if f not in fields]
+
+        def data_fn(start, end, offset, limit):
+            return discover.query(
+                selected_columns=selected_columns,
+                query=query,
+                params={**params, "start": start, "end": end},
+                offset=offset,
+                orderby=orderby,
+                limit=limit,
+                referrer="data_export.tasks.discover.keyset",
+                auto_fields=True,
+                use_snql=use_snql,
+            )
+
+        return data_fn
+
     def handle_fields(self, result_list):
         # Find issue short_id if present
         # (originally in `/api/bases/organization_events.py`)
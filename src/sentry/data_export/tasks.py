@@ -1,16 +1,20 @@
 import codecs
 import csv
+import itertools
 import logging
 import tempfile
 from hashlib import sha1
+from io import BytesIO
 
 import sentry_sdk
 from celery.exceptions import MaxRetriesExceededError
 from celery.task import current
+from dateutil.parser import parse as parse_datetime
 from django.core.files.base import ContentFile
 from django.db import IntegrityError, router
 from django.utils import timezone
 
+from sentry import options
 from sentry.models import (
     DEFAULT_BLOB_SIZE,
     MAX_FILE_SIZE,
@@ -20,12 +24,14 @@ from sentry.models import (
     FileBlobIndex,
 )
 from sentry.tasks.base import instrumented_task
-from sentry.utils import metrics
+from sentry.utils import metrics, redis
+from sentry.utils.dates import to_datetime, to_timestamp
 from sentry.utils.db import atomic_transaction
 from sentry.utils.sdk import capture_exception
 
 from .base import (
     EXPORTED_ROWS_LIMIT,
+    FRAGMENT_OFFSET_STRIDE,
     MAX_BATCH_SIZE,
     MAX_FRAGMENTS_PER_BATCH,
     SNUBA_MAX_RESULTS,
@@ -40,6 +46,22 @@ from .utils import handle_snuba_errors
 logger = logging.getLogger(__name__)
 
 
+def set_export_scope(data_export):
+    with sentry_sdk.configure_scope() as scope:
+        if data_export.user:
+            user = {}
+            if data_export.user.id:
+                user["id"] = data_export.user.id
+            if data_export.user.username:
+                user["username"] = data_export.user.username
+            if data_export.user.email:
+                user["email"] = data_export.user.email
+            scope.user = user
+        scope.set_tag("organization.slug", data_export.organization.slug)
+        scope.set_tag("export.type", ExportQueryType.as_str(data_export.query_type))
+        scope.set_extra("export.query", data_export.query_info)
+
+
 @instrumented_task(
     name="sentry.data_export.tasks.assemble_download",
     queue="data_export",
@@ -76,19 +98,7 @@ def assemble_download(
             logger.exception(error)
             return
 
-        with sentry_sdk.configure_scope() as scope:
-            if data_export.user:
-                user = {}
-                if data_export.user.id:
-                    user["id"] = data_export.user.id
-                if data_export.user.username:
-                    user["username"] = data_export.user.username
-                if data_export.user.email:
-                    user["email"] = data_export.user.email
-                scope.user = user
-            scope.set_tag("organization.slug", data_export.organization.slug)
-            scope.set_tag("export.type", ExportQueryType.as_str(data_export.query_type))
-            scope.set_extra("export.query", data_export.query_info)
+        set_export_scope(data_export)
 
         base_bytes_written = bytes_written
 
@@ -101,6 +111,12 @@ def assemble_download(
 
             processor = get_processor(data_export, environment_id)
 
+            fragment_count = get_keyset_fragment_count(data_export, processor, export_limit)
+            if first_page and fragment_count:
+                return start_keyset_export(
+                    data_export, processor, fragment_count, export_limit, batch_size
+                )
+
             with tempfile.TemporaryFile(mode="w+b") as tf:
                 # XXX(python3):
                 #
@@ -206,6 +222,222 @@ def assemble_download(
                 merge_export_blobs.delay(data_export_id)
 
 
+def get_keyset_fragment_count(data_export, processor, export_limit):
+    """
+    Returns the number of fragments to export in parallel with a keyset
+    cursor, or 0 if the export is paged through with offsets.
+    """
+    if data_export.query_type != ExportQueryType.DISCOVER or processor.keyset_orderby is None:
+        return 0
+    fragment_count = options.get("data-export.keyset-fragments")
+    # row limits cannot be split between fragments
+    if export_limit < EXPORTED_ROWS_LIMIT:
+        return min(fragment_count, 1)
+    return fragment_count
+
+
+def _get_fragments_done_key(data_export_id):
+    return f"data-export:fragments-done:{data_export_id}"
+
+
+def start_keyset_export(data_export, processor, fragment_count, export_limit, batch_size):
+    """
+    Partitions the time range of the export into `fragment_count` fragments,
+    which are exported in parallel in order of the processor's keyset sort.
+    """
+    redis.clusters.get("default").get_local_client_for_key(
+        _get_fragments_done_key(data_export.id)
+    ).delete(_get_fragments_done_key(data_export.id))
+
+    start = to_timestamp(processor.start)
+    step = (to_timestamp(processor.end) - start) / fragment_count
+    bounds = [start + step * i for i in range(fragment_count)] + [to_timestamp(processor.end)]
+    fragments = list(zip(bounds, bounds[1:]))
+    if processor.keyset_orderby[0].startswith("-"):
+        fragments.reverse()
+
+    metrics.incr("dataexport.keyset.start", sample_rate=1.0)
+    for fragment, (fragment_start, fragment_end) in enumerate(fragments):
+        assemble_download_fragment.delay(
+            data_export.id,
+            fragment=fragment,
+            fragment_count=fragment_count,
+            start=fragment_start,
+            end=fragment_end,
+            export_limit=export_limit,
+            batch_size=batch_size,
+        )
+
+
+@instrumented_task(
+    name="sentry.data_export.tasks.assemble_download_fragment",
+    queue="data_export",
+    default_retry_delay=60,
+    max_retries=3,
+    acks_late=True,
+)
+def assemble_download_fragment(
+    data_export_id,
+    fragment,
+    fragment_count,
+    start,
+    end,
+    export_limit=EXPORTED_ROWS_LIMIT,
+    batch_size=SNUBA_MAX_RESULTS,
+    cursor=None,
+    rows_written=0,
+    bytes_written=0,
+    export_retries=3,
+    countdown=60,
+    **kwargs,
+):
+    """
+    Exports the rows of a discover query between `start` and `end` with a
+    keyset cursor, see `process_discover_keyset`. The CSV is streamed into
+    blobs placed at `fragment * FRAGMENT_OFFSET_STRIDE`, so that
+    `merge_export_blobs` only has to concatenate the blobs of all fragments.
+    """
+    with sentry_sdk.start_span(op="assemble.fragment"):
+        try:
+            data_export = ExportedData.objects.get(id=data_export_id)
+            logger.info(
+                "dataexport.run",
+                extra={"data_export_id": data_export_id, "fragment": fragment, "cursor": cursor},
+            )
+        except ExportedData.DoesNotExist as error:
+            logger.exception(error)
+            return
+
+        set_export_scope(data_export)
+
+        base_cursor = cursor
+        base_rows_written = rows_written
+        base_bytes_written = bytes_written
+
+        try:
+            processor = get_processor(data_export, None)
+
+            blob_writer = ExportBlobWriter(
+                data_export, FRAGMENT_OFFSET_STRIDE * fragment + bytes_written
+            )
+            writer = csv.DictWriter(
+                codecs.getwriter("utf-8")(blob_writer),
+                processor.header_fields,
+                extrasaction="ignore",
+            )
+            if fragment == 0 and cursor is None:
+                writer.writeheader()
+
+            rows = []
+            for _ in range(MAX_FRAGMENTS_PER_BATCH):
+                fragment_row_count = min(batch_size, max(export_limit - rows_written, 1))
+
+                rows, cursor = process_discover_keyset(
+                    processor, to_datetime(start), to_datetime(end), cursor, fragment_row_count
+                )
+                writer.writerows(rows)
+                rows_written += len(rows)
+
+                if not rows or len(rows) < batch_size or blob_writer.tell() >= MAX_BATCH_SIZE:
+                    break
+
+            blob_writer.close()
+            bytes_written += blob_writer.tell()
+        except ExportError as error:
+            if error.recoverable and export_retries > 0:
+                # The retry starts from the same cursor with a smaller batch size, so
+                # it stores different blobs.
+                _delete_fragment_blobs(data_export, fragment, base_bytes_written)
+                assemble_download_fragment.apply_async(
+                    args=[data_export_id],
+                    kwargs={
+                        "fragment": fragment,
+                        "fragment_count": fragment_count,
+                        "start": start,
+                        "end": end,
+                        "export_limit": export_limit,
+                        "batch_size": batch_size // 2,
+                        "cursor": base_cursor,
+                        "rows_written": base_rows_written,
+                        "bytes_written": base_bytes_written,
+                        "export_retries": export_retries - 1,
+                    },
+                    countdown=countdown,
+                )
+            else:
+                return data_export.email_failure(message=str(error))
+        except Exception as error:
+            metrics.incr("dataexport.error", tags={"error": str(error)}, sample_rate=1.0)
+            logger.error(
+                "dataexport.error: %s",
+                str(error),
+                extra={"query": data_export.payload, "org": data_export.organization_id},
+            )
+            capture_exception(error)
+
+            try:
+                _delete_fragment_blobs(data_export, fragment, base_bytes_written)
+                current.retry()
+            except MaxRetriesExceededError:
+                metrics.incr(
+                    "dataexport.end",
+                    tags={"success": False, "error": str(error)},
+                    sample_rate=1.0,
+                )
+                return data_export.email_failure(message="Internal processing failure")
+        else:
+            if (
+                rows
+                and len(rows) >= batch_size
+                and rows_written < export_limit
+                and bytes_written < min(MAX_FILE_SIZE, 2 ** 30)
+            ):
+                assemble_download_fragment.apply_async(
+                    args=[data_export_id],
+                    kwargs={
+                        "fragment": fragment,
+                        "fragment_count": fragment_count,
+                        "start": start,
+                        "end": end,
+                        "export_limit": export_limit,
+                        "batch_size": batch_size,
+                        "cursor": cursor,
+                        "rows_written": rows_written,
+                        "bytes_written": bytes_written,
+                        "export_retries": export_retries,
+                    },
+                    countdown=3,
+                )
+                return
+
+            metrics.timing("dataexport.fragment.row_count", rows_written, sample_rate=1.0)
+            metrics.timing("dataexport.fragment.file_size", bytes_written, sample_rate=1.0)
+
+            key = _get_fragments_done_key(data_export_id)
+            client = redis.clusters.get("default").get_local_client_for_key(key)
+            # A set, so that a fragment completed twice (e.g. redelivered) is counted once.
+            with client.pipeline() as pipeline:
+                pipeline.sadd(key, fragment)
+                pipeline.scard(key)
+                pipeline.expire(key, 60 * 60 * 24)
+                added, fragments_done, _ = pipeline.execute()
+
+            if added and fragments_done == fragment_count:
+                merge_export_blobs.delay(data_export_id, verify_checksums=False)
+
+
+def _delete_fragment_blobs(data_export, fragment, bytes_written):
+    """
+    Deletes the blobs a fragment has stored past `bytes_written`, before they are
+    written again by a retry.
+    """
+    ExportedDataBlob.objects.filter(
+        data_export=data_export,
+        offset__gte=FRAGMENT_OFFSET_STRIDE * fragment + bytes_written,
+        offset__lt=FRAGMENT_OFFSET_STRIDE * (fragment + 1),
+    ).delete()
+
+
 def get_processor(data_export, environment_id):
     try:
         if data_export.query_type == ExportQueryType.ISSUES_BY_TAG:
@@ -260,10 +492,90 @@ def process_discover(processor, limit, offset):
     return processor.handle_fields(raw_data_unicode)
 
 
+@handle_snuba_errors(logger)
+def process_discover_keyset(processor, start, end, cursor, limit):
+    """
+    Fetches the next `limit` rows between `start` and `end`, in the order of
+    (timestamp, id) given by the processor, following `cursor`.
+
+    Snuba timestamps have a resolution of seconds, so instead of the id of the
+    last row, the cursor holds the timestamp of the last row and the number
+    of rows exported with that timestamp. Only those rows are skipped with an
+    offset. Returns the rows and the cursor following them.
+    """
+    descending = processor.keyset_orderby[0].startswith("-")
+    offset = 0
+    if cursor is not None:
+        cursor_timestamp, offset = cursor
+        if descending:
+            end = min(end, to_datetime(cursor_timestamp + 1))
+        else:
+            start = max(start, to_datetime(cursor_timestamp))
+
+    rows = processor.keyset_data_fn(start=start, end=end, offset=offset, limit=limit)["data"]
+    if not rows:
+        return rows, cursor
+
+    last_timestamp = to_timestamp(parse_datetime(rows[-1]["timestamp"]))
+    same_timestamp = 0
+    for row in reversed(rows):
+        if to_timestamp(parse_datetime(row["timestamp"])) != last_timestamp:
+            break
+        same_timestamp += 1
+    if cursor is not None and cursor[0] == last_timestamp:
+        same_timestamp += cursor[1]
+
+    return processor.handle_fields(rows), [last_timestamp, same_timestamp]
+
+
 class ExportDataFileTooBig(Exception):
     pass
 
 
+class ExportBlobWriter:
+    """
+    A binary file-like object storing everything written to it as blobs of
+    `blob_size` bytes. Blobs are recorded as ExportedDataBlobs starting at
+    `offset`, the last one is stored on `close`.
+    """
+
+    def __init__(self, data_export, offset, blob_size=DEFAULT_BLOB_SIZE):
+        self.data_export = data_export
+        self.offset = offset
+        self.blob_size = blob_size
+        self.buffer = BytesIO()
+        self.bytes_stored = 0
+
+    def tell(self):
+        return self.bytes_stored + self.buffer.tell()
+
+    def write(self, data):
+        self.buffer.write(data)
+        if self.buffer.tell() >= self.blob_size:
+            self._store_blobs(final=False)
+
+    def close(self):
+        self._store_blobs(final=True)
+
+    def _store_blobs(self, final):
+        contents = self.buffer.getvalue()
+        end = len(contents) if final else len(contents) - len(contents) % self.blob_size
+        for chunk_start in range(0, end, self.blob_size):
+            blob = FileBlob.from_file(
+                ContentFile(contents[chunk_start : min(chunk_start + self.blob_size, end)]),
+                logger=logger,
+            )
+            ExportedDataBlob.objects.get_or_create(
+                data_export=self.data_export,
+                blob_id=blob.id,
+                offset=self.offset + self.bytes_stored,
+            )
+            self.bytes_stored += blob.size
+
+        self.buffer = BytesIO()
+        self.buffer.write(contents[end:])
+
+
 def store_export_chunk_as_blob(data_export, bytes_written, fileobj, blob_size=DEFAULT_BLOB_SIZE):
     try:
         with atomic_transaction(
@@ -296,8 +608,39 @@ def store_export_chunk_as_blob(data_export, bytes_written, fileobj, blob_size=DE
         return 0
 
 
+def _get_blobs_within_size_limit(data_export, export_blobs, blobs):
+    """
+    Fragments of keyset exports are limited to the maximum file size individually,
+    so together they may exceed it. Whole fragments past the limit are left out,
+    which keeps the file a valid CSV of the first rows of the export.
+    """
+    size_limit = min(MAX_FILE_SIZE, 2 ** 30)
+    included = []
+    size = 0
+    fragments = itertools.groupby(export_blobs, lambda b: b.offset // FRAGMENT_OFFSET_STRIDE)
+    for fragment, fragment_blobs in fragments:
+        fragment_blobs = list(fragment_blobs)
+        fragment_size = sum(blobs[b.blob_id].size for b in fragment_blobs)
+        if included and size + fragment_size > size_limit:
+            metrics.incr("dataexport.truncated", sample_rate=1.0)
+            logger.info(
+                "dataexport.truncated",
+                extra={"data_export_id": data_export.id, "fragment": fragment, "size": size},
+            )
+            break
+        included.extend(fragment_blobs)
+        size += fragment_size
+    return included
+
+
 @instrumented_task(name="sentry.data_export.tasks.merge_blobs", queue="data_export", acks_late=True)
-def merge_export_blobs(data_export_id, **kwargs):
+def merge_export_blobs(data_export_id, verify_checksums=True, **kwargs):
+    """
+    Assembles the blobs of an export into its file.
+
+    Unless `verify_checksums` is set, blobs are only concatenated without
+    reading them, and the file has no checksum.
+    """
     with sentry_sdk.start_span(op="merge"):
         try:
             data_export = ExportedData.objects.get(id=data_export_id)
@@ -305,19 +648,7 @@ def merge_export_blobs(data_export_id, **kwargs):
             logger.exception(error)
             return
 
-        with sentry_sdk.configure_scope() as scope:
-            if data_export.user:
-                user = {}
-                if data_export.user.id:
-                    user["id"] = data_export.user.id
-                if data_export.user.username:
-                    user["username"] = data_export.user.username
-                if data_export.user.email:
-                    user["email"] = data_export.user.email
-                scope.user = user
-            scope.set_tag("organization.slug", data_export.organization.slug)
-            scope.set_tag("export.type", ExportQueryType.as_str(data_export.query_type))
-            scope.set_extra("export.query", data_export.query_info)
+        set_export_scope(data_export)
 
         # adapted from `putfile` in  `src/sentry/models/file.py`
         try:
@@ -335,12 +666,18 @@ def merge_export_blobs(data_export_id, **kwargs):
                 size = 0
                 file_checksum = sha1(b"")
 
-                for export_blob in ExportedDataBlob.objects.filter(
-                    data_export=data_export
-                ).order_by("offset"):
-                    blob = FileBlob.objects.get(pk=export_blob.blob_id)
+                export_blobs = list(
+                    ExportedDataBlob.objects.filter(data_export=data_export).order_by("offset")
+                )
+                blobs = FileBlob.objects.in_bulk({b.blob_id for b in export_blobs})
+
+                for export_blob in _get_blobs_within_size_limit(data_export, export_blobs, blobs):
+                    blob = blobs[export_blob.blob_id]
                     FileBlobIndex.objects.create(file=file, blob=blob, offset=size)
                     size += blob.size
+                    if not verify_checksums:
+                        continue
+
                     blob_checksum = sha1(b"")
 
                     for chunk in blob.getfile().chunks():
@@ -351,7 +688,7 @@ def merge_export_blobs(data_export_id, **kwargs):
                         raise AssembleChecksumMismatch("Checksum mismatch")
 
                 file.size = size
-                file.checksum = file_checksum.hexdigest()
+                file.checksum = file_checksum.hexdigest() if verify_checksums else None
                 file.save()
 
                 # This is in a separate atomic transaction because in prod, files exist
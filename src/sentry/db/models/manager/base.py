@@ -2,7 +2,17 @@ import logging
 import threading
 import weakref
 from contextlib import contextmanager
-from typing import Any, Generator, Generic, Mapping, MutableMapping, Optional, Sequence, Tuple
+from typing import (
+    Any,
+    Callable,
+    Generator,
+    Generic,
+    Mapping,
+    MutableMapping,
+    Optional,
+    Sequence,
+    Tuple,
+)
 
 from django.conf import settings
 from django.db import router
@@ -24,6 +34,57 @@ _local_cache_generation = 0
 _local_cache_enabled = False
 
 
+class _SingleFlight:
+    """
+    Ensures that only one thread in this process runs a function for a given
+    key at a time. Threads that call `do` while a call for the same key is
+    in flight wait for it to complete instead of running the function.
+    """
+
+    class _Call:
+        def __init__(self) -> None:
+            self.done = threading.Event()
+            self.error: Optional[BaseException] = None
+            self.waiters = 0
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._calls: MutableMapping[str, "_SingleFlight._Call"] = {}
+
+    def do(self, key: str, func: Callable[[], Any]) -> Tuple[Any, bool]:
+        """
+        Returns the result of `func` and `True` if this thread ran it, or
+        `None` and `False` if it waited for another thread to run it. If the
+        function raised, the exception is raised in all waiting threads.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = self._Call()
+            else:
+                call.waiters += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return None, False
+
+        try:
+            return func(), True
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+
+_cache_fills = _SingleFlight()
+
+
 class BaseManager(DjangoBaseManager.from_queryset(BaseQuerySet), Generic[M]):  # type: ignore
     lookup_handlers = {"iexact": lambda x: x.upper()}
     use_for_related_fields = True
@@ -39,6 +100,10 @@ class BaseManager(DjangoBaseManager.from_queryset(BaseQuerySet), Generic[M]):  #
         #: project slug is not.
         self.cache_fields = kwargs.pop("cache_fields", [])
         self.cache_ttl = kwargs.pop("cache_ttl", 60 * 5)
+        #: If enabled, the full instance is stored under the cache keys of
+        #: all `cache_fields` (instead of a reference to the primary key), so
+        #: that lookups by those fields only need a single cache round trip.
+        self.cache_secondary_instances = kwargs.pop("cache_secondary_instances", False)
         self._cache_version: Optional[str] = kwargs.pop("cache_version", None)
         self.__local_cache = threading.local()
         super().__init__(*args, **kwargs)
@@ -142,23 +207,24 @@ class BaseManager(DjangoBaseManager.from_queryset(BaseQuerySet), Generic[M]):  #
         pk_name = instance._meta.pk.name
         pk_names = ("pk", pk_name)
         pk_val = instance.pk
-        for key in self.cache_fields:
-            if key in pk_names:
-                continue
-            # store pointers
-            value = self.__value_for_field(instance, key)
-            cache.set(
-                key=self.__get_lookup_cache_key(**{key: value}),
-                value=pk_val,
-                timeout=self.cache_ttl,
-                version=self.cache_version,
-            )
 
         # Ensure we don't serialize the database into the cache
         db = instance._state.db
         instance._state.db = None
-        # store actual object
         try:
+            for key in self.cache_fields:
+                if key in pk_names:
+                    continue
+                # store pointers (or instances, if enabled)
+                value = self.__value_for_field(instance, key)
+                cache.set(
+                    key=self.__get_lookup_cache_key(**{key: value}),
+                    value=instance if self.cache_secondary_instances else pk_val,
+                    timeout=self.cache_ttl,
+                    version=self.cache_version,
+                )
+
+            # store actual object
             cache.set(
                 key=self.__get_lookup_cache_key(**{pk_name: pk_val}),
                 value=instance,
@@ -258,16 +324,26 @@ class BaseManager(DjangoBaseManager.from_queryset(BaseQuerySet), Generic[M]):  #
 
             retval = cache.get(cache_key, version=self.cache_version)
             if retval is None:
-                result = self.get(**kwargs)
-                # Ensure we're pushing it into the cache
-                self.__post_save(instance=result)
+
+                def fill_cache() -> M:
+                    result: M = self.get(**kwargs)
+                    # Ensure we're pushing it into the cache
+                    self.__post_save(instance=result)
+                    return result
+
+                # Only one thread per process queries the database for a
+                # missing key, others wait for it and read its result from the
+                # cache.
+                result, filled = _cache_fills.do(cache_key, fill_cache)
+                if not filled:
+                    return self.get_from_cache(**kwargs)
                 if local_cache is not None:
                     local_cache[cache_key] = result
                 return result
 
             # If we didn't look up by pk we need to hit the reffed
-            # key
-            if key != pk_name:
+            # key, unless the full instance was cached under the lookup key
+            if key != pk_name and not isinstance(retval, self.model):
                 result = self.get_from_cache(**{pk_name: retval})
                 if local_cache is not None:
                     local_cache[cache_key] = result
@@ -285,6 +361,12 @@ class BaseManager(DjangoBaseManager.from_queryset(BaseQuerySet), Generic[M]):  #
                 logger.error("Cache response returned invalid value %r", retval)
                 return self.get(**kwargs)
 
+            if key != pk_name and self.__value_for_field(retval, key) != value:
+                if settings.DEBUG:
+                    raise ValueError("Unexpected value returned from cache")
+                logger.error("Cache response returned invalid value %r", retval)
+                return self.get(**kwargs)
+
             retval._state.db = router.db_for_read(self.model, **kwargs)
 
             # Explicitly typing to satisfy mypy.
@@ -353,8 +435,9 @@ class BaseManager(DjangoBaseManager.from_queryset(BaseQuerySet), Generic[M]):  #
                 db_lookup_values.append(value)
                 continue
 
-            # If we didn't look up by pk we need to hit the reffed key
-            if key != pk_name:
+            # If we didn't look up by pk we need to hit the reffed key, unless
+            # the full instance was cached under the lookup key
+            if key != pk_name and not isinstance(cache_result, self.model):
                 nested_lookup_cache_keys.append(cache_key)
                 nested_lookup_values.append(cache_result)
                 continue
@@ -375,6 +458,16 @@ class BaseManager(DjangoBaseManager.from_queryset(BaseQuerySet), Generic[M]):  #
                 db_lookup_values.append(value)
                 continue
 
+            if key != pk_name and self.__value_for_field(cache_result, key) != value:
+                if settings.DEBUG:
+                    raise ValueError("Unexpected value returned from cache")
+                logger.error("Cache response returned invalid value %r", cache_result)
+                db_lookup_cache_keys.append(cache_key)
+                db_lookup_values.append(value)
+                continue
+
+            if key != pk_name and local_cache is not None:
+                local_cache[cache_key] = cache_result
             final_results.append(cache_result)
 
         if nested_lookup_values:
@@ -410,12 +503,64 @@ class BaseManager(DjangoBaseManager.from_queryset(BaseQuerySet), Generic[M]):  #
 
         return final_results
 
+    def cache_instances(self, instances: Sequence[M]) -> None:
+        """
+        Pushes instances which have been written without going through `save`
+        (e.g. by a bulk insert) into the cache with a single cache write.
+        """
+        if not self.cache_fields or not instances:
+            return
+
+        pk_name = self.model._meta.pk.name
+        values = {}
+        for instance in instances:
+            # Ensure we don't serialize the database into the cache
+            instance._state.db = None
+            instance._state.adding = False
+            for key in self.cache_fields:
+                if key in ("pk", pk_name):
+                    continue
+                value = self.__value_for_field(instance, key)
+                values[self.__get_lookup_cache_key(**{key: value})] = (
+                    instance if self.cache_secondary_instances else instance.pk
+                )
+            values[self.__get_lookup_cache_key(**{pk_name: instance.pk})] = instance
+
+        try:
+            cache.set_many(values, timeout=self.cache_ttl, version=self.cache_version)
+        except Exception as e:
+            logger.error(e, exc_info=True)
+
     def create_or_update(self, **kwargs: Any) -> Tuple[Any, bool]:
         return create_or_update(self.model, **kwargs)  # type: ignore
 
     def uncache_object(self, instance_id: int) -> None:
         pk_name = self.model._meta.pk.name
         cache_key = self.__get_lookup_cache_key(**{pk_name: instance_id})
+
+        # Instances cached under secondary keys are not invalidated through
+        # the primary key entry, so they need to be removed as well.  The
+        # primary key entry may already have been evicted while secondary
+        # entries are still around, so the keys of the stored row are
+        # removed too.
+        if self.cache_secondary_instances:
+            instances = []
+            cached = cache.get(cache_key, version=self.cache_version)
+            if isinstance(cached, self.model):
+                instances.append(cached)
+            stored = self.filter(**{pk_name: instance_id}).first()
+            if stored is not None:
+                instances.append(stored)
+            for instance in instances:
+                for key in self.cache_fields:
+                    if key in ("pk", pk_name):
+                        continue
+                    value = self.__value_for_field(instance, key)
+                    cache.delete(
+                        key=self.__get_lookup_cache_key(**{key: value}),
+                        version=self.cache_version,
+                    )
+
         cache.delete(cache_key, version=self.cache_version)
 
     def post_save(self, instance: M, **kwargs: Any) -> None:
@@ -1,16 +1,18 @@
-import copy
 import ipaddress
 import logging
 import random
 import time
+from collections import defaultdict
 from datetime import datetime, timedelta
+from functools import reduce
 from io import BytesIO
+from operator import or_
 
 import sentry_sdk
 from django.conf import settings
 from django.core.cache import cache
 from django.db import IntegrityError, OperationalError, connection, router, transaction
-from django.db.models import Func
+from django.db.models import Func, Q
 from django.utils.encoding import force_text
 from pytz import UTC
 
@@ -336,233 +338,21 @@ class EventManager:
 
             return jobs[0]["event"]
 
-        with metrics.timer("event_manager.save.organization.get_from_cache"):
-            project.set_cached_field_value(
-                "organization", Organization.objects.get_from_cache(id=project.organization_id)
-            )
-
-        job = {"data": self._data, "project_id": project_id, "raw": raw, "start_time": start_time}
-        jobs = [job]
-
-        is_reprocessed = is_reprocessed_event(job["data"])
-
-        with sentry_sdk.start_span(op="event_manager.save.pull_out_data"):
-            _pull_out_data(jobs, projects)
-
-        with sentry_sdk.start_span(op="event_manager.save.get_or_create_release_many"):
-            _get_or_create_release_many(jobs, projects)
-
-        with sentry_sdk.start_span(op="event_manager.save.get_event_user_many"):
-            _get_event_user_many(jobs, projects)
-
-        job["project_key"] = None
-        if job["key_id"] is not None:
-            with metrics.timer("event_manager.load_project_key"):
-                try:
-                    job["project_key"] = ProjectKey.objects.get_from_cache(id=job["key_id"])
-                except ProjectKey.DoesNotExist:
-                    pass
-
-        _derive_plugin_tags_many(jobs, projects)
-        _derive_interface_tags_many(jobs)
-
-        do_background_grouping_before = options.get("store.background-grouping-before")
-        if do_background_grouping_before:
-            _run_background_grouping(project, job)
-
-        secondary_hashes = None
-
-        try:
-            secondary_grouping_config = project.get_option("sentry:secondary_grouping_config")
-            secondary_grouping_expiry = project.get_option("sentry:secondary_grouping_expiry")
-            if secondary_grouping_config and (secondary_grouping_expiry or 0) >= time.time():
-                with metrics.timer("event_manager.secondary_grouping"):
-                    secondary_event = copy.deepcopy(job["event"])
-                    loader = SecondaryGroupingConfigLoader()
-                    secondary_grouping_config = loader.get_config_dict(project)
-                    secondary_hashes = _calculate_event_grouping(
-                        project, secondary_event, secondary_grouping_config
-                    )
-        except Exception:
-            sentry_sdk.capture_exception()
-
-        with metrics.timer("event_manager.load_grouping_config"):
-            # At this point we want to normalize the in_app values in case the
-            # clients did not set this appropriately so far.
-            grouping_config = get_grouping_config_dict_for_event_data(
-                job["event"].data.data, project
-            )
-
-        with sentry_sdk.start_span(op="event_manager.save.calculate_event_grouping"), metrics.timer(
-            "event_manager.calculate_event_grouping"
-        ):
-            hashes = _calculate_event_grouping(project, job["event"], grouping_config)
-
-        hashes = CalculatedHashes(
-            hashes=hashes.hashes + (secondary_hashes and secondary_hashes.hashes or []),
-            hierarchical_hashes=hashes.hierarchical_hashes,
-            tree_labels=hashes.tree_labels,
-        )
-
-        if not do_background_grouping_before:
-            _run_background_grouping(project, job)
-
-        if hashes.tree_labels:
-            job["finest_tree_label"] = hashes.finest_tree_label
-
-        _materialize_metadata_many(jobs)
-
-        kwargs = {
-            "platform": job["platform"],
-            "message": job["event"].search_message,
-            "culprit": job["culprit"],
-            "logger": job["logger_name"],
-            "level": LOG_LEVELS_MAP.get(job["level"]),
-            "last_seen": job["event"].datetime,
-            "first_seen": job["event"].datetime,
-            "active_at": job["event"].datetime,
+        job = {
+            "data": self._data,
+            "project_id": project_id,
+            "raw": raw,
+            "start_time": start_time,
+            "cache_key": cache_key,
         }
+        jobs = save_error_events([job], projects)
 
-        if job["release"]:
-            kwargs["first_release"] = job["release"]
-
-        # Load attachments first, but persist them at the very last after
-        # posting to eventstream to make sure all counters and eventstream are
-        # incremented for sure. Also wait for grouping to remove attachments
-        # based on the group counter.
-        with metrics.timer("event_manager.get_attachments"):
-            with sentry_sdk.start_span(op="event_manager.save.get_attachments"):
-                attachments = get_attachments(cache_key, job)
-
-        try:
-            with sentry_sdk.start_span(op="event_manager.save.save_aggregate_fn"):
-                job["group"], job["is_new"], job["is_regression"] = _save_aggregate(
-                    event=job["event"],
-                    hashes=hashes,
-                    release=job["release"],
-                    metadata=dict(job["event_metadata"]),
-                    received_timestamp=job["received_timestamp"],
-                    **kwargs,
-                )
-        except HashDiscarded:
-            discard_event(job, attachments)
-            raise
-
-        job["event"].group = job["group"]
-
-        # store a reference to the group id to guarantee validation of isolation
-        # XXX(markus): No clue what this does
-        job["event"].data.bind_ref(job["event"])
-
-        _get_or_create_environment_many(jobs, projects)
-
-        if job["group"]:
-            group_environment, job["is_new_group_environment"] = GroupEnvironment.get_or_create(
-                group_id=job["group"].id,
-                environment_id=job["environment"].id,
-                defaults={"first_release": job["release"] or None},
-            )
-        else:
-            job["is_new_group_environment"] = False
-
-        _get_or_create_release_associated_models(jobs, projects)
-
-        if job["release"] and job["group"]:
-            job["grouprelease"] = GroupRelease.get_or_create(
-                group=job["group"],
-                release=job["release"],
-                environment=job["environment"],
-                datetime=job["event"].datetime,
-            )
-
-        _tsdb_record_all_metrics(jobs)
-
-        if job["group"]:
-            UserReport.objects.filter(project_id=project.id, event_id=job["event"].event_id).update(
-                group_id=job["group"].id, environment_id=job["environment"].id
-            )
-
-        with metrics.timer("event_manager.filter_attachments_for_group"):
-            attachments = filter_attachments_for_group(attachments, job)
-
-        # XXX: DO NOT MUTATE THE EVENT PAYLOAD AFTER THIS POINT
-        _materialize_event_metrics(jobs)
-
-        for attachment in attachments:
-            key = f"bytes.stored.{attachment.type}"
-            old_bytes = job["event_metrics"].get(key) or 0
-            job["event_metrics"][key] = old_bytes + attachment.size
-
-        _nodestore_save_many(jobs)
-        save_unprocessed_event(project, job["event"].event_id)
-
-        if job["release"]:
-            if job["is_new"]:
-                buffer.incr(
-                    ReleaseProject,
-                    {"new_groups": 1},
-                    {"release_id": job["release"].id, "project_id": project.id},
-                )
-            if job["is_new_group_environment"]:
-                buffer.incr(
-                    ReleaseProjectEnvironment,
-                    {"new_issues_count": 1},
-                    {
-                        "project_id": project.id,
-                        "release_id": job["release"].id,
-                        "environment_id": job["environment"].id,
-                    },
-                )
-        if not raw:
-            if not project.first_event:
-                project.update(first_event=job["event"].datetime)
-                first_event_received.send_robust(
-                    project=project, event=job["event"], sender=Project
-                )
-
-        if is_reprocessed:
-            safe_execute(
-                reprocessing2.buffered_delete_old_primary_hash,
-                project_id=job["event"].project_id,
-                group_id=reprocessing2.get_original_group_id(job["event"]),
-                event_id=job["event"].event_id,
-                datetime=job["event"].datetime,
-                old_primary_hash=reprocessing2.get_original_primary_hash(job["event"]),
-                current_primary_hash=job["event"].get_primary_hash(),
-                _with_transaction=False,
-            )
-
-        _eventstream_insert_many(jobs)
-
-        # Do this last to ensure signals get emitted even if connection to the
-        # file store breaks temporarily.
-        #
-        # We do not need this for reprocessed events as for those we update the
-        # group_id on existing models in post_process_group, which already does
-        # this because of indiv. attachments.
-        if not is_reprocessed:
-            with metrics.timer("event_manager.save_attachments"):
-                save_attachments(cache_key, attachments, job)
-
-        metric_tags = {"from_relay": "_relay_processed" in job["data"]}
-
-        metrics.timing(
-            "events.latency",
-            job["received_timestamp"] - job["recorded_timestamp"],
-            tags=metric_tags,
-        )
-        metrics.timing("events.size.data.post_save", job["event"].size, tags=metric_tags)
-        metrics.incr(
-            "events.post_save.normalize.errors",
-            amount=len(job["data"].get("errors") or ()),
-            tags=metric_tags,
-        )
-
-        _track_outcome_accepted_many(jobs)
+        if "discarded" in job:
+            raise job["discarded"]
 
-        self._data = job["event"].data.data
+        self._data = jobs[0]["event"].data.data
 
-        return job["event"]
+        return jobs[0]["event"]
 
 
 @metrics.wraps("event_manager.background_grouping")
@@ -580,7 +370,7 @@ def _run_background_grouping(project, job):
         if sample_rate and random.random() <= sample_rate:
             config = BackgroundGroupingConfigLoader().get_config_dict(project)
             if config["id"]:
-                copied_event = copy.deepcopy(job["event"])
+                copied_event = job["event"].copy_for_grouping()
                 _calculate_background_grouping(project, copied_event, config)
     except Exception:
         sentry_sdk.capture_exception()
@@ -1001,11 +791,25 @@ def get_culprit(data):
     )
 
 
-def _save_aggregate(event, hashes, release, metadata, received_timestamp, **kwargs):
+def _save_aggregate(
+    event, hashes, release, metadata, received_timestamp, grouphashes=None, **kwargs
+):
+    """
+    Finds or creates the group of an event.
+
+    ``grouphashes`` optionally maps hashes of the event to ``GroupHash``
+    instances which have been loaded ahead of time, see
+    ``_get_grouphashes_many``. They are only used for the initial lookup, the
+    lookup under lock is always done against the database.
+    """
     project = event.project
 
+    if grouphashes is None:
+        grouphashes = {}
+
     flat_grouphashes = [
-        GroupHash.objects.get_or_create(project=project, hash=hash)[0] for hash in hashes.hashes
+        grouphashes.get(hash) or GroupHash.objects.get_or_create(project=project, hash=hash)[0]
+        for hash in hashes.hashes
     ]
 
     # The root_hierarchical_hash is the least specific hash within the tree, so
@@ -1015,13 +819,14 @@ def _save_aggregate(event, hashes, release, metadata, received_timestamp, **kwar
     # when groups are created and also relieves contention by locking a more
     # specific hash than `hierarchical_hashes[0]`.
     existing_grouphash, root_hierarchical_hash = _find_existing_grouphash(
-        project, flat_grouphashes, hashes.hierarchical_hashes
+        project, flat_grouphashes, hashes.hierarchical_hashes, grouphashes=grouphashes or None
     )
 
     if root_hierarchical_hash is not None:
-        root_hierarchical_grouphash = GroupHash.objects.get_or_create(
-            project=project, hash=root_hierarchical_hash
-        )[0]
+        root_hierarchical_grouphash = (
+            grouphashes.get(root_hierarchical_hash)
+            or GroupHash.objects.get_or_create(project=project, hash=root_hierarchical_hash)[0]
+        )
 
         metadata.update(
             hashes.group_metadata_from_hash(
@@ -1184,6 +989,7 @@ def _find_existing_grouphash(
     project,
     flat_grouphashes,
     hierarchical_hashes,
+    grouphashes=None,
 ):
     all_grouphashes = []
     root_hierarchical_hash = None
@@ -1191,10 +997,16 @@ def _find_existing_grouphash(
     found_split = False
 
     if hierarchical_hashes:
-        hierarchical_grouphashes = {
-            h.hash: h
-            for h in GroupHash.objects.filter(project=project, hash__in=hierarchical_hashes)
-        }
+        if grouphashes is not None:
+            # Hashes missing from prefetched grouphashes do not exist.
+            hierarchical_grouphashes = {
+                hash: grouphashes[hash] for hash in hierarchical_hashes if hash in grouphashes
+            }
+        else:
+            hierarchical_grouphashes = {
+                h.hash: h
+                for h in GroupHash.objects.filter(project=project, hash__in=hierarchical_hashes)
+            }
 
         for hash in reversed(hierarchical_hashes):
             group_hash = hierarchical_grouphashes.get(hash)
@@ -1738,6 +1550,389 @@ def _calculate_span_grouping(jobs, projects):
             sentry_sdk.capture_exception()
 
 
+@metrics.wraps("save_event.get_project_keys_many")
+def _get_project_keys_many(jobs):
+    key_ids = {job["key_id"] for job in jobs if job["key_id"] is not None}
+    project_keys = {}
+    if key_ids:
+        with metrics.timer("event_manager.load_project_key"):
+            project_keys = {k.id: k for k in ProjectKey.objects.get_many_from_cache(key_ids)}
+
+    for job in jobs:
+        job["project_key"] = project_keys.get(job["key_id"])
+
+
+@metrics.wraps("save_event.calculate_event_grouping_many")
+def _calculate_event_grouping_many(jobs, projects):
+    do_background_grouping_before = options.get("store.background-grouping-before")
+
+    for job in jobs:
+        project = projects[job["project_id"]]
+
+        if do_background_grouping_before:
+            _run_background_grouping(project, job)
+
+        secondary_hashes = None
+
+        try:
+            secondary_grouping_config = project.get_option("sentry:secondary_grouping_config")
+            secondary_grouping_expiry = project.get_option("sentry:secondary_grouping_expiry")
+            if secondary_grouping_config and (secondary_grouping_expiry or 0) >= time.time():
+                with metrics.timer("event_manager.secondary_grouping"):
+                    secondary_event = job["event"].copy_for_grouping()
+                    loader = SecondaryGroupingConfigLoader()
+                    secondary_grouping_config = loader.get_config_dict(project)
+                    secondary_hashes = _calculate_event_grouping(
+                        project, secondary_event, secondary_grouping_config
+                    )
+        except Exception:
+            sentry_sdk.capture_exception()
+
+        with metrics.timer("event_manager.load_grouping_config"):
+            # At this point we want to normalize the in_app values in case the
+            # clients did not set this appropriately so far.
+            grouping_config = get_grouping_config_dict_for_event_data(
+                job["event"].data.data, project
+            )
+
+        with sentry_sdk.start_span(op="event_manager.save.calculate_event_grouping"), metrics.timer(
+            "event_manager.calculate_event_grouping"
+        ):
+            hashes = _calculate_event_grouping(project, job["event"], grouping_config)
+
+        job["hashes"] = hashes = CalculatedHashes(
+            hashes=hashes.hashes + (secondary_hashes and secondary_hashes.hashes or []),
+            hierarchical_hashes=hashes.hierarchical_hashes,
+            tree_labels=hashes.tree_labels,
+        )
+
+        if not do_background_grouping_before:
+            _run_background_grouping(project, job)
+
+        if hashes.tree_labels:
+            job["finest_tree_label"] = hashes.finest_tree_label
+
+
+@metrics.wraps("save_event.get_grouphashes_many")
+def _get_grouphashes_many(jobs):
+    """
+    Loads the grouphashes of all jobs with a single query, creating missing
+    flat hashes. Each job gets a ``grouphashes`` mapping of its hashes to
+    ``GroupHash`` instances, to be passed to ``_save_aggregate``.
+    """
+    hashes_by_project = defaultdict(set)
+    for job in jobs:
+        hashes_by_project[job["project_id"]].update(job["hashes"].hashes)
+        hashes_by_project[job["project_id"]].update(job["hashes"].hierarchical_hashes)
+
+    if not hashes_by_project:
+        return
+
+    grouphashes = {
+        (h.project_id, h.hash): h
+        for h in GroupHash.objects.filter(
+            reduce(
+                or_,
+                (
+                    Q(project_id=project_id, hash__in=hashes)
+                    for project_id, hashes in hashes_by_project.items()
+                ),
+            )
+        )
+    }
+
+    for job in jobs:
+        project_id = job["project_id"]
+        for hash in job["hashes"].hashes:
+            if (project_id, hash) not in grouphashes:
+                grouphashes[project_id, hash] = GroupHash.objects.get_or_create(
+                    project=job["event"].project, hash=hash
+                )[0]
+
+        job["grouphashes"] = {
+            hash: grouphashes[project_id, hash]
+            for hash in (*job["hashes"].hashes, *job["hashes"].hierarchical_hashes)
+            if (project_id, hash) in grouphashes
+        }
+
+
+@metrics.wraps("save_event.save_aggregate_many")
+def _save_aggregate_many(jobs):
+    """
+    Assigns groups to all jobs and returns the jobs that have not been
+    discarded. Discarded jobs keep the ``HashDiscarded`` exception under the
+    ``discarded`` key.
+    """
+    saved_jobs = []
+    for job in jobs:
+        kwargs = {
+            "platform": job["platform"],
+            "message": job["event"].search_message,
+            "culprit": job["culprit"],
+            "logger": job["logger_name"],
+            "level": LOG_LEVELS_MAP.get(job["level"]),
+            "last_seen": job["event"].datetime,
+            "first_seen": job["event"].datetime,
+            "active_at": job["event"].datetime,
+        }
+
+        if job["release"]:
+            kwargs["first_release"] = job["release"]
+
+        try:
+            with sentry_sdk.start_span(op="event_manager.save.save_aggregate_fn"):
+                job["group"], job["is_new"], job["is_regression"] = _save_aggregate(
+                    event=job["event"],
+                    hashes=job["hashes"],
+                    release=job["release"],
+                    metadata=dict(job["event_metadata"]),
+                    received_timestamp=job["received_timestamp"],
+                    grouphashes=job.get("grouphashes"),
+                    **kwargs,
+                )
+        except HashDiscarded as e:
+            discard_event(job, job["attachments"])
+            job["discarded"] = e
+            continue
+
+        # Grouphashes are shared between the jobs of a batch, and those without
+        # a group may just have been associated with one. Refresh them so later
+        # jobs don't find a stale grouphash and go through group creation.
+        ungrouped = {h.id: h for h in job.get("grouphashes", {}).values() if h.group_id is None}
+        if ungrouped:
+            for grouphash_id, group_id in GroupHash.objects.filter(
+                id__in=list(ungrouped)
+            ).values_list("id", "group_id"):
+                ungrouped[grouphash_id].group_id = group_id
+
+        job["event"].group = job["group"]
+
+        # store a reference to the group id to guarantee validation of isolation
+        # XXX(markus): No clue what this does
+        job["event"].data.bind_ref(job["event"])
+
+        saved_jobs.append(job)
+
+    return saved_jobs
+
+
+@metrics.wraps("save_event.get_or_create_group_environment_many")
+def _get_or_create_group_environment_many(jobs):
+    """
+    Looks up the group environments of all jobs in the cache at once, and only
+    creates each missing group environment once per batch.
+    """
+    cache_keys = {}
+    for job in jobs:
+        job["is_new_group_environment"] = False
+        if job["group"]:
+            cache_keys.setdefault(
+                (job["group"].id, job["environment"].id),
+                GroupEnvironment._get_cache_key(job["group"].id, job["environment"].id),
+            )
+
+    if not cache_keys:
+        return
+
+    cached = cache.get_many(list(cache_keys.values()))
+    for job in jobs:
+        if not job["group"]:
+            continue
+
+        key = (job["group"].id, job["environment"].id)
+        if cache_keys[key] in cached:
+            continue
+
+        _, created = GroupEnvironment.get_or_create(
+            group_id=job["group"].id,
+            environment_id=job["environment"].id,
+            defaults={"first_release": job["release"] or None},
+        )
+        cached[cache_keys[key]] = True
+        job["is_new_group_environment"] = created
+
+
+@metrics.wraps("save_event.get_or_create_group_release_many")
+def _get_or_create_group_release_many(jobs):
+    """
+    Creates or updates each group release once per batch, using the latest
+    event datetime of all jobs sharing it.
+    """
+    jobs_by_key = defaultdict(list)
+    for job in jobs:
+        if job["release"] and job["group"]:
+            key = (job["group"].id, job["release"].id, job["environment"].name)
+            jobs_by_key[key].append(job)
+
+    for key_jobs in jobs_by_key.values():
+        latest_job = max(key_jobs, key=lambda job: job["event"].datetime)
+        grouprelease = GroupRelease.get_or_create(
+            group=latest_job["group"],
+            release=latest_job["release"],
+            environment=latest_job["environment"],
+            datetime=latest_job["event"].datetime,
+        )
+        for job in key_jobs:
+            job["grouprelease"] = grouprelease
+
+
+@metrics.wraps("event_manager.save_error_events")
+def save_error_events(jobs, projects):
+    """
+    Saves a batch of error events, the counterpart of
+    ``save_transaction_events``. Jobs need ``data``, ``project_id``, ``raw``,
+    ``start_time`` and ``cache_key`` and their projects must be in
+    ``projects``.
+
+    Returns the jobs of saved events. Jobs of events discarded during grouping
+    are left out, and have the ``HashDiscarded`` exception stored under the
+    ``discarded`` key instead.
+    """
+    with metrics.timer("event_manager.save_error_events.fetch_organizations"):
+        organization_ids = {project.organization_id for project in projects.values()}
+        organizations = {
+            o.id: o for o in Organization.objects.get_many_from_cache(organization_ids)
+        }
+
+        for project in projects.values():
+            try:
+                project.set_cached_field_value(
+                    "organization", organizations[project.organization_id]
+                )
+            except KeyError:
+                continue
+
+    for job in jobs:
+        job["is_reprocessed"] = is_reprocessed_event(job["data"])
+
+    with sentry_sdk.start_span(op="event_manager.save.pull_out_data"):
+        _pull_out_data(jobs, projects)
+
+    with sentry_sdk.start_span(op="event_manager.save.get_or_create_release_many"):
+        _get_or_create_release_many(jobs, projects)
+
+    with sentry_sdk.start_span(op="event_manager.save.get_event_user_many"):
+        _get_event_user_many(jobs, projects)
+
+    _get_project_keys_many(jobs)
+    _derive_plugin_tags_many(jobs, projects)
+    _derive_interface_tags_many(jobs)
+    _calculate_event_grouping_many(jobs, projects)
+    _materialize_metadata_many(jobs)
+
+    # Load attachments first, but persist them at the very last after
+    # posting to eventstream to make sure all counters and eventstream are
+    # incremented for sure. Also wait for grouping to remove attachments
+    # based on the group counter.
+    with metrics.timer("event_manager.get_attachments"):
+        with sentry_sdk.start_span(op="event_manager.save.get_attachments"):
+            for job in jobs:
+                job["attachments"] = get_attachments(job["cache_key"], job)
+
+    _get_grouphashes_many(jobs)
+    jobs = _save_aggregate_many(jobs)
+
+    _get_or_create_environment_many(jobs, projects)
+    _get_or_create_group_environment_many(jobs)
+    _get_or_create_release_associated_models(jobs, projects)
+    _get_or_create_group_release_many(jobs)
+    _tsdb_record_all_metrics(jobs)
+
+    with metrics.timer("event_manager.save_error_events.update_user_reports"):
+        for job in jobs:
+            if job["group"]:
+                UserReport.objects.filter(
+                    project_id=job["project_id"], event_id=job["event"].event_id
+                ).update(group_id=job["group"].id, environment_id=job["environment"].id)
+
+    with metrics.timer("event_manager.filter_attachments_for_group"):
+        for job in jobs:
+            job["attachments"] = filter_attachments_for_group(job["attachments"], job)
+
+    # XXX: DO NOT MUTATE THE EVENT PAYLOAD AFTER THIS POINT
+    _materialize_event_metrics(jobs)
+
+    for job in jobs:
+        for attachment in job["attachments"]:
+            key = f"bytes.stored.{attachment.type}"
+            old_bytes = job["event_metrics"].get(key) or 0
+            job["event_metrics"][key] = old_bytes + attachment.size
+
+    _nodestore_save_many(jobs)
+
+    with metrics.timer("event_manager.save_error_events.post_save"):
+        for job in jobs:
+            project = projects[job["project_id"]]
+            save_unprocessed_event(project, job["event"].event_id)
+
+            if job["release"]:
+                if job["is_new"]:
+                    buffer.incr(
+                        ReleaseProject,
+                        {"new_groups": 1},
+                        {"release_id": job["release"].id, "project_id": project.id},
+                    )
+                if job["is_new_group_environment"]:
+                    buffer.incr(
+                        ReleaseProjectEnvironment,
+                        {"new_issues_count": 1},
+                        {
+                            "project_id": project.id,
+                            "release_id": job["release"].id,
+                            "environment_id": job["environment"].id,
+                        },
+                    )
+            if not job["raw"]:
+                if not project.first_event:
+                    project.update(first_event=job["event"].datetime)
+                    first_event_received.send_robust(
+                        project=project, event=job["event"], sender=Project
+                    )
+
+            if job["is_reprocessed"]:
+                safe_execute(
+                    reprocessing2.buffered_delete_old_primary_hash,
+                    project_id=job["event"].project_id,
+                    group_id=reprocessing2.get_original_group_id(job["event"]),
+                    event_id=job["event"].event_id,
+                    datetime=job["event"].datetime,
+                    old_primary_hash=reprocessing2.get_original_primary_hash(job["event"]),
+                    current_primary_hash=job["event"].get_primary_hash(),
+                    _with_transaction=False,
+                )
+
+    _eventstream_insert_many(jobs)
+
+    # Do this last to ensure signals get emitted even if connection to the
+    # file store breaks temporarily.
+    #
+    # We do not need this for reprocessed events as for those we update the
+    # group_id on existing models in post_process_group, which already does
+    # this because of indiv. attachments.
+    with metrics.timer("event_manager.save_attachments"):
+        for job in jobs:
+            if not job["is_reprocessed"]:
+                save_attachments(job["cache_key"], job["attachments"], job)
+
+    for job in jobs:
+        metric_tags = {"from_relay": "_relay_processed" in job["data"]}
+
+        metrics.timing(
+            "events.latency",
+            job["received_timestamp"] - job["recorded_timestamp"],
+            tags=metric_tags,
+        )
+        metrics.timing("events.size.data.post_save", job["event"].size, tags=metric_tags)
+        metrics.incr(
+            "events.post_save.normalize.errors",
+            amount=len(job["data"].get("errors") or ()),
+            tags=metric_tags,
+        )
+
+    _track_outcome_accepted_many(jobs)
+    return jobs
+
+
 @metrics.wraps("event_manager.save_transaction_events")
 def save_transaction_events(jobs, projects):
     with metrics.timer("event_manager.save_transactions.collect_organization_ids"):
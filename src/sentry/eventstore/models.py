@@ -32,6 +32,44 @@ def ref_func(x):
     return x.project_id or x.project.id
 
 
+def _copy_frame_for_grouping(frame):
+    if not isinstance(frame, dict):
+        return frame
+    frame = dict(frame)
+    if isinstance(frame.get("data"), dict):
+        frame["data"] = dict(frame["data"])
+    return frame
+
+
+def _copy_stacktrace_for_grouping(stacktrace):
+    if not isinstance(stacktrace, dict):
+        return stacktrace
+    stacktrace = dict(stacktrace)
+    if isinstance(stacktrace.get("frames"), list):
+        stacktrace["frames"] = [_copy_frame_for_grouping(f) for f in stacktrace["frames"]]
+    return stacktrace
+
+
+def _copy_container_for_grouping(container):
+    if not isinstance(container, dict):
+        return container
+    container = dict(container)
+    for key in ("stacktrace", "raw_stacktrace"):
+        if key in container:
+            container[key] = _copy_stacktrace_for_grouping(container[key])
+    if isinstance(container.get("mechanism"), dict):
+        container["mechanism"] = dict(container["mechanism"])
+    return container
+
+
+def _copy_values_for_grouping(interface):
+    if not isinstance(interface, dict) or not isinstance(interface.get("values"), list):
+        return interface
+    interface = dict(interface)
+    interface["values"] = [_copy_container_for_grouping(v) for v in interface["values"]]
+    return interface
+
+
 class Event:
     """
     Event backed by nodestore and Snuba.
@@ -415,6 +453,35 @@ class Event:
 
         return filtered_hashes, tree_labels
 
+    def copy_for_grouping(self):
+        """
+        Returns a copy of the event that can be grouped without affecting this
+        event, for running additional grouping configs.
+
+        Only the parts of the payload written to by grouping are copied: the
+        top level of the payload, stacktrace frames and the containers leading
+        to them, and exception mechanisms. Everything else, such as frame
+        variables, breadcrumbs or debug images, is shared with this event and
+        must not be modified on the copy.
+        """
+        data = self.data.data.copy()
+        for key in ("exception", "threads"):
+            if key in data:
+                data[key] = _copy_values_for_grouping(data[key])
+        if "stacktrace" in data:
+            data["stacktrace"] = _copy_stacktrace_for_grouping(data["stacktrace"])
+
+        rv = Event(
+            self.project_id,
+            self.event_id,
+            group_id=self._group_id,
+            data=data,
+            snuba_data=dict(self._snuba_data),
+        )
+        if hasattr(self, "_project_cache"):
+            rv._project_cache = self._project_cache
+        return rv
+
     def normalize_stacktraces_for_grouping(self, grouping_config):
         """Normalize stacktraces and clear memoized interfaces
 
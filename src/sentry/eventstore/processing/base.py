@@ -1,5 +1,5 @@
 from datetime import timedelta
-from typing import Any, Optional
+from typing import Any, List, Mapping, Optional, Sequence, Tuple, Union
 
 import sentry_sdk
 
@@ -25,8 +25,9 @@ class EventProcessingStore:
     implementations.
     """
 
-    def __init__(self, inner: KVStorage[str, Event]):
+    def __init__(self, inner: KVStorage[str, Event], raw: Optional[KVStorage[str, bytes]] = None):
         self.inner = inner
+        self.raw = raw
         self.timeout = timedelta(seconds=DEFAULT_TIMEOUT)
 
     def __get_unprocessed_key(self, key: str) -> str:
@@ -40,17 +41,88 @@ class EventProcessingStore:
             self.inner.set(key, event, self.timeout)
             return key
 
+    def store_raw(self, event: Event, payload: Union[str, bytes]) -> str:
+        """
+        Stores an event given the JSON payload it was decoded from.
+
+        If the backend stores events as JSON, the payload is written as-is
+        instead of encoding the event again, so the payload must not be out
+        of sync with the event. The event may be any mapping, such as a lazily
+        decoded view of the payload, and is then only used for its key.
+        """
+        if self.raw is None:
+            return self.store(dict(event))
+
+        with sentry_sdk.start_span(op="eventstore.processing.store_raw"):
+            key = cache_key_for_event(event)
+            if isinstance(payload, str):
+                payload = payload.encode("utf-8")
+            self.raw.set(key, payload, self.timeout)
+            return key
+
+    def store_many(self, events: Sequence[Event], unprocessed: bool = False) -> List[str]:
+        """
+        Stores multiple events at once, returning their keys in the same order.
+        """
+        with sentry_sdk.start_span(op="eventstore.processing.store_many"):
+            keys = [cache_key_for_event(event) for event in events]
+            if unprocessed:
+                keys = [self.__get_unprocessed_key(key) for key in keys]
+            self.inner.set_many(list(zip(keys, events)), self.timeout)
+            return keys
+
+    def store_raw_many(self, items: Sequence[Tuple[Event, Union[str, bytes]]]) -> List[str]:
+        """
+        Stores multiple events given the JSON payloads they were decoded from,
+        returning their keys in the same order. See ``store_raw``.
+        """
+        if self.raw is None:
+            return self.store_many([dict(event) for event, _ in items])
+
+        with sentry_sdk.start_span(op="eventstore.processing.store_raw_many"):
+            keys = [cache_key_for_event(event) for event, _ in items]
+            payloads = [
+                payload.encode("utf-8") if isinstance(payload, str) else payload
+                for _, payload in items
+            ]
+            self.raw.set_many(list(zip(keys, payloads)), self.timeout)
+            return keys
+
     def get(self, key: str, unprocessed: bool = False) -> Optional[Event]:
         with sentry_sdk.start_span(op="eventstore.processing.get"):
             if unprocessed:
                 key = self.__get_unprocessed_key(key)
             return self.inner.get(key)
 
+    def get_many(self, keys: Sequence[str], unprocessed: bool = False) -> Mapping[str, Event]:
+        """
+        Fetches multiple events at once. Returns a mapping of the provided keys
+        to their events, omitting events that are not in the store.
+        """
+        with sentry_sdk.start_span(op="eventstore.processing.get_many"):
+            if not unprocessed:
+                return dict(self.inner.get_many(keys))
+
+            keys_by_unprocessed_key = {self.__get_unprocessed_key(key): key for key in keys}
+            return {
+                keys_by_unprocessed_key[key]: event
+                for key, event in self.inner.get_many(list(keys_by_unprocessed_key))
+            }
+
     def delete_by_key(self, key: str) -> None:
         with sentry_sdk.start_span(op="eventstore.processing.delete_by_key"):
             self.inner.delete(key)
             self.inner.delete(self.__get_unprocessed_key(key))
 
+    def delete_many_by_key(self, keys: Sequence[str]) -> None:
+        with sentry_sdk.start_span(op="eventstore.processing.delete_many_by_key"):
+            self.inner.delete_many(
+                [*keys, *(self.__get_unprocessed_key(key) for key in keys)],
+            )
+
     def delete(self, event: Event) -> None:
         key = cache_key_for_event(event)
         self.delete_by_key(key)
+
+    def delete_many(self, events: Sequence[Event]) -> None:
+        self.delete_many_by_key([cache_key_for_event(event) for event in events])
@@ -12,9 +12,11 @@ def BigtableEventProcessingStore(**options) -> EventProcessingStore:
 
     Keyword argument are forwarded to the ``BigtableKVStorage`` constructor.
     """
+    storage = BigtableKVStorage(**options)
     return EventProcessingStore(
         KVStorageCodecWrapper(
-            BigtableKVStorage(**options),
+            storage,
             JSONCodec() | BytesCodec(),  # maintains functional parity with cache backend
-        )
+        ),
+        raw=storage,
     )
@@ -1,3 +1,5 @@
+import sys
+
 from sentry.grouping.utils import hash_from_values
 
 DEFAULT_HINTS = {"salt": "a static salt"}
@@ -17,6 +19,15 @@ KNOWN_MAJOR_COMPONENT_NAMES = {
 }
 
 
+# Incremented whenever a component is modified in a way that can change its
+# hash. Memoized values and hashes are only valid for the generation they were
+# computed in. Subcomponents are shared between several trees (e.g. across
+# hierarchical variants), so a global counter is used instead of invalidating
+# parents. Trees are modified while they are built and hashed afterwards, so in
+# practice every hash is still computed only once.
+_generation = 0
+
+
 def _calculate_contributes(values):
     for value in values or ():
         if not isinstance(value, GroupingComponent) or value.contributes:
@@ -35,6 +46,23 @@ class GroupingComponent:
     into components to make a hash for grouping purposes.
     """
 
+    __slots__ = (
+        "id",
+        "hint",
+        "contributes",
+        "contributes_to_similarity",
+        "variant_provider",
+        "values",
+        "tree_label",
+        "is_prefix_frame",
+        "is_sentinel_frame",
+        "similarity_encoder",
+        "similarity_self_encoder",
+        "_flat_values",
+        "_hash",
+        "_generation",
+    )
+
     def __init__(
         self,
         id,
@@ -49,17 +77,20 @@ class GroupingComponent:
         is_prefix_frame=None,
         is_sentinel_frame=None,
     ):
-        self.id = id
+        self.id = sys.intern(id) if isinstance(id, str) else id
 
         # Default values
         self.hint = DEFAULT_HINTS.get(id)
         self.contributes = None
         self.contributes_to_similarity = None
         self.variant_provider = variant_provider
-        self.values = []
+        self.values = ()
         self.tree_label = None
         self.is_prefix_frame = False
         self.is_sentinel_frame = False
+        self._flat_values = None
+        self._hash = None
+        self._generation = None
 
         self.update(
             hint=hint,
@@ -126,6 +157,8 @@ class GroupingComponent:
         is_sentinel_frame=None,
     ):
         """Updates an already existing component with new values."""
+        global _generation
+
         if hint is not None:
             self.hint = hint
         if values is not None:
@@ -133,10 +166,13 @@ class GroupingComponent:
                 contributes = _calculate_contributes(values)
             if tree_label is None:
                 tree_label = calculate_tree_label(values)
-            self.values = values
+            self.values = tuple(values)
+            _generation += 1
         if contributes is not None:
             if contributes_to_similarity is None:
                 contributes_to_similarity = contributes
+            if contributes != self.contributes:
+                _generation += 1
             self.contributes = contributes
         if contributes_to_similarity is not None:
             self.contributes_to_similarity = contributes_to_similarity
@@ -150,25 +186,51 @@ class GroupingComponent:
     def shallow_copy(self):
         """Creates a shallow copy."""
         rv = object.__new__(self.__class__)
-        rv.__dict__.update(self.__dict__)
-        rv.values = list(self.values)
+        for name in self.__slots__:
+            setattr(rv, name, getattr(self, name))
+        return rv
+
+    def deep_copy(self):
+        """Creates a copy of the whole component tree."""
+        rv = self.shallow_copy()
+        rv.values = tuple(
+            value.deep_copy() if isinstance(value, GroupingComponent) else value
+            for value in self.values
+        )
+        if isinstance(self.tree_label, dict):
+            rv.tree_label = dict(self.tree_label)
         return rv
 
+    def _get_flat_values(self):
+        generation = _generation
+        if self._generation != generation:
+            if self.contributes:
+                flat_values = []
+                for value in self.values:
+                    if isinstance(value, GroupingComponent):
+                        flat_values.extend(value._get_flat_values())
+                    else:
+                        flat_values.append(value)
+                self._flat_values = tuple(flat_values)
+            else:
+                self._flat_values = ()
+            self._hash = None
+            self._generation = generation
+        return self._flat_values
+
     def iter_values(self):
         """Recursively walks the component and flattens it into a list of
-        values.
+        values.  The result is memoized until any component is modified.
         """
-        if self.contributes:
-            for value in self.values:
-                if isinstance(value, GroupingComponent):
-                    yield from value.iter_values()
-                else:
-                    yield value
+        return iter(self._get_flat_values())
 
     def get_hash(self):
         """Returns the hash of the values if it contributes."""
         if self.contributes:
-            return hash_from_values(self.iter_values())
+            flat_values = self._get_flat_values()
+            if self._hash is None:
+                self._hash = hash_from_values(flat_values)
+            return self._hash
 
     def encode_for_similarity(self):
         if not self.contributes_to_similarity:
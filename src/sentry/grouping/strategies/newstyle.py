@@ -1,5 +1,8 @@
 import re
-from typing import Any, Dict, List, Optional
+import time
+from typing import Any, Dict, Hashable, List, Optional
+
+from django.conf import settings
 
 from sentry.eventstore.models import Event
 from sentry.grouping.component import GroupingComponent, calculate_tree_label
@@ -18,7 +21,9 @@ from sentry.interfaces.exception import SingleException
 from sentry.interfaces.stacktrace import Frame, Stacktrace
 from sentry.interfaces.threads import Threads
 from sentry.stacktraces.platform import get_behavior_family_for_platform
+from sentry.utils import metrics
 from sentry.utils.iterators import shingle
+from sentry.utils.lru import LRUCache
 
 _ruby_erb_func = re.compile(r"__\d{4,}_\d{4,}$")
 _basename_re = re.compile(r"[/\\]")
@@ -61,6 +66,9 @@ RECURSION_COMPARISON_FIELDS = [
 # TODO(markus)
 StacktraceEncoderReturnValue = Any
 
+# Components computed by the frame strategy, see `_get_frame_component`.
+_frame_component_cache: Optional["LRUCache[Hashable, GroupingComponent]"] = None
+
 
 def is_recursion_v1(frame1: Frame, frame2: Frame) -> bool:
     """
@@ -495,10 +503,11 @@ def _single_stacktrace_variant(
     values: List[GroupingComponent] = []
     prev_frame = None
     frames_for_filtering = []
+    cache_stats = {"hits": 0, "misses": 0, "hit_duration": 0.0, "miss_duration": 0.0}
     for frame in frames:
         with context:
             context["is_recursion"] = is_recursion_v1(frame, prev_frame)
-            frame_component = context.get_grouping_component(frame, event=event, **meta)
+            frame_component = _get_frame_component(frame, event, context, meta, cache_stats)
         if not context["hierarchical_grouping"] and variant == "app" and not frame.in_app:
             frame_component.update(contributes=False, hint="non app frame")
         values.append(frame_component)
@@ -517,6 +526,12 @@ def _single_stacktrace_variant(
     ):
         values[0].update(contributes=False, hint="ignored single non-URL JavaScript frame")
 
+    if cache_stats["hits"] or cache_stats["misses"]:
+        metrics.incr("grouping.frame_cache.hits", amount=cache_stats["hits"])
+        metrics.incr("grouping.frame_cache.misses", amount=cache_stats["misses"])
+        metrics.timing("grouping.frame_cache.hit_duration", cache_stats["hit_duration"])
+        metrics.timing("grouping.frame_cache.miss_duration", cache_stats["miss_duration"])
+
     main_variant, inverted_hierarchy = context.config.enhancements.assemble_stacktrace_component(
         values,
         frames_for_filtering,
@@ -543,6 +558,72 @@ def _single_stacktrace_variant(
     return all_variants
 
 
+def _get_frame_component_cache() -> "LRUCache[Hashable, GroupingComponent]":
+    global _frame_component_cache
+    if _frame_component_cache is None:
+        _frame_component_cache = LRUCache(settings.SENTRY_GROUPING_FRAME_CACHE_SIZE)
+    return _frame_component_cache
+
+
+def _get_frame_component_cache_key(
+    frame: Frame, event: Event, context: GroupingContext
+) -> Hashable:
+    # All inputs of the `frame:v1` strategy. Enhancements are applied to the
+    # whole stacktrace afterwards and are therefore not part of the key.
+    return (
+        context.config.id,
+        context["variant"],
+        context["is_recursion"],
+        event.platform,
+        frame.platform,
+        frame.abs_path,
+        frame.filename,
+        frame.module,
+        frame.function,
+        frame.raw_function,
+        frame.context_line,
+        frame.package,
+        bool(frame.data and frame.data.get("sourcemap") is not None),
+        tuple(frame.datapath or ()) if context["hierarchical_grouping"] else None,
+    )
+
+
+def _get_frame_component(
+    frame: Frame,
+    event: Event,
+    context: GroupingContext,
+    meta: Dict[str, Any],
+    cache_stats: Dict[str, Any],
+) -> GroupingComponent:
+    """
+    Returns the grouping component of a single frame.
+
+    Components of the `frame:v1` strategy only depend on a few attributes of
+    the frame, so they are memoized across events. Callers modify frame
+    components, so cached components are always copied. The time spent on
+    hits and misses is added to ``cache_stats``, including the copies.
+    """
+    strategy = context.config.delegates.get(Frame.path)
+    if strategy is None or strategy.id != "frame:v1":
+        return context.get_grouping_component(frame, event=event, **meta)
+
+    start = time.perf_counter()
+    cache = _get_frame_component_cache()
+    key = _get_frame_component_cache_key(frame, event, context)
+    component = cache.get(key)
+    if component is not None:
+        component = component.deep_copy()
+        cache_stats["hits"] += 1
+        cache_stats["hit_duration"] += time.perf_counter() - start
+        return component
+
+    component = context.get_grouping_component(frame, event=event, **meta)
+    cache.set(key, component.deep_copy())
+    cache_stats["misses"] += 1
+    cache_stats["miss_duration"] += time.perf_counter() - start
+    return component
+
+
 @stacktrace.variant_processor
 def stacktrace_variant_processor(
     variants: ReturnedVariants, context: GroupingContext, **meta: Any
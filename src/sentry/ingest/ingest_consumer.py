@@ -2,20 +2,8 @@ import functools
 import logging
 import random
 import time
-from concurrent.futures import Future, ThreadPoolExecutor, as_completed
-from typing import (
-    Any,
-    Callable,
-    Mapping,
-    MutableMapping,
-    MutableSequence,
-    NamedTuple,
-    Optional,
-    Sequence,
-    Tuple,
-    TypeVar,
-    Union,
-)
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Mapping, MutableSequence, Optional, Sequence, Tuple, Union
 
 import msgpack
 import sentry_sdk
@@ -26,6 +14,7 @@ from sentry import eventstore, features
 from sentry.attachments import CachedAttachment, attachment_cache
 from sentry.event_manager import save_attachment
 from sentry.eventstore.processing import event_processing_store
+from sentry.ingest.lazy_event import LazyEvent
 from sentry.ingest.types import ConsumerType
 from sentry.ingest.userreport import Conflict, save_userreport
 from sentry.killswitches import killswitch_matches_context
@@ -44,13 +33,8 @@ logger = logging.getLogger(__name__)
 
 CACHE_TIMEOUT = 3600
 
-
-T = TypeVar("T")
-
-
-class AsyncResult(NamedTuple):  # TODO: Use Generic[T] with 3.7+
-    future: "Future[T]"
-    callback: Callable[["Future[T]"], Any]
+# The maximum number of events written to the processing store at once.
+STORE_BATCH_SIZE = 100
 
 
 Message = Any
@@ -59,12 +43,6 @@ Message = Any
 class IngestConsumerWorker(AbstractBatchWorker):
     def __init__(self, process_event_executor: Optional[ThreadPoolExecutor] = None) -> None:
         self.__process_event_executor = process_event_executor
-        if self.__process_event_executor is None:
-            self.__process_event = process_event
-        else:
-            self.__process_event = functools.partial(
-                process_event_async, self.__process_event_executor
-            )
 
     def process_message(self, message) -> Message:
         message = msgpack.unpackb(message.value(), use_list=False)
@@ -77,21 +55,9 @@ class IngestConsumerWorker(AbstractBatchWorker):
 
     def _flush_batch(self, batch: Sequence[Message]):
         attachment_chunks = []
-
-        # Processing functions may be either synchronous or asynchronous.
-        # Functions that return an ``AsyncResult`` may perform a combination of
-        # synchronous and asynchronous work, and need to be explicitly waited on
-        # to ensure they have completed and callbacks have been invoked before
-        # returning. Functions that return anything else are assumed to have
-        # completed successfully after they have returned.
+        events = []
         other_messages: MutableSequence[
-            Tuple[
-                Callable[
-                    [Message, Mapping[int, Project]],
-                    Union[Any, AsyncResult],
-                ],
-                Message,
-            ]
+            Tuple[Callable[[Message, Mapping[int, Project]], None], Message]
         ] = []
 
         projects_to_fetch = set()
@@ -102,7 +68,7 @@ class IngestConsumerWorker(AbstractBatchWorker):
                 projects_to_fetch.add(message["project_id"])
 
                 if message_type == "event":
-                    other_messages.append((self.__process_event, message))
+                    events.append(message)
                 elif message_type == "attachment_chunk":
                     attachment_chunks.append(message)
                 elif message_type == "attachment":
@@ -124,24 +90,17 @@ class IngestConsumerWorker(AbstractBatchWorker):
                 for attachment_chunk in attachment_chunks:
                     process_attachment_chunk(attachment_chunk, projects=projects)
 
+        if events:
+            # Events are stored in batches before they are dispatched, which
+            # only takes a few round trips to the processing store.
+            process_event_batch(events, projects, executor=self.__process_event_executor)
+
         if other_messages:
             with metrics.timer("ingest_consumer.process_other_messages_batch"):
                 other_messages_flush_start = time.monotonic()
 
-                # Keep a mapping of futures to their metadata so that we can
-                # easily associate a future with its callback once completed.
-                results: MutableMapping["Future[Any]", "AsyncResult[Any]"] = {}
-
-                # Execute synchronous tasks and dispatch asynchronous tasks.
                 for processing_func, message in other_messages:
-                    result = processing_func(message, projects)
-                    if isinstance(result, AsyncResult):
-                        results[result.future] = result
-
-                # Wait for any asynchronous work to be completed, invoking
-                # callbacks (on the main thread) as results are ready.
-                for future in as_completed(results.keys()):
-                    results[future].callback(future)
+                    processing_func(message, projects)
 
                 metrics.timing(
                     "ingest_consumer.process_other_messages_batch.normalized",
@@ -174,19 +133,19 @@ def _do_process_event(message: Message, projects: Mapping[int, Project]) -> None
     if result is None:
         return
 
-    data, callback = result
-    callback(_store_event(data))
+    data, payload, callback = result
+    callback(_store_event(data, payload))
 
 
 def _load_event(
     message: Message, projects: Mapping[int, Project]
-) -> Optional[Tuple[Any, Callable[[str], None]]]:
+) -> Optional[Tuple[Any, Union[str, bytes], Callable[[str], None]]]:
     """
     Perform some initial filtering and deserialize the message payload. If the
-    event should be stored, the deserialized payload is returned along with a
-    function that can be called with the event's storage key to resume
-    processing after the event has been persisted and is available to be read by
-    other processing components.
+    event should be stored, the deserialized payload is returned along with the
+    raw payload and a function that can be called with the event's storage key
+    to resume processing after the event has been persisted and is available to
+    be read by other processing components.
     """
     payload = message["payload"]
     start_time = float(message["start_time"])
@@ -242,12 +201,11 @@ def _load_event(
         logger.error("Project for ingested event does not exist: %s", project_id)
         return
 
-    # Parse the JSON payload. This is required to compute the cache key and
-    # call process_event. The payload will be put into Kafka raw, to avoid
-    # serializing it again.
-    # XXX: Do not use CanonicalKeyDict here. This may break preprocess_event
-    # which assumes that data passed in is a raw dictionary.
-    data = json.loads(payload)
+    # The payload is only decoded once attributes other than top-level scalars
+    # (such as the type, project and event ID) are needed, which is the case
+    # for events passed to preprocess_event. The payload will be put into the
+    # processing store raw, to avoid serializing it again.
+    data = LazyEvent(payload)
 
     if project_id == settings.SENTRY_PROJECT:
         metrics.incr(
@@ -293,10 +251,12 @@ def _load_event(
             # Preprocess this event, which spawns either process_event or
             # save_event. Pass data explicitly to avoid fetching it again from the
             # cache.
+            # XXX: Do not use CanonicalKeyDict here. This may break preprocess_event
+            # which assumes that data passed in is a raw dictionary.
             with sentry_sdk.start_span(op="ingest_consumer.process_event.preprocess_event"):
                 preprocess_event(
                     cache_key=cache_key,
-                    data=data,
+                    data=data.data,
                     start_time=start_time,
                     event_id=event_id,
                     project=project,
@@ -308,11 +268,13 @@ def _load_event(
         # emit event_accepted once everything is done
         event_accepted.send_robust(ip=remote_addr, data=data, project=project, sender=process_event)
 
-    return data, dispatch_task
+    return data, payload, dispatch_task
 
 
-def _store_event(data) -> str:
-    return event_processing_store.store(data)
+def _store_event(data, payload: Union[str, bytes]) -> str:
+    # The event has not been modified since it was parsed, so the processing
+    # store can write the original payload instead of serializing it again.
+    return event_processing_store.store_raw(data, payload)
 
 
 @trace_func(name="ingest_consumer.process_event")
@@ -320,18 +282,47 @@ def process_event(message: Message, projects: Mapping[int, Project]) -> None:
     return _do_process_event(message, projects)
 
 
-def process_event_async(
-    executor: ThreadPoolExecutor, message: Message, projects: Mapping[int, Project]
-) -> Optional["AsyncResult[str]"]:
-    result = _load_event(message, projects)
-    if result is None:
-        return None
+def _store_events(
+    items: Sequence[Tuple[Any, Union[str, bytes], Callable[[str], None]]]
+) -> Sequence[str]:
+    return event_processing_store.store_raw_many([(data, payload) for data, payload, _ in items])
 
-    data, callback = result
-    return AsyncResult(
-        executor.submit(_store_event, data),
-        lambda future: callback(future.result()),
-    )
+
+@trace_func(name="ingest_consumer.process_event_batch")
+@metrics.wraps("ingest_consumer.process_event_batch")
+def process_event_batch(
+    messages: Sequence[Message],
+    projects: Mapping[int, Project],
+    executor: Optional[ThreadPoolExecutor] = None,
+) -> None:
+    """
+    Processes a batch of event messages, storing the events in chunks of
+    ``STORE_BATCH_SIZE``. If an executor is provided, the chunks are stored
+    concurrently.
+    """
+    loaded = []
+    seen = set()
+    for message in messages:
+        # Deduplication in `_load_event` only applies to events that were
+        # dispatched before, which does not cover duplicates in the same batch.
+        event_key = (int(message["project_id"]), message["event_id"])
+        if event_key in seen:
+            continue
+        seen.add(event_key)
+
+        result = _load_event(message, projects)
+        if result is not None:
+            loaded.append(result)
+
+    chunks = [loaded[i : i + STORE_BATCH_SIZE] for i in range(0, len(loaded), STORE_BATCH_SIZE)]
+    if executor is None:
+        chunk_keys = [_store_events(chunk) for chunk in chunks]
+    else:
+        chunk_keys = list(executor.map(_store_events, chunks))
+
+    for chunk, keys in zip(chunks, chunk_keys):
+        for (_, _, callback), key in zip(chunk, keys):
+            callback(key)
 
 
 @trace_func(name="ingest_consumer.process_attachment_chunk")
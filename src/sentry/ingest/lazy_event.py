@@ -0,0 +1,122 @@
+"""
+A read-only view of an ingested event payload which only decodes the payload
+once it is needed.
+
+The ingest consumer only needs a few top-level attributes of an event (its
+type, project and ID) to route it and to write it to the processing store.
+Events that don't go through `preprocess_event`, such as transactions, can be
+dispatched without decoding their payload at all.
+"""
+
+import re
+from typing import Any, Iterator, Mapping, MutableMapping, Optional, Union
+
+from sentry.utils import json
+
+# Characters that open or close a string, object or array.
+_STRUCTURE_RE = re.compile(rb'["{}\[\]]')
+# The remainder of a string (after its opening quote), including escapes.
+_STRING_RE = re.compile(rb'[^"\\]*(?:\\.[^"\\]*)*"', re.DOTALL)
+# A colon separating a key from its value, and the start of the value.
+_KEY_VALUE_RE = re.compile(rb"\s*:\s*")
+# A value that is not a string, object or array.
+_SCALAR_RE = re.compile(rb"-?[0-9][0-9.eE+-]*|true|false|null")
+
+_NOT_FOUND = object()
+
+
+def _scan_top_level(raw: bytes, key: str) -> Any:
+    """
+    Returns the value of a top-level key of a JSON object, without decoding
+    any other value of the object.
+
+    Only strings, numbers, booleans and null are returned. ``_NOT_FOUND`` is
+    returned if the key is not found, its value is an object or array, or the
+    payload is not an object.
+    """
+    encoded_key = json.dumps(key).encode("utf-8")
+    depth = 0
+    pos = 0
+    while True:
+        match = _STRUCTURE_RE.search(raw, pos)
+        if match is None:
+            return _NOT_FOUND
+        char = match.group()
+        pos = match.end()
+
+        if char == b'"':
+            string = _STRING_RE.match(raw, pos)
+            if string is None:
+                return _NOT_FOUND
+            start = match.start()
+            pos = string.end()
+            if depth != 1 or raw[start:pos] != encoded_key:
+                continue
+            separator = _KEY_VALUE_RE.match(raw, pos)
+            if separator is None:
+                continue  # a string value, not a key
+            pos = separator.end()
+            if raw[pos : pos + 1] == b'"':
+                value = _STRING_RE.match(raw, pos + 1)
+                if value is None:
+                    return _NOT_FOUND
+                return json.loads(raw[pos : value.end()])
+            scalar = _SCALAR_RE.match(raw, pos)
+            if scalar is None:
+                return _NOT_FOUND
+            return json.loads(scalar.group())
+        elif char in b"{[":
+            if depth == 0 and char == b"[":
+                return _NOT_FOUND
+            depth += 1
+        else:
+            depth -= 1
+            if depth == 0:
+                return _NOT_FOUND
+
+
+class LazyEvent(Mapping[str, Any]):
+    """
+    A mapping over the JSON payload of an event.
+
+    Top-level attributes with a string, number, boolean or null value are
+    read from the payload without decoding it. Any other access decodes the
+    whole payload once, see ``data``.
+    """
+
+    def __init__(self, payload: Union[str, bytes]) -> None:
+        self.payload = payload
+        self.__data: Optional[MutableMapping[str, Any]] = None
+        self.__scalars: MutableMapping[str, Any] = {}
+
+    @property
+    def data(self) -> MutableMapping[str, Any]:
+        """The decoded payload."""
+        if self.__data is None:
+            self.__data = json.loads(self.payload)
+        return self.__data
+
+    @property
+    def is_decoded(self) -> bool:
+        return self.__data is not None
+
+    def __getitem__(self, key: str) -> Any:
+        if self.__data is not None:
+            return self.__data[key]
+
+        value = self.__scalars.get(key, _NOT_FOUND)
+        if value is _NOT_FOUND:
+            raw = self.payload.encode("utf-8") if isinstance(self.payload, str) else self.payload
+            value = _scan_top_level(raw, key)
+            if value is _NOT_FOUND:
+                # The key may also be missing, which requires decoding the
+                # payload to be certain of.
+                return self.data[key]
+            self.__scalars[key] = value
+        return value
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.data)
+
+    def __len__(self) -> int:
+        return len(self.data)
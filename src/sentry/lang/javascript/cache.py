@@ -1,8 +1,13 @@
+from hashlib import sha1
+
+from django.conf import settings
 from symbolic import SourceView
 
+from sentry.utils import metrics
+from sentry.utils.lru import LRUCache
 from sentry.utils.strings import codec_lookup
 
-__all__ = ["SourceCache", "SourceMapCache"]
+__all__ = ["SourceCache", "SourceMapCache", "ParsedSourceCache", "get_parsed_source_cache"]
 
 
 def is_utf8(codec):
@@ -10,6 +15,20 @@ def is_utf8(codec):
     return name in ("utf-8", "ascii")
 
 
+def make_source_view(source, encoding=None):
+    if isinstance(source, str):
+        source = source.encode("utf-8")
+    # If an encoding is provided and it's not utf-8 compatible
+    # we try to re-encoding the source and create a source view
+    # from it.
+    elif encoding is not None and not is_utf8(encoding):
+        try:
+            source = source.decode(encoding).encode("utf-8")
+        except UnicodeError:
+            pass
+    return SourceView.from_bytes(source)
+
+
 class SourceCache:
     def __init__(self):
         self._cache = {}
@@ -40,17 +59,7 @@ class SourceCache:
         url = self._get_canonical_url(url)
 
         if not isinstance(source, SourceView):
-            if isinstance(source, str):
-                source = source.encode("utf-8")
-            # If an encoding is provided and it's not utf-8 compatible
-            # we try to re-encoding the source and create a source view
-            # from it.
-            elif encoding is not None and not is_utf8(encoding):
-                try:
-                    source = source.decode(encoding).encode("utf-8")
-                except UnicodeError:
-                    pass
-            source = SourceView.from_bytes(source)
+            source = make_source_view(source, encoding)
         self._cache[url] = source
 
     def add_error(self, url, error):
@@ -90,3 +99,55 @@ class SourceMapCache:
             sourcemap = self.get(sourcemap_url)
             return (sourcemap_url, sourcemap)
         return (None, None)
+
+
+class ParsedSourceCache:
+    """
+    A process-wide cache of parsed source maps and source views, shared by
+    all events a worker processes.
+
+    Entries are keyed by the release, dist and url they were fetched for, as
+    well as a checksum of the raw file, so they never go stale. The cache is
+    bounded by the total size of the raw files, which is a rough proxy for
+    the memory held by their parsed representations.
+    """
+
+    def __init__(self, max_size):
+        self.max_size = max_size
+        self._cache = LRUCache(max_size, weigher=lambda key, value: value[1])
+
+    def get_or_parse(self, kind, key, body, parse):
+        """
+        Returns the parsed representation of ``body``, calling ``parse`` only
+        if it is not cached yet. ``kind`` distinguishes the different parsed
+        representations, and is used to tag metrics.
+        """
+        if not self.max_size:
+            return parse(body)
+
+        cache_key = (kind, *key, sha1(body).hexdigest())
+        cached = self._cache.get(cache_key)
+        if cached is not None:
+            metrics.incr("sourcemaps.parsed_cache", tags={"kind": kind, "result": "hit"})
+            return cached[0]
+
+        metrics.incr("sourcemaps.parsed_cache", tags={"kind": kind, "result": "miss"})
+        value = parse(body)
+
+        evictions = self._cache.evictions
+        self._cache.set(cache_key, (value, len(body)))
+        evicted = self._cache.evictions - evictions
+        if evicted:
+            metrics.incr("sourcemaps.parsed_cache.evictions", amount=evicted, tags={"kind": kind})
+        metrics.gauge("sourcemaps.parsed_cache.size", self._cache.weight)
+        return value
+
+
+_parsed_source_cache = None
+
+
+def get_parsed_source_cache():
+    global _parsed_source_cache
+    if _parsed_source_cache is None:
+        _parsed_source_cache = ParsedSourceCache(settings.SENTRY_JS_PARSED_SOURCE_CACHE_SIZE)
+    return _parsed_source_cache
@@ -21,7 +21,12 @@ from symbolic import SourceMapView
 from sentry import http, options
 from sentry.interfaces.stacktrace import Stacktrace
 from sentry.models import EventError, Organization, ReleaseFile
-from sentry.models.releasefile import ARTIFACT_INDEX_FILENAME, ReleaseArchive, read_artifact_index
+from sentry.models.releasefile import (
+    ARTIFACT_INDEX_FILENAME,
+    ReleaseArchive,
+    read_archived_file,
+    read_artifact_index,
+)
 from sentry.stacktraces.processing import StacktraceProcessor
 from sentry.utils import json, metrics
 
@@ -36,7 +41,7 @@ from sentry.utils.retries import ConditionalRetryPolicy, exponential_delay
 from sentry.utils.safe import get_path
 from sentry.utils.urls import non_standard_url_join
 
-from .cache import SourceCache, SourceMapCache
+from .cache import SourceCache, SourceMapCache, get_parsed_source_cache, make_source_view
 
 __all__ = ["JavaScriptStacktraceProcessor"]
 
@@ -415,20 +420,39 @@ def get_artifact_index(release, dist):
     return index
 
 
+def get_artifact_lookup_cache_key(release_id, index_ident, url):
+    return f"artifact-lookup:v1:{release_id}:{index_ident}:{md5_text(url).hexdigest()}"
+
+
 def get_index_entry(release, dist, url) -> Optional[dict]:
+    """Look up the artifact index entry for `url`.
+
+    Entries for each normalized url are cached individually, so that
+    repeated lookups do not need to load and decode the whole index.
+    """
+    dist_name = dist and dist.name or None
+    ident = ReleaseFile.get_ident(ARTIFACT_INDEX_FILENAME, dist_name)
+    candidates = ReleaseFile.normalize(url)
+    cache_keys = [get_artifact_lookup_cache_key(release.id, ident, c) for c in candidates]
+
+    cached = cache.get_many(cache_keys)
+    if len(cached) == len(cache_keys):
+        metrics.incr("sourcemaps.artifact_lookup", tags={"result": "hit"})
+        return next((cached[key] for key in cache_keys if cached[key] != -1), None)
+
+    metrics.incr("sourcemaps.artifact_lookup", tags={"result": "miss"})
     try:
         index = get_artifact_index(release, dist)
     except Exception as exc:
         logger.error("sourcemaps.index_read_failed", exc_info=exc)
         return None
 
-    if index:
-        for candidate in ReleaseFile.normalize(url):
-            entry = index.get("files", {}).get(candidate)
-            if entry:
-                return entry
+    files = index.get("files", {}) if index else {}
+    entries = [files.get(candidate) or -1 for candidate in candidates]
+    # Only cache for as long as the index itself to keep lookups up-to-date
+    cache.set_many(dict(zip(cache_keys, entries)), timeout=60)
 
-    return None
+    return next((entry for entry in entries if entry != -1), None)
 
 
 @metrics.wraps("sourcemaps.fetch_release_archive")
@@ -508,6 +532,38 @@ def fetch_release_archive_for_url(release, dist, url) -> Optional[IO]:
             return file_
 
 
+@metrics.wraps("sourcemaps.fetch_archived_file")
+def fetch_archived_file(release, dist, info) -> Optional[bytes]:
+    """Read a single file from a release archive by its location in the artifact index.
+
+    Only the blobs of the archive that cover the file are loaded, instead of
+    the entire archive. Returns ``None`` if the file cannot be read this way,
+    for example because the index predates storing file locations.
+    """
+    location = info.get("zip")
+    if location is None:
+        return None
+
+    try:
+        with sentry_sdk.start_span(op="fetch_archived_file.get_releasefile_db_entry"):
+            releasefile = ReleaseFile.objects.filter(
+                release_id=release.id,
+                dist_id=dist.id if dist else dist,
+                ident=info["archive_ident"],
+            ).select_related("file")[0]
+    except IndexError:
+        return None
+
+    try:
+        with sentry_sdk.start_span(op="fetch_archived_file.read") as span:
+            span.set_data("compressed_size", location["compressed_size"])
+            with fetch_retry_policy(releasefile.file.getfile) as fp:
+                return read_archived_file(fp, location)
+    except Exception:
+        logger.error("sourcemaps.read_archived_file_failed", exc_info=sys.exc_info())
+        return None
+
+
 def compress(fp: IO) -> Tuple[bytes, bytes]:
     """Alternative for compress_file when fp does not support chunks"""
     content = fp.read()
@@ -532,6 +588,21 @@ def fetch_release_artifact(url, release, dist):
         return result_from_cache(url, result)
 
     start = time.monotonic()
+    with sentry_sdk.start_span(op="fetch_release_artifact.get_index_entry"):
+        info = get_index_entry(release, dist, url)
+    body = fetch_archived_file(release, dist, info) if info is not None else None
+    if body is not None:
+        result = fetch_and_cache_artifact(
+            url,
+            lambda: BytesIO(body),
+            cache_key,
+            cache_key_meta,
+            info.get("headers", {}),
+            compress_fn=compress,
+        )
+        metrics.timing("sourcemaps.release_artifact_from_archive", time.monotonic() - start)
+        return result
+
     archive_file = fetch_release_archive_for_url(release, dist, url)
     if archive_file is not None:
         try:
@@ -740,7 +811,16 @@ def fetch_sourcemap(url, project=None, release=None, dist=None, allow_scraping=T
         )
         body = result.body
     try:
-        return SourceMapView.from_json_bytes(body)
+        return get_parsed_source_cache().get_or_parse(
+            "sourcemap",
+            (
+                release.id if release is not None else None,
+                dist.name if dist is not None else None,
+                "<base64>" if is_data_uri(url) else url,
+            ),
+            body,
+            SourceMapView.from_json_bytes,
+        )
     except Exception as exc:
         # This is in debug because the product shows an error already.
         logger.debug(str(exc), exc_info=True)
@@ -1155,7 +1235,18 @@ class JavaScriptStacktraceProcessor(StacktraceProcessor):
             # either way, there's no more for us to do here, since we don't have
             # a valid file to cache
             return
-        cache.add(filename, result.body, result.encoding)
+        source_view = get_parsed_source_cache().get_or_parse(
+            "source",
+            (
+                self.release.id if self.release is not None else None,
+                self.dist.name if self.dist is not None else None,
+                result.url,
+                result.encoding,
+            ),
+            result.body,
+            lambda body: make_source_view(body, result.encoding),
+        )
+        cache.add(filename, source_view)
         cache.alias(result.url, filename)
 
         sourcemap_url = discover_sourcemap(result)
@@ -2,8 +2,10 @@ import logging
 import posixpath
 from typing import Set
 
+from django.conf import settings
 from symbolic import ParseDebugIdError, normalize_debug_id
 
+from sentry.cache import default_cache
 from sentry.lang.native.error import SymbolicationFailed, write_error
 from sentry.lang.native.symbolicator import Symbolicator
 from sentry.lang.native.utils import (
@@ -20,7 +22,9 @@ from sentry.lang.native.utils import (
 from sentry.models import EventError, Project
 from sentry.stacktraces.functions import trim_function_name
 from sentry.stacktraces.processing import find_stacktraces_in_data
+from sentry.utils import json, metrics
 from sentry.utils.compat import zip
+from sentry.utils.hashlib import md5_text
 from sentry.utils.in_app import is_known_third_party, is_optional_package
 from sentry.utils.safe import get_path, set_path, setdefault_path, trim
 
@@ -337,6 +341,49 @@ def get_frames_for_symbolication(frames, data, modules):
     return rv
 
 
+def _get_payload_cache_key(symbolicator, stacktraces, modules, signal):
+    # Symbolication results only depend on the request and the project's
+    # symbol sources, so identical crashes can share a single response.
+    payload = {
+        "sources": symbolicator.sess.sources,
+        "options": symbolicator.sess.options,
+        "stacktraces": stacktraces,
+        "modules": modules,
+        "signal": signal,
+    }
+    return "symbolicator:payload:{}:{}".format(
+        symbolicator.sess.project_id,
+        md5_text(json.dumps(payload)).hexdigest(),
+    )
+
+
+def _symbolicate_payload(symbolicator, stacktraces, modules, signal):
+    """
+    Symbolicates stacktraces, reusing the response of an identical request if
+    one has completed recently.
+
+    During crash storms many events carry exactly the same modules and
+    instruction addresses. Only the first of them is sent to symbolicator,
+    the others are served from the cache for a short time window.
+    """
+    cache_ttl = settings.SYMBOLICATOR_PAYLOAD_CACHE_TTL
+    if not cache_ttl:
+        return symbolicator.process_payload(stacktraces=stacktraces, modules=modules, signal=signal)
+
+    cache_key = _get_payload_cache_key(symbolicator, stacktraces, modules, signal)
+    response = default_cache.get(cache_key)
+    metrics.incr(
+        "process_native.payload_cache", tags={"result": "hit" if response is not None else "miss"}
+    )
+    if response is not None:
+        return response
+
+    response = symbolicator.process_payload(stacktraces=stacktraces, modules=modules, signal=signal)
+    if response.get("status") == "completed":
+        default_cache.set(cache_key, response, cache_ttl)
+    return response
+
+
 def process_payload(data):
     project = Project.objects.get_from_cache(id=data["project"])
 
@@ -365,7 +412,7 @@ def process_payload(data):
 
     signal = signal_from_data(data)
 
-    response = symbolicator.process_payload(stacktraces=stacktraces, modules=modules, signal=signal)
+    response = _symbolicate_payload(symbolicator, stacktraces, modules, signal)
 
     if not _handle_response_status(data, response):
         return data
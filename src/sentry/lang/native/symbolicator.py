@@ -157,14 +157,17 @@ class Symbolicator:
     def _process(self, create_task, task_name):
         task_id = default_cache.get(self.task_id_cache_key)
         json_response = None
+        long_poll_timeout = settings.SYMBOLICATOR_LONG_POLL_TIMEOUT
 
         with self.sess:
             try:
                 if task_id:
                     # Processing has already started and we need to poll
-                    # symbolicator for an update. This in turn may put us back into
-                    # the queue.
-                    json_response = self.sess.query_task(task_id)
+                    # symbolicator for an update. With long polling enabled,
+                    # symbolicator holds on to this request until the task
+                    # completes or the long poll timeout expires. This in turn
+                    # may put us back into the queue.
+                    json_response = self.sess.query_task(task_id, timeout=long_poll_timeout)
 
                 if json_response is None:
                     # This is a new task, so we compute all request parameters
@@ -188,11 +191,14 @@ class Symbolicator:
 
             # Symbolication is still in progress. Bail out and try again
             # after some timeout. Symbolicator keeps the response for the
-            # first one to poll it.
+            # first one to poll it. When long polling, the wait happens in the
+            # next query to symbolicator, so there is no need to sleep before.
             if json_response["status"] == "pending":
                 default_cache.set(
                     self.task_id_cache_key, json_response["request_id"], REQUEST_CACHE_TIMEOUT
                 )
+                if long_poll_timeout:
+                    raise RetrySymbolication(retry_after=0)
                 raise RetrySymbolication(retry_after=json_response["retry_after"])
             else:
                 # Once we arrive here, we are done processing. Clean up the
@@ -553,9 +559,18 @@ class SymbolicatorSession:
         redact_internal_sources(json)
         return json
 
-    def _request(self, method, path, **kwargs):
+    def _request(self, method, path, wait=None, **kwargs):
+        """
+        Sends a request to symbolicator, retrying on connection errors.
+
+        ``wait`` is the number of seconds symbolicator may hold on to the
+        request before responding. Requests never time out before the poll
+        timeout.
+        """
         self._ensure_open()
 
+        wait = max(wait or 0, settings.SYMBOLICATOR_POLL_TIMEOUT)
+
         url = urljoin(self.url, path)
 
         # required for load balancing
@@ -564,16 +579,14 @@ class SymbolicatorSession:
         kwargs.setdefault("headers", {})["x-sentry-worker-id"] = self.get_worker_id()
 
         attempts = 0
-        wait = 0.5
+        backoff = 0.5
 
         while True:
             try:
                 with metrics.timer(
                     "events.symbolicator.session.request", tags={"attempt": attempts}
                 ):
-                    response = self.session.request(
-                        method, url, timeout=settings.SYMBOLICATOR_POLL_TIMEOUT + 1, **kwargs
-                    )
+                    response = self.session.request(method, url, timeout=wait + 1, **kwargs)
 
                 metrics.incr(
                     "events.symbolicator.status_code",
@@ -618,8 +631,8 @@ class SymbolicatorSession:
                     logger.error("Failed to contact symbolicator", exc_info=True)
                     raise
 
-                time.sleep(wait)
-                wait *= 2.0
+                time.sleep(backoff)
+                backoff *= 2.0
 
     def _create_task(self, path, **kwargs):
         params = {"timeout": self.timeout, "scope": self.project_id}
@@ -656,16 +669,23 @@ class SymbolicatorSession:
             files={"apple_crash_report": report},
         )
 
-    def query_task(self, task_id):
+    def query_task(self, task_id, timeout=0):
+        """
+        Queries the status of a symbolication task.
+
+        By default, symbolicator responds immediately. With a ``timeout``,
+        symbolicator long polls and only responds once the task has completed
+        or the timeout has expired.
+        """
         task_url = f"requests/{task_id}"
 
         params = {
-            "timeout": 0,  # Only wait when creating, but not when querying tasks
+            "timeout": timeout,
             "scope": self.project_id,
         }
 
-        with metrics.timer("events.symbolicator.query_task"):
-            return self._request("get", task_url, params=params)
+        with metrics.timer("events.symbolicator.query_task", tags={"long_poll": bool(timeout)}):
+            return self._request("get", task_url, wait=timeout, params=params)
 
     def healthcheck(self):
         return self._request("get", "healthcheck")
@@ -3,10 +3,9 @@ import mmap
 import os
 import tempfile
 import time
-from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import ALL_COMPLETED, FIRST_COMPLETED, ThreadPoolExecutor, wait
 from contextlib import contextmanager
 from hashlib import sha1
-from threading import Semaphore
 from uuid import uuid4
 
 from django.conf import settings
@@ -137,25 +136,24 @@ class FileBlob(Model):
 
         checksums_seen = set()
         blobs_created = []
-        blobs_to_save = []
         locks = set()
-        semaphore = Semaphore(value=MULTI_BLOB_UPLOAD_CONCURRENCY)
+        uploads = set()
 
-        def _upload_and_pend_chunk(fileobj, size, checksum, lock):
+        def _upload_chunk(fileobj, size, checksum, lock):
             logger.debug(
-                "FileBlob.from_files._upload_and_pend_chunk.start",
+                "FileBlob.from_files._upload_chunk.start",
                 extra={"checksum": checksum, "size": size},
             )
             blob = cls(size=size, checksum=checksum)
             blob.path = cls.generate_unique_path()
             storage = get_storage()
             storage.save(blob.path, fileobj)
-            blobs_to_save.append((blob, lock))
             metrics.timing("filestore.blob-size", size, tags={"function": "from_files"})
             logger.debug(
-                "FileBlob.from_files._upload_and_pend_chunk.end",
+                "FileBlob.from_files._upload_chunk.end",
                 extra={"checksum": checksum, "path": blob.path},
             )
+            return blob, lock
 
         def _ensure_blob_owned(blob):
             if organization is None:
@@ -172,17 +170,19 @@ class FileBlob(Model):
             _ensure_blob_owned(blob)
             logger.debug("FileBlob.from_files._save_blob.end", extra={"path": blob.path})
 
-        def _flush_blobs():
-            while True:
-                try:
-                    blob, lock = blobs_to_save.pop()
-                except IndexError:
-                    break
+        def _flush_blobs(return_when=FIRST_COMPLETED):
+            # Uploads happen in the executor, but all database writes are
+            # performed on the calling thread once an upload has completed.
+            if not uploads:
+                return
 
+            done, _ = wait(uploads, return_when=return_when)
+            for future in done:
+                uploads.discard(future)
+                blob, lock = future.result()
                 _save_blob(blob)
                 lock.__exit__(None, None, None)
                 locks.discard(lock)
-                semaphore.release()
 
         try:
             with ThreadPoolExecutor(max_workers=MULTI_BLOB_UPLOAD_CONCURRENCY) as exe:
@@ -190,7 +190,6 @@ class FileBlob(Model):
                     logger.debug(
                         "FileBlob.from_files.executor_start", extra={"checksum": reference_checksum}
                     )
-                    _flush_blobs()
 
                     # Before we go and do something with the files we calculate
                     # the checksums and compare it against the reference.  This
@@ -218,17 +217,16 @@ class FileBlob(Model):
                     # encounter any difficulties.
                     locks.add(lock)
 
-                    # Otherwise we leave the blob locked and submit the task.
-                    # We use the semaphore to ensure we never schedule too
-                    # many.  The upload will be done with a certain amount
-                    # of concurrency controlled by the semaphore and the
-                    # `_flush_blobs` call will take all those uploaded
-                    # blobs and associate them with the database.
-                    semaphore.acquire()
-                    exe.submit(_upload_and_pend_chunk(fileobj, size, checksum, lock))
+                    # Otherwise we leave the blob locked and submit the upload.
+                    # We never keep more than `MULTI_BLOB_UPLOAD_CONCURRENCY`
+                    # uploads in flight, waiting for (and saving) completed
+                    # blobs before scheduling more.
+                    while len(uploads) >= MULTI_BLOB_UPLOAD_CONCURRENCY:
+                        _flush_blobs()
+                    uploads.add(exe.submit(_upload_chunk, fileobj, size, checksum, lock))
                     logger.debug("FileBlob.from_files.end", extra={"checksum": reference_checksum})
 
-            _flush_blobs()
+                _flush_blobs(return_when=ALL_COMPLETED)
         finally:
             for lock in locks:
                 try:
@@ -331,21 +329,29 @@ class File(Model):
         app_label = "sentry"
         db_table = "sentry_file"
 
-    def _get_chunked_blob(self, mode=None, prefetch=False, prefetch_to=None, delete=True):
+    def _get_chunked_blob(
+        self, mode=None, prefetch=False, prefetch_to=None, delete=True, read_ahead=0
+    ):
         return ChunkedFileBlobIndexWrapper(
             FileBlobIndex.objects.filter(file=self).select_related("blob").order_by("offset"),
             mode=mode,
             prefetch=prefetch,
             prefetch_to=prefetch_to,
             delete=delete,
+            read_ahead=read_ahead,
         )
 
-    def getfile(self, mode=None, prefetch=False):
+    def getfile(self, mode=None, prefetch=False, read_ahead=0):
         """Returns a file object.  By default the file is fetched on
         demand but if prefetch is enabled the file is fully prefetched
         into a tempfile before reading can happen.
+
+        If `read_ahead` is set, up to that many blobs following the current
+        read position are fetched in the background while reading.  Unlike
+        prefetching, this does not require downloading the entire file before
+        the first read and supports seeking anywhere in the file.
         """
-        impl = self._get_chunked_blob(mode, prefetch)
+        impl = self._get_chunked_blob(mode, prefetch, read_ahead=read_ahead)
         return FileObj(impl, self.name)
 
     def save_to(self, path):
@@ -483,17 +489,35 @@ class FileBlobIndex(Model):
         unique_together = (("file", "blob", "offset"),)
 
 
+def _fetch_blob(blob):
+    start = time.time()
+    with blob.getfile() as f:
+        contents = f.read()
+    duration = time.time() - start
+    metrics.timing("filestore.read-ahead.blob-duration", duration)
+    return io.BytesIO(contents), len(contents), duration
+
+
 class ChunkedFileBlobIndexWrapper:
-    def __init__(self, indexes, mode=None, prefetch=False, prefetch_to=None, delete=True):
+    def __init__(
+        self, indexes, mode=None, prefetch=False, prefetch_to=None, delete=True, read_ahead=0
+    ):
         # eager load from database incase its a queryset
         self._indexes = list(indexes)
         self._curfile = None
         self._curidx = None
+        self._read_ahead = 0
         if prefetch:
             self.prefetched = True
             self._prefetch(prefetch_to, delete)
         else:
             self.prefetched = False
+            if read_ahead > 0:
+                self._read_ahead = read_ahead
+                self._read_ahead_executor = None
+                self._read_ahead_futures = {}
+                self._read_ahead_bytes = 0
+                self._read_ahead_duration = 0.0
         self.mode = mode
         self.open()
 
@@ -517,8 +541,12 @@ class ChunkedFileBlobIndexWrapper:
         old_file = self._curfile
         try:
             try:
-                self._curidx = next(self._idxiter)
-                self._curfile = self._curidx.blob.getfile()
+                position = next(self._idxiter)
+                self._curidx = self._indexes[position]
+                if self._read_ahead:
+                    self._curfile = self._read_ahead_getfile(position)
+                else:
+                    self._curfile = self._curidx.blob.getfile()
             except StopIteration:
                 self._curidx = None
                 self._curfile = None
@@ -526,6 +554,46 @@ class ChunkedFileBlobIndexWrapper:
             if old_file is not None:
                 old_file.close()
 
+    def _read_ahead_getfile(self, position):
+        """Returns the contents of the blob at `position`, and schedules
+        fetching of the blobs following it.  Scheduled fetches that are
+        outside of the read-ahead window (for instance after seeking) are
+        discarded.
+        """
+        window = range(position, min(position + self._read_ahead + 1, len(self._indexes)))
+        if self._read_ahead_executor is None:
+            self._read_ahead_executor = ThreadPoolExecutor(max_workers=self._read_ahead)
+
+        futures = self._read_ahead_futures
+        for stale in set(futures) - set(window):
+            futures.pop(stale).cancel()
+        for i in window:
+            if i not in futures:
+                futures[i] = self._read_ahead_executor.submit(_fetch_blob, self._indexes[i].blob)
+
+        fileobj, size, duration = futures.pop(position).result()
+        self._read_ahead_bytes += size
+        self._read_ahead_duration += duration
+        return fileobj
+
+    def _close_read_ahead(self):
+        for future in self._read_ahead_futures.values():
+            future.cancel()
+        self._read_ahead_futures.clear()
+        if self._read_ahead_executor is not None:
+            self._read_ahead_executor.shutdown(wait=False)
+            self._read_ahead_executor = None
+
+        if self._read_ahead_bytes:
+            metrics.timing("filestore.read-ahead.bytes", self._read_ahead_bytes)
+            if self._read_ahead_duration > 0:
+                metrics.timing(
+                    "filestore.read-ahead.throughput",
+                    self._read_ahead_bytes / self._read_ahead_duration,
+                )
+            self._read_ahead_bytes = 0
+            self._read_ahead_duration = 0.0
+
     @property
     def size(self):
         return sum(i.blob.size for i in self._indexes)
@@ -567,6 +635,8 @@ class ChunkedFileBlobIndexWrapper:
     def close(self):
         if self._curfile:
             self._curfile.close()
+        if self._read_ahead:
+            self._close_read_ahead()
         self._curfile = None
         self._curidx = None
         self.closed = True
@@ -587,7 +657,7 @@ class ChunkedFileBlobIndexWrapper:
         for n, idx in enumerate(self._indexes[::-1]):
             if idx.offset <= pos:
                 if idx != self._curidx:
-                    self._idxiter = iter(self._indexes[-(n + 1) :])
+                    self._idxiter = iter(range(len(self._indexes) - (n + 1), len(self._indexes)))
                     self._nextidx()
                 break
         else:
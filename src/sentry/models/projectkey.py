@@ -77,6 +77,8 @@ class ProjectKey(Model):
         # store projectkeys in memcached for longer than other models,
         # specifically to make the relay_projectconfig endpoint faster.
         cache_ttl=60 * 30,
+        # avoid a second cache round trip when looking up keys by public key
+        cache_secondary_instances=True,
     )
 
     data = JSONField()
@@ -1,4 +1,4 @@
-from typing import Any, Mapping, Optional, Sequence, Tuple, Union
+from typing import TYPE_CHECKING, Any, Mapping, Optional, Sequence, Tuple, Union
 
 from django.db import models
 from django.db.models.signals import post_delete, post_save
@@ -7,12 +7,21 @@ from django.utils import timezone
 from sentry.db.models import Model, sane_repr
 from sentry.db.models.fields import FlexibleForeignKey, JSONField
 from sentry.models import ActorTuple
-from sentry.ownership.grammar import Rule, load_schema, resolve_actors
-from sentry.utils import metrics
+from sentry.ownership.grammar import CompiledRules, Rule, resolve_actors
+from sentry.utils import json, metrics
 from sentry.utils.cache import cache
+from sentry.utils.hashlib import md5_text
+from sentry.utils.lru import LRUCache
+
+if TYPE_CHECKING:
+    from sentry.models import ProjectCodeOwners
 
 READ_CACHE_DURATION = 3600
 
+# Compiled ownership schemas, keyed by project and a digest of the schema so
+# that edits to the ownership rules or code owners are picked up immediately.
+_compiled_rules: LRUCache[Tuple[int, str], CompiledRules] = LRUCache(1000)
+
 
 class ProjectOwnership(Model):
     __include_in_export__ = True
@@ -192,15 +201,32 @@ class ProjectOwnership(Model):
 
     @classmethod
     def _matching_ownership_rules(
-        cls, ownership: "ProjectOwnership", project_id: int, data: Mapping[str, Any]
+        cls,
+        ownership: Union["ProjectOwnership", "ProjectCodeOwners"],
+        project_id: int,
+        data: Mapping[str, Any],
     ) -> Sequence["Rule"]:
-        rules = []
-        if ownership.schema is not None:
-            for rule in load_schema(ownership.schema):
-                if rule.test(data):
-                    rules.append(rule)
+        if ownership.schema is None:
+            return []
 
-        return rules
+        return cls._get_compiled_rules(project_id, ownership).matching_rules(data)
+
+    @classmethod
+    def _get_compiled_rules(
+        cls, project_id: int, ownership: Union["ProjectOwnership", "ProjectCodeOwners"]
+    ) -> CompiledRules:
+        # The schema is keyed on instead of a timestamp, since it may be
+        # combined with the project's code owners (see `get_owners`) or merged
+        # from several CODEOWNERS files, and may not have been saved at all.
+        key = (project_id, md5_text(json.dumps(ownership.schema)).hexdigest())
+        compiled = _compiled_rules.get(key)
+        if compiled is None:
+            metrics.incr("projectownership.compiled_rules", tags={"cache": "miss"})
+            compiled = CompiledRules.from_schema(ownership.schema)
+            _compiled_rules.set(key, compiled)
+        else:
+            metrics.incr("projectownership.compiled_rules", tags={"cache": "hit"})
+        return compiled
 
 
 # Signals update the cached reads used in post_processing
@@ -1,7 +1,9 @@
 import errno
 import logging
 import os
+import struct
 import zipfile
+import zlib
 from contextlib import contextmanager
 from hashlib import sha1
 from io import BytesIO
@@ -9,6 +11,7 @@ from tempfile import TemporaryDirectory
 from typing import IO, Optional, Tuple
 from urllib.parse import urlsplit, urlunsplit
 
+from django.conf import settings
 from django.core.files.base import File as FileObj
 from django.db import models, router
 
@@ -151,7 +154,7 @@ class ReleaseFileCache:
         file_size = releasefile.file.size
         if file_size < cutoff:
             metrics.timing("release_file.cache.get.size", file_size, tags={"cutoff": True})
-            return releasefile.file.getfile()
+            return releasefile.file.getfile(read_ahead=settings.SENTRY_FILE_READ_AHEAD_BLOBS)
 
         file_id = str(releasefile.file.id)
         organization_id = str(releasefile.organization_id)
@@ -225,6 +228,46 @@ class ReleaseArchive:
         return temp_dir
 
 
+# Local file header of a ZIP archive, see section 4.3.7 of
+# https://pkware.cachefly.net/webdocs/casestudies/APPNOTE.TXT
+_ZIP_LOCAL_FILE_HEADER = struct.Struct("<4s2B4HL2L2H")
+_ZIP_LOCAL_FILE_HEADER_MAGIC = b"PK\003\004"
+
+
+def read_archived_file(fileobj: IO, location: dict) -> bytes:
+    """Read a single file from a release archive.
+
+    ``location`` is the ``zip`` entry stored in the artifact index for the
+    file. Only the local file header and the file's data are read from
+    ``fileobj``.
+
+    May raise ``zipfile.BadZipFile`` or ``NotImplementedError`` for
+    unsupported compression methods.
+    """
+    fileobj.seek(location["offset"])
+    header = fileobj.read(_ZIP_LOCAL_FILE_HEADER.size)
+    if len(header) != _ZIP_LOCAL_FILE_HEADER.size:
+        raise zipfile.BadZipFile("Truncated file header")
+    header = _ZIP_LOCAL_FILE_HEADER.unpack(header)
+    if header[0] != _ZIP_LOCAL_FILE_HEADER_MAGIC:
+        raise zipfile.BadZipFile("Bad magic number for file header")
+
+    filename_length, extra_length = header[10], header[11]
+    fileobj.seek(location["offset"] + _ZIP_LOCAL_FILE_HEADER.size + filename_length + extra_length)
+    data = fileobj.read(location["compressed_size"])
+
+    compression = location["compression"]
+    if compression == zipfile.ZIP_DEFLATED:
+        data = zlib.decompress(data, -zlib.MAX_WBITS)
+    elif compression != zipfile.ZIP_STORED:
+        raise NotImplementedError(f"Unsupported compression method {compression}")
+
+    if zlib.crc32(data) != location["crc32"]:
+        raise zipfile.BadZipFile("Bad CRC-32 for file")
+
+    return data
+
+
 class _ArtifactIndexData:
     """Holds data of artifact index and keeps track of changes"""
 
@@ -390,7 +433,9 @@ def update_artifact_index(release: Release, dist: Optional[Distribution], archiv
     )
 
     files_out = {}
-    with ReleaseArchive(archive_file.getfile()) as archive:
+    with ReleaseArchive(
+        archive_file.getfile(read_ahead=settings.SENTRY_FILE_READ_AHEAD_BLOBS)
+    ) as archive:
         manifest = archive.manifest
 
         files = manifest.get("files", {})
@@ -404,7 +449,16 @@ def update_artifact_index(release: Release, dist: Optional[Distribution], archiv
             info["archive_ident"] = releasefile.ident
             info["date_created"] = archive_file.timestamp
             info["sha1"] = _compute_sha1(archive, filename)
-            info["size"] = archive.info(filename).file_size
+            zip_info = archive.info(filename)
+            info["size"] = zip_info.file_size
+            # Location of the file within the archive, so it can be read
+            # without loading the central directory or the manifest.
+            info["zip"] = {
+                "offset": zip_info.header_offset,
+                "compressed_size": zip_info.compress_size,
+                "compression": zip_info.compress_type,
+                "crc32": zip_info.CRC,
+            }
             files_out[url] = info
 
     guard = _ArtifactIndexGuard(release, dist)
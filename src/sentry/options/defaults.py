@@ -387,3 +387,15 @@ register("store.save-transactions-ingest-consumer-rate", default=0.0)
 
 # Drop delete_old_primary_hash messages for a particular project.
 register("reprocessing2.drop-delete-old-primary-hash", default=[])
+
+# Fraction of release health calls replayed against the metrics backend when
+# DuplexReleaseHealthBackend runs in shadow mode.
+register("release-health.duplex-shadow-sample-rate", default=0.0)
+
+# Number of fragments of the time range exported in parallel by discover
+# exports paged through with a keyset cursor. 0 disables keyset exports.
+register("data-export.keyset-fragments", default=0)
+
+# Names of API endpoints whose list responses are streamed, see
+# Endpoint.respond_stream.
+register("api.stream-responses", type=Sequence, default=[])
@@ -5,6 +5,7 @@ from functools import reduce
 from typing import Iterable, List, Mapping, Pattern, Tuple
 
 from django.db.models import Q
+from django.utils.functional import cached_property
 from parsimonious.exceptions import ParseError  # noqa
 from parsimonious.grammar import Grammar, NodeVisitor
 from rest_framework.serializers import ValidationError
@@ -337,6 +338,128 @@ def _iter_frames(data):
             continue
 
 
+class _EventValues:
+    """
+    The parts of an event that matchers are tested against, each collected
+    at most once no matter how many rules look at them.
+    """
+
+    def __init__(self, data):
+        self.data = data
+
+    @cached_property
+    def frames(self):
+        return list(_iter_frames(self.data))
+
+    @cached_property
+    def url(self):
+        try:
+            return self.data["request"]["url"]
+        except KeyError:
+            return None
+
+    @cached_property
+    def paths(self):
+        return _unique_values(
+            frame.get(key) for frame in self.frames for key in ("filename", "abs_path")
+        )
+
+    @cached_property
+    def modules(self):
+        return _unique_values(frame.get("module") for frame in self.frames)
+
+    @cached_property
+    def codeowners_paths(self):
+        return _unique_values(
+            frame.get("filename") or frame.get("abs_path") for frame in self.frames
+        )
+
+    @cached_property
+    def tags(self):
+        tags = {}
+        for k, v in get_path(self.data, "tags", filter=True) or ():
+            tags.setdefault(k, []).append(v)
+        return tags
+
+
+def _unique_values(values):
+    # Preserves the order of first occurrence so matching short-circuits on
+    # the same frame as it would when walking the stack trace.
+    return list(dict.fromkeys(value for value in values if value))
+
+
+class CompiledRules:
+    """
+    An ownership schema prepared for matching many events.
+
+    The schema is loaded once, codeowners patterns are compiled to regexes
+    up front, and each event only has its frames walked once regardless of
+    the number of rules. The result is equivalent to testing every rule of
+    ``load_schema(schema)`` with ``Rule.test``.
+    """
+
+    def __init__(self, rules: List[Rule]):
+        self.rules = rules
+        self._tests = [self._compile(rule.matcher) for rule in rules]
+
+    @classmethod
+    def from_schema(cls, schema) -> "CompiledRules":
+        return cls(load_schema(schema))
+
+    def __len__(self) -> int:
+        return len(self.rules)
+
+    @staticmethod
+    def _compile(matcher: Matcher):
+        pattern = matcher.pattern
+
+        if matcher.type == URL:
+
+            def test(values):
+                url = values.url
+                return bool(url) and glob_match(url, pattern, ignorecase=True)
+
+        elif matcher.type == PATH:
+
+            def test(values):
+                return any(
+                    glob_match(value, pattern, ignorecase=True, path_normalize=True)
+                    for value in values.paths
+                )
+
+        elif matcher.type == MODULE:
+
+            def test(values):
+                return any(
+                    glob_match(value, pattern, ignorecase=True, path_normalize=True)
+                    for value in values.modules
+                )
+
+        elif matcher.type.startswith("tags."):
+            tag = matcher.type[5:]
+
+            def test(values):
+                return any(glob_match(v, pattern) for v in values.tags.get(tag, ()))
+
+        elif matcher.type == CODEOWNERS:
+            spec = _path_to_regex(pattern)
+
+            def test(values):
+                return any(spec.search(value) for value in values.codeowners_paths)
+
+        else:
+
+            def test(values):
+                return False
+
+        return test
+
+    def matching_rules(self, data) -> List[Rule]:
+        """Returns all rules matching the event, in schema order."""
+        values = _EventValues(data)
+        return [rule for rule, test in zip(self.rules, self._tests) if test(values)]
+
+
 def parse_rules(data):
     """Convert a raw text input into a Rule tree"""
     tree = ownership_grammar.parse(data)
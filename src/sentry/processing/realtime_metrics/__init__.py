@@ -23,6 +23,7 @@ if TYPE_CHECKING:
     projects = realtime_metrics_store.projects
     get_counts_for_project = realtime_metrics_store.get_counts_for_project
     get_durations_for_project = realtime_metrics_store.get_durations_for_project
+    get_project_metrics = realtime_metrics_store.get_project_metrics
     get_lpq_projects = realtime_metrics_store.get_lpq_projects
     is_lpq_project = realtime_metrics_store.is_lpq_project
     add_project_to_lpq = realtime_metrics_store.add_project_to_lpq
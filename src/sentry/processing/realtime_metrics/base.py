@@ -1,7 +1,7 @@
 import collections
 import dataclasses
 import enum
-from typing import ClassVar, DefaultDict, Iterable, List, Set, Union
+from typing import ClassVar, DefaultDict, Iterable, List, Mapping, Optional, Set, Union
 
 from sentry.utils.services import Service
 
@@ -130,6 +130,22 @@ class BucketedDurationsHistograms:
         return self.width * len(self.histograms)
 
 
+@dataclasses.dataclass(frozen=True)
+class ProjectMetrics:
+    """Summarized symbolication metrics of a project.
+
+    ``recent_rate`` and ``total_rate`` are the rates of symbolication requests per second over
+    the last minute and over the whole counter time window.  ``p75_duration`` is the 75th
+    percentile of processing durations in seconds, or ``None`` if no durations were recorded,
+    and ``events_per_minute`` is the rate of requests with a recorded duration.
+    """
+
+    recent_rate: float
+    total_rate: float
+    p75_duration: Optional[float]
+    events_per_minute: float
+
+
 class RealtimeMetricsStore(Service):  # type: ignore
     """A service for storing metrics about incoming requests within a given time window."""
 
@@ -140,6 +156,7 @@ class RealtimeMetricsStore(Service):  # type: ignore
         "projects",
         "get_counts_for_project",
         "get_durations_for_project",
+        "get_project_metrics",
         "get_lpq_projects",
         "add_project_to_lpq",
         "remove_projects_from_lpq",
@@ -197,6 +214,15 @@ class RealtimeMetricsStore(Service):  # type: ignore
         """
         raise NotImplementedError
 
+    def get_project_metrics(self, timestamp: int) -> Optional[Mapping[int, ProjectMetrics]]:
+        """
+        Returns summarized metrics of all projects with recent metrics at once.
+
+        Returns ``None`` if the store only supports fetching bucketed metrics project by project,
+        using :meth:`get_counts_for_project` and :meth:`get_durations_for_project`.
+        """
+        return None
+
     def get_lpq_projects(self) -> Set[int]:
         """
         Fetches the list of projects that are currently using the low priority queue.
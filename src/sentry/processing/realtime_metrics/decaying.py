@@ -0,0 +1,285 @@
+import math
+from typing import Iterable, List, Mapping, MutableMapping, Optional, Sequence, Tuple
+
+from sentry.exceptions import InvalidConfiguration
+from sentry.utils import redis
+
+from . import base
+from .redis import RedisRealtimeMetricsStore
+
+# The time constant in seconds of the recent rate of events.
+RECENT_RATE_WINDOW = 60
+
+# Buckets of the durations sketch are dropped once their decayed count falls below this.
+MIN_SKETCH_COUNT = 0.01
+
+update_rates = redis.load_script("realtime_metrics/decaying_rates.lua")
+update_sketch = redis.load_script("realtime_metrics/decaying_sketch.lua")
+
+
+def _round_counts(counts: Sequence[float]) -> List[int]:
+    """Rounds the counts to integers while keeping their running sum."""
+    rounded = []
+    running_count = 0.0
+    for count in counts:
+        previous = round(running_count)
+        running_count += count
+        rounded.append(round(running_count) - previous)
+    return rounded
+
+
+class DecayingRedisRealtimeMetricsStore(RedisRealtimeMetricsStore):
+    """An implementation of RealtimeMetricsStore which keeps summarized metrics in Redis.
+
+    Instead of one key per project and time bucket, every project has a single field in two
+    hashes shared by all projects: one holding exponentially decayed event rates and one holding
+    a decayed sketch of processing durations with logarithmically sized buckets (as in DDSketch).
+    Both are maintained by Lua scripts, so that the metrics of all active projects can be fetched
+    in a single round trip without scanning the keyspace.
+
+    Bucketed metrics of single projects are approximated from the summarized metrics.
+    """
+
+    def __init__(
+        self,
+        cluster: str,
+        counter_bucket_size: int,
+        counter_time_window: int,
+        duration_bucket_size: int,
+        duration_time_window: int,
+        backoff_timer: int,
+        relative_accuracy: float = 0.05,
+    ) -> None:
+        """Creates a DecayingRedisRealtimeMetricsStore.
+
+        Takes the same options as RedisRealtimeMetricsStore, though bucket sizes are not used.
+        "relative_accuracy" is the maximum relative error of duration percentiles.
+        """
+        self._relative_accuracy = relative_accuracy
+        super().__init__(
+            cluster=cluster,
+            counter_bucket_size=counter_bucket_size,
+            counter_time_window=counter_time_window,
+            duration_bucket_size=duration_bucket_size,
+            duration_time_window=duration_time_window,
+            backoff_timer=backoff_timer,
+        )
+        self._gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+
+    def validate(self) -> None:
+        super().validate()
+
+        if not 0 < self._relative_accuracy < 1:
+            raise InvalidConfiguration("relative accuracy must be between 0 and 1")
+
+    def _rates_key(self) -> str:
+        return f"{self._prefix}:decaying:rates"
+
+    def _durations_key(self) -> str:
+        return f"{self._prefix}:decaying:durations"
+
+    def _sketch_index(self, duration: int) -> int:
+        # Durations may be zero, so the sketch covers `duration + 1` instead.
+        return math.ceil(math.log(max(duration, 0) + 1, self._gamma))
+
+    def _sketch_value(self, index: int) -> float:
+        return 2 * self._gamma ** index / (self._gamma + 1) - 1
+
+    def increment_project_event_counter(self, project_id: int, timestamp: int) -> None:
+        """Increment the event counter for the given project_id.
+
+        This updates the decayed recent and total rates of events for the project, with
+        "timestamp" providing the time of the event in seconds since the UNIX epoch.
+        """
+        update_rates(
+            self.cluster,
+            [self._rates_key()],
+            [
+                project_id,
+                timestamp,
+                self._counter_time_window,
+                RECENT_RATE_WINDOW,
+                self._counter_time_window,
+            ],
+        )
+
+    def increment_project_duration_counter(
+        self, project_id: int, timestamp: int, duration: int
+    ) -> None:
+        """Increments the duration counter for the given project_id and duration.
+
+        This adds "duration" (the processing time in seconds) to the decayed durations sketch of
+        the project, with "timestamp" providing the time of the event in seconds since the UNIX
+        epoch.
+        """
+        update_sketch(
+            self.cluster,
+            [self._durations_key()],
+            [
+                project_id,
+                timestamp,
+                self._duration_time_window,
+                self._duration_time_window,
+                self._sketch_index(duration),
+                MIN_SKETCH_COUNT,
+            ],
+        )
+
+    def projects(self) -> Iterable[int]:
+        """
+        Returns IDs of all projects for which metrics have been recorded in the store.
+
+        This may include projects whose metrics have already expired, until the next call to
+        get_project_metrics removes them.
+        """
+        with self.cluster.pipeline(transaction=False) as pipeline:
+            pipeline.hkeys(self._rates_key())
+            pipeline.hkeys(self._durations_key())
+            rates, durations = pipeline.execute()
+
+        return {int(project_id) for project_id in (*rates, *durations)}
+
+    def _buckets(self, timestamp: int, bucket_size: int, time_window: int) -> range:
+        # The same buckets as returned by RedisRealtimeMetricsStore.
+        now_bucket = timestamp - timestamp % bucket_size
+        first_bucket = timestamp - time_window
+        first_bucket = first_bucket - first_bucket % bucket_size
+        return range(first_bucket, now_bucket + bucket_size, bucket_size)
+
+    def get_counts_for_project(self, project_id: int, timestamp: int) -> base.BucketedCounts:
+        """Returns bucketed counts of symbolicator requests approximated from the decayed rates.
+
+        The buckets cover the same timespan as those of RedisRealtimeMetricsStore. The buckets of
+        the last minute hold the recent rate and the remaining buckets evenly share the rest of
+        the total rate, so that rates computed over either period match get_project_metrics.
+        """
+        bucket_size = self._counter_bucket_size
+        buckets = self._buckets(timestamp, bucket_size, self._counter_time_window)
+
+        value = self.cluster.hget(self._rates_key(), project_id)
+        rates = self._parse_rates(value, timestamp) if value is not None else None
+        recent_rate, total_rate = rates or (0.0, 0.0)
+
+        recent_buckets = min(max(RECENT_RATE_WINDOW // bucket_size, 1), len(buckets))
+        older_buckets = len(buckets) - recent_buckets
+        recent_count = recent_rate * recent_buckets * bucket_size
+        older_count = max(total_rate * len(buckets) * bucket_size - recent_count, 0.0)
+        expected = [older_count / older_buckets] * older_buckets if older_buckets else []
+        expected += [recent_count / recent_buckets] * recent_buckets
+
+        return base.BucketedCounts(
+            timestamp=buckets[0], width=bucket_size, counts=_round_counts(expected)
+        )
+
+    def get_durations_for_project(
+        self, project_id: int, timestamp: int
+    ) -> base.BucketedDurationsHistograms:
+        """Returns bucketed histograms of symbolication durations approximated from the sketch.
+
+        The buckets cover the same timespan as those of RedisRealtimeMetricsStore. The sketch
+        does not record when durations occurred, so all of them are added to the histogram of
+        the last bucket.
+        """
+        bucket_size = self._duration_bucket_size
+        buckets = self._buckets(timestamp, bucket_size, self._duration_time_window)
+        histograms = [base.DurationsHistogram(bucket_size=10) for _ in buckets]
+
+        value = self.cluster.hget(self._durations_key(), project_id)
+        sketch = self._parse_sketch(value, timestamp) if value is not None else None
+        if sketch:
+            indexes = sorted(sketch)
+            counts = _round_counts([sketch[index] for index in indexes])
+            for index, count in zip(indexes, counts):
+                if count:
+                    histograms[-1].incr(int(self._sketch_value(index)), count)
+
+        return base.BucketedDurationsHistograms(
+            timestamp=buckets[0], width=bucket_size, histograms=histograms
+        )
+
+    def _parse_rates(self, value: str, timestamp: int) -> Optional[Tuple[float, float]]:
+        last_raw, recent_raw, total_raw = value.split(",")
+        elapsed = timestamp - int(last_raw)
+        if elapsed > self._counter_time_window:
+            return None
+        elapsed = max(elapsed, 0)
+        return (
+            float(recent_raw) * math.exp(-elapsed / RECENT_RATE_WINDOW),
+            float(total_raw) * math.exp(-elapsed / self._counter_time_window),
+        )
+
+    def _parse_sketch(self, value: str, timestamp: int) -> Optional[Mapping[int, float]]:
+        last_raw, buckets_raw = value.split("|")
+        elapsed = timestamp - int(last_raw)
+        if elapsed > self._duration_time_window:
+            return None
+        decay = math.exp(-max(elapsed, 0) / self._duration_time_window)
+
+        sketch = {}
+        for bucket in filter(None, buckets_raw.split(",")):
+            index, count = bucket.split(":")
+            sketch[int(index)] = float(count) * decay
+        return sketch
+
+    def _sketch_percentile(self, sketch: Mapping[int, float], percentile: float) -> float:
+        required_count = percentile * sum(sketch.values())
+        running_count = 0.0
+        for index in sorted(sketch):
+            running_count += sketch[index]
+            if running_count >= required_count:
+                break
+        return self._sketch_value(index)
+
+    def get_project_metrics(self, timestamp: int) -> Mapping[int, base.ProjectMetrics]:
+        """
+        Returns the decayed metrics of all projects with metrics recorded within the time
+        windows before `timestamp`.
+
+        Projects whose metrics have expired are removed from the store. This may throw an
+        exception if there is some sort of issue fetching metrics from the redis store.
+        """
+        with self.cluster.pipeline(transaction=False) as pipeline:
+            pipeline.hgetall(self._rates_key())
+            pipeline.hgetall(self._durations_key())
+            all_rates, all_sketches = pipeline.execute()
+
+        rates: MutableMapping[int, Tuple[float, float]] = {}
+        expired_rates = []
+        for project_id, value in all_rates.items():
+            parsed_rates = self._parse_rates(value, timestamp)
+            if parsed_rates is None:
+                expired_rates.append(project_id)
+            else:
+                rates[int(project_id)] = parsed_rates
+
+        sketches: MutableMapping[int, Mapping[int, float]] = {}
+        expired_sketches = []
+        for project_id, value in all_sketches.items():
+            sketch = self._parse_sketch(value, timestamp)
+            if sketch is None:
+                expired_sketches.append(project_id)
+            elif sketch:
+                sketches[int(project_id)] = sketch
+
+        if expired_rates or expired_sketches:
+            with self.cluster.pipeline(transaction=False) as pipeline:
+                if expired_rates:
+                    pipeline.hdel(self._rates_key(), *expired_rates)
+                if expired_sketches:
+                    pipeline.hdel(self._durations_key(), *expired_sketches)
+                pipeline.execute()
+
+        project_metrics = {}
+        for project_id in rates.keys() | sketches.keys():
+            recent_rate, total_rate = rates.get(project_id, (0.0, 0.0))
+            sketch = sketches.get(project_id)
+            project_metrics[project_id] = base.ProjectMetrics(
+                recent_rate=recent_rate,
+                total_rate=total_rate,
+                p75_duration=self._sketch_percentile(sketch, 0.75) if sketch else None,
+                events_per_minute=(
+                    sum(sketch.values()) / (self._duration_time_window / 60) if sketch else 0.0
+                ),
+            )
+
+        return project_metrics
@@ -1,7 +1,10 @@
 import collections.abc
+import random
+from concurrent.futures import ThreadPoolExecutor
 from copy import deepcopy
 from datetime import datetime, timedelta, timezone
 from enum import Enum
+from threading import BoundedSemaphore
 from typing import (
     TYPE_CHECKING,
     Any,
@@ -18,10 +21,11 @@ from typing import (
 
 import pytz
 from dateutil import parser
-from sentry_sdk import capture_exception, capture_message, push_scope, set_context, set_tag
+from django.db import close_old_connections
+from sentry_sdk import Hub, capture_exception, capture_message, push_scope, set_context, set_tag
 from typing_extensions import Literal
 
-from sentry import features
+from sentry import features, options
 from sentry.models import Organization, Project
 from sentry.release_health.base import (
     CrashFreeBreakdown,
@@ -438,15 +442,35 @@ def compare_results(
 
 
 class DuplexReleaseHealthBackend(ReleaseHealthBackend):
+    """
+    Answers release health calls from the sessions backend, and compares the
+    results with the metrics backend for organizations with the
+    `organizations:release-health-check-metrics` feature.
+
+    By default both backends are called on the request path. In shadow mode,
+    only the sessions backend is, while a sample of calls (the
+    `release-health.duplex-shadow-sample-rate` option) is replayed against the
+    metrics backend in the background. At most `shadow_concurrency` calls are
+    replayed at a time, calls exceeding this are dropped.
+    """
+
     DEFAULT_ROLLUP = 60 * 60  # 1h
 
     def __init__(
         self,
         metrics_start: datetime,
+        shadow: bool = False,
+        shadow_concurrency: int = 4,
     ):
         self.sessions = SessionsReleaseHealthBackend()
         self.metrics = MetricsReleaseHealthBackend()
         self.metrics_start = metrics_start
+        self.shadow = shadow
+        if shadow:
+            self._shadow_executor = ThreadPoolExecutor(
+                max_workers=shadow_concurrency, thread_name_prefix="release-health-shadow"
+            )
+            self._shadow_slots = BoundedSemaphore(shadow_concurrency)
 
     @staticmethod
     def _org_from_projects(projects_list: Sequence[ProjectOrRelease]) -> Optional[Organization]:
@@ -517,28 +541,10 @@ class DuplexReleaseHealthBackend(ReleaseHealthBackend):
             if not should_compare:
                 return ret_val
 
-            copy = deepcopy(ret_val)
-
-            metrics_fn = getattr(self.metrics, fn_name)
-            with timer("releasehealth.metrics.duration", tags=tags, sample_rate=1.0):
-                metrics_val = metrics_fn(*args)
-
-            set_context("release-health-duplex-metrics", {"metrics": metrics_val})
-
-            with timer("releasehealth.results-diff.duration", tags=tags, sample_rate=1.0):
-                errors = compare_results(copy, metrics_val, rollup, None, schema)
-
-            set_context("release-health-duplex-errors", {"errors": errors})
-
-            incr(
-                "releasehealth.metrics.compare",
-                tags={"has_errors": str(bool(errors)), **tags},
-                sample_rate=1.0,
-            )
-
-            if errors:
-                # We heavily rely on Sentry's message sanitization to properly deduplicate this
-                capture_message(f"{fn_name} - Release health metrics mismatch: {errors[0]}")
+            if self.shadow:
+                self._submit_shadow_comparison(fn_name, rollup, schema, tags, ret_val, args)
+            else:
+                self._compare(fn_name, rollup, schema, tags, deepcopy(ret_val), args)
         except Exception:
             capture_exception()
             should_compare = False
@@ -550,6 +556,95 @@ class DuplexReleaseHealthBackend(ReleaseHealthBackend):
 
         return ret_val
 
+    def _compare(
+        self,
+        fn_name: str,
+        rollup: int,
+        schema: Optional[Schema],
+        tags: Mapping[str, str],
+        sessions_val: ReleaseHealthResult,
+        args: Sequence[Any],
+    ) -> None:
+        metrics_fn = getattr(self.metrics, fn_name)
+        with timer("releasehealth.metrics.duration", tags=tags, sample_rate=1.0):
+            metrics_val = metrics_fn(*args)
+
+        set_context("release-health-duplex-metrics", {"metrics": metrics_val})
+
+        with timer("releasehealth.results-diff.duration", tags=tags, sample_rate=1.0):
+            errors = compare_results(sessions_val, metrics_val, rollup, None, schema)
+
+        set_context("release-health-duplex-errors", {"errors": errors})
+
+        incr(
+            "releasehealth.metrics.compare",
+            tags={"has_errors": str(bool(errors)), **tags},
+            sample_rate=1.0,
+        )
+
+        if errors:
+            # We heavily rely on Sentry's message sanitization to properly deduplicate this
+            capture_message(f"{fn_name} - Release health metrics mismatch: {errors[0]}")
+
+    def _submit_shadow_comparison(
+        self,
+        fn_name: str,
+        rollup: int,
+        schema: Optional[Schema],
+        tags: Mapping[str, str],
+        sessions_val: ReleaseHealthResult,
+        args: Sequence[Any],
+    ) -> None:
+        sample_rate = options.get("release-health.duplex-shadow-sample-rate")
+        if not sample_rate or random.random() > sample_rate:
+            outcome = "skipped"
+        elif not self._shadow_slots.acquire(blocking=False):
+            outcome = "dropped"
+        else:
+            try:
+                # Copied here, since the caller may modify the result and the
+                # arguments in the meantime.
+                self._shadow_executor.submit(
+                    self._run_shadow_comparison,
+                    Hub(Hub.current),
+                    fn_name,
+                    rollup,
+                    schema,
+                    tags,
+                    deepcopy(sessions_val),
+                    deepcopy(args),
+                )
+            except Exception:
+                self._shadow_slots.release()
+                raise
+            outcome = "submitted"
+
+        incr("releasehealth.metrics.shadow", tags={"outcome": outcome, **tags}, sample_rate=1.0)
+
+    def _run_shadow_comparison(
+        self,
+        hub: Hub,
+        fn_name: str,
+        rollup: int,
+        schema: Optional[Schema],
+        tags: Mapping[str, str],
+        sessions_val: ReleaseHealthResult,
+        args: Sequence[Any],
+    ) -> None:
+        # Connections of the executor's threads outlive the comparison, so they
+        # are cleaned up like those of a request or task.
+        close_old_connections()
+        try:
+            with Hub(hub), push_scope():
+                try:
+                    self._compare(fn_name, rollup, schema, tags, sessions_val, args)
+                except Exception:
+                    capture_exception()
+                    incr("releasehealth.metrics.crashed", tags=tags, sample_rate=1.0)
+        finally:
+            self._shadow_slots.release()
+            close_old_connections()
+
     if TYPE_CHECKING:
         # Mypy is not smart enough to figure out _dispatch_call is a wrapper
         # around _dispatch_call_inner with the same exact signature, and I am
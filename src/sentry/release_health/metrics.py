@@ -1,6 +1,10 @@
+import functools
 import itertools
 import logging
+import threading
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import ContextVar
 from datetime import datetime, timedelta
 from operator import itemgetter
 from typing import (
@@ -8,9 +12,11 @@ from typing import (
     Callable,
     DefaultDict,
     Dict,
+    Iterable,
     List,
     Mapping,
     MutableMapping,
+    NamedTuple,
     Optional,
     Sequence,
     Set,
@@ -20,6 +26,7 @@ from typing import (
 )
 
 import pytz
+import sentry_sdk
 from snuba_sdk import Column, Condition, Direction, Entity, Function, Op, OrderBy, Query
 from snuba_sdk.expressions import Expression, Granularity, Limit, Offset
 from snuba_sdk.query import SelectableExpression
@@ -56,8 +63,10 @@ from sentry.sentry_metrics.sessions import SessionMetricKey as MetricKey
 from sentry.snuba.dataset import Dataset, EntityKey
 from sentry.snuba.sessions import _make_stats, get_rollup_starts_and_buckets, parse_snuba_datetime
 from sentry.snuba.sessions_v2 import QueryDefinition
+from sentry.utils import metrics
 from sentry.utils.dates import to_datetime, to_timestamp
 from sentry.utils.snuba import QueryOutsideRetentionError, raw_snql_query
+from sentry.utils.stages import StageGraph
 
 SMALLEST_METRICS_BUCKET = 10
 
@@ -74,42 +83,158 @@ _K2 = TypeVar("_K2")
 _V = TypeVar("_V")
 
 
+# Strings used by most queries, which are resolved up front in a single lookup.
+COMMON_STRINGS = (
+    *(key.value for key in MetricKey),
+    "release",
+    "environment",
+    "session.status",
+    "init",
+    "crashed",
+    "abnormal",
+    "errored",
+    "errored_preaggr",
+    "exited",
+)
+
+
+class _StringResolver:
+    """
+    Memoizes indexer lookups, including strings and IDs that cannot be found,
+    for the duration of a single call to the backend.
+    """
+
+    def __init__(self) -> None:
+        self.ids: MutableMapping[str, Optional[int]] = {}
+        self.strings: MutableMapping[int, Optional[str]] = {}
+
+    def resolve_many(self, strings: Iterable[str]) -> Mapping[str, Optional[int]]:
+        missing = [string for string in set(strings) if string not in self.ids]
+        if missing:
+            resolved = indexer.bulk_resolve(missing)  # type: ignore
+            for string in missing:
+                id = resolved.get(string)
+                self.ids[string] = id
+                if id is not None:
+                    self.strings[id] = string
+        return self.ids
+
+    def reverse_resolve_many(self, ids: Iterable[int]) -> Mapping[int, Optional[str]]:
+        missing = [id for id in set(ids) if id not in self.strings]
+        if missing:
+            resolved = indexer.bulk_reverse_resolve(missing)  # type: ignore
+            for id in missing:
+                string = resolved.get(id)
+                self.strings[id] = string
+                if string is not None:
+                    self.ids[string] = id
+        return self.strings
+
+
+_string_resolver: ContextVar[Optional[_StringResolver]] = ContextVar(
+    "release_health_string_resolver", default=None
+)
+
+
+def _with_string_resolver(func: Callable[..., _V]) -> Callable[..., _V]:
+    """
+    Runs a backend method with a request-scoped string resolver, unless one is
+    already active (e.g. when backend methods call each other).
+    """
+
+    @functools.wraps(func)
+    def inner(*args: Any, **kwargs: Any) -> _V:
+        if _string_resolver.get() is not None:
+            return func(*args, **kwargs)
+
+        resolver = _StringResolver()
+        resolver.resolve_many(COMMON_STRINGS)
+        token = _string_resolver.set(resolver)
+        try:
+            return func(*args, **kwargs)
+        finally:
+            _string_resolver.reset(token)
+
+    return inner
+
+
+def _resolve_many(strings: Sequence[str]) -> Mapping[str, Optional[int]]:
+    resolver = _string_resolver.get()
+    if resolver is None:
+        return indexer.bulk_resolve(strings)  # type: ignore
+    return resolver.resolve_many(strings)
+
+
+def _resolve(string: str) -> Optional[int]:
+    resolver = _string_resolver.get()
+    if resolver is None:
+        return indexer.resolve(string)  # type: ignore
+    return resolver.resolve_many([string])[string]
+
+
+def _reverse_resolve(id: int) -> Optional[str]:
+    resolver = _string_resolver.get()
+    if resolver is None:
+        return indexer.reverse_resolve(id)  # type: ignore
+    return resolver.reverse_resolve_many([id])[id]
+
+
+def _raw_snql_query(query: Query, **kwargs: Any) -> Mapping[str, Any]:
+    """
+    Runs a query with `raw_snql_query`, and reverse resolves all tag values of
+    the results in a single lookup.
+    """
+    result: Mapping[str, Any] = raw_snql_query(query, **kwargs)
+    resolver = _string_resolver.get()
+    if resolver is not None:
+        resolver.reverse_resolve_many(_iter_tag_values(result["data"]))
+    return result
+
+
+def _iter_tag_values(rows: Iterable[Mapping[str, Any]]) -> Iterable[int]:
+    for row in rows:
+        for key, value in row.items():
+            if key.startswith("tags[") and isinstance(value, int):
+                yield value
+
+
 def get_tag_values_list(org_id: int, values: Sequence[str]) -> Sequence[int]:
-    return [x for x in [try_get_string_index(org_id, x) for x in values] if x is not None]
+    resolved = _resolve_many(values)
+    return [id for id in (resolved.get(x) for x in values) if id is not None]
 
 
 def metric_id(org_id: int, metric_key: MetricKey) -> int:
-    index = indexer.resolve(metric_key.value)  # type: ignore
+    index = _resolve(metric_key.value)
     if index is None:
         raise MetricIndexNotFound(metric_key.value)
-    return index  # type: ignore
+    return index
 
 
 def tag_key(org_id: int, name: str) -> str:
-    index = indexer.resolve(name)  # type: ignore
+    index = _resolve(name)
     if index is None:
         raise MetricIndexNotFound(name)
     return f"tags[{index}]"
 
 
 def tag_value(org_id: int, name: str) -> int:
-    index = indexer.resolve(name)  # type: ignore
+    index = _resolve(name)
     if index is None:
         raise MetricIndexNotFound(name)
-    return index  # type: ignore
+    return index
 
 
 def try_get_string_index(org_id: int, name: str) -> Optional[int]:
-    return indexer.resolve(name)  # type: ignore
+    return _resolve(name)
 
 
 def reverse_tag_value(org_id: int, index: int) -> str:
-    str_value = indexer.reverse_resolve(index)  # type: ignore
+    str_value = _reverse_resolve(index)
     # If the value can't be reversed it's very likely a real programming bug
     # instead of something to be caught down: We probably got back a value from
     # Snuba that's not in the indexer => partial data loss
     assert str_value is not None
-    return str_value  # type: ignore
+    return str_value
 
 
 def filter_projects_by_project_release(project_releases: Sequence[ProjectRelease]) -> Condition:
@@ -141,12 +266,64 @@ def _model_environment_ids_to_environment_names(
     return defaultdict(lambda: None, id_to_name)
 
 
+class _OverviewQuery(NamedTuple):
+    """A query run by `get_release_health_data_overview`, and how to convert its results."""
+
+    query: Query
+    referrer: str
+    convert: Callable[[Sequence[Mapping[str, Any]]], Any]
+
+
+# Overview queries are independent of each other, so they are run concurrently.
+# The pool is shared by all requests. Queries which would have to wait for a
+# worker run on the requesting thread instead.
+_OVERVIEW_QUERY_WORKERS = 5
+_overview_query_pool = ThreadPoolExecutor(max_workers=_OVERVIEW_QUERY_WORKERS)
+_overview_query_slots = threading.BoundedSemaphore(_OVERVIEW_QUERY_WORKERS)
+
+
+def _run_overview_queries(queries: Sequence[_OverviewQuery]) -> Sequence[Any]:
+    """
+    Runs the queries of an overview concurrently and converts their results.
+
+    Tag values in all results are reverse resolved in a single lookup. Results
+    are converted on the calling thread, which holds the string resolver.
+    """
+    graph = StageGraph(
+        "release_health.metrics.overview",
+        executor=_overview_query_pool,
+        slots=_overview_query_slots,
+    )
+    for q in queries:
+
+        def run_query(results: Mapping[str, Any], q: _OverviewQuery = q) -> Any:
+            with sentry_sdk.start_span(op="release_health.metrics.query", description=q.referrer):
+                return raw_snql_query(q.query, referrer=q.referrer, use_cache=False)["data"]
+
+        graph.add(q.referrer, run_query)
+
+    results = graph.run()
+
+    resolver = _string_resolver.get()
+    if resolver is not None:
+        resolver.reverse_resolve_many(
+            _iter_tag_values(itertools.chain.from_iterable(results.values()))
+        )
+
+    converted = []
+    for q in queries:
+        with sentry_sdk.start_span(op="release_health.metrics.convert", description=q.referrer):
+            converted.append(q.convert(results[q.referrer]))
+    return converted
+
+
 class MetricsReleaseHealthBackend(ReleaseHealthBackend):
     """Gets release health results from the metrics dataset"""
 
     def is_metrics_based(self) -> bool:
         return True
 
+    @_with_string_resolver
     def get_current_and_previous_crash_free_rates(
         self,
         project_ids: Sequence[int],
@@ -232,7 +409,7 @@ class MetricsReleaseHealthBackend(ReleaseHealthBackend):
             granularity=Granularity(rollup),
         )
 
-        count_data = raw_snql_query(
+        count_data = _raw_snql_query(
             count_query, referrer="release_health.metrics.get_crash_free_data", use_cache=False
         )["data"]
 
@@ -258,6 +435,7 @@ class MetricsReleaseHealthBackend(ReleaseHealthBackend):
 
         return crash_free_rate
 
+    @_with_string_resolver
     def get_release_adoption(
         self,
         project_releases: Sequence[ProjectRelease],
@@ -334,7 +512,7 @@ class MetricsReleaseHealthBackend(ReleaseHealthBackend):
             )
 
             return _convert_results(
-                raw_snql_query(
+                _raw_snql_query(
                     query,
                     referrer=referrer,
                     use_cache=False,
@@ -355,7 +533,7 @@ class MetricsReleaseHealthBackend(ReleaseHealthBackend):
             )
 
             return _convert_results(
-                raw_snql_query(
+                _raw_snql_query(
                     query,
                     referrer=referrer,
                     use_cache=False,
@@ -394,7 +572,7 @@ class MetricsReleaseHealthBackend(ReleaseHealthBackend):
         rv = {}
 
         for project_id, release in project_releases:
-            release_tag_value = indexer.resolve(release)  # type: ignore
+            release_tag_value = _resolve(release)
             if release_tag_value is None:
                 # Don't emit empty releases -- for exact compatibility with
                 # sessions table backend.
@@ -423,6 +601,7 @@ class MetricsReleaseHealthBackend(ReleaseHealthBackend):
 
         return rv
 
+    @_with_string_resolver
     def run_sessions_query(
         self,
         org_id: int,
@@ -432,6 +611,7 @@ class MetricsReleaseHealthBackend(ReleaseHealthBackend):
 
         return run_sessions_query(org_id, query, span_op)
 
+    @_with_string_resolver
     def get_release_sessions_time_bounds(
         self,
         project_id: ProjectId,
@@ -495,7 +675,7 @@ class MetricsReleaseHealthBackend(ReleaseHealthBackend):
                 ],
             )
 
-            rows = raw_snql_query(
+            rows = _raw_snql_query(
                 init_sessions_query,
                 referrer="release_health.metrics.get_release_sessions_time_bounds.init_sessions",
                 use_cache=False,
@@ -522,7 +702,7 @@ class MetricsReleaseHealthBackend(ReleaseHealthBackend):
                 ],
             )
             rows.extend(
-                raw_snql_query(
+                _raw_snql_query(
                     terminal_sessions_query,
                     referrer="release_health.metrics.get_release_sessions_time_bounds.terminal_sessions",
                     use_cache=False,
@@ -561,6 +741,7 @@ class MetricsReleaseHealthBackend(ReleaseHealthBackend):
             "sessions_upper_bound": iso_format_snuba_datetime(upper_bound),
         }
 
+    @_with_string_resolver
     def check_has_health_data(
         self, projects_list: Sequence[ProjectOrRelease]
     ) -> Set[ProjectOrRelease]:
@@ -623,12 +804,13 @@ class MetricsReleaseHealthBackend(ReleaseHealthBackend):
             groupby=group_by_clause,
         )
 
-        result = raw_snql_query(
+        result = _raw_snql_query(
             query, referrer="release_health.metrics.check_has_health_data", use_cache=False
         )
 
         return {extract_row_info(row) for row in result["data"]}
 
+    @_with_string_resolver
     def check_releases_have_health_data(
         self,
         organization_id: OrganizationId,
@@ -660,7 +842,7 @@ class MetricsReleaseHealthBackend(ReleaseHealthBackend):
             groupby=[Column(release_column_name)],
         )
 
-        result = raw_snql_query(
+        result = _raw_snql_query(
             query,
             referrer="release_health.metrics.check_releases_have_health_data",
             use_cache=False,
@@ -676,19 +858,28 @@ class MetricsReleaseHealthBackend(ReleaseHealthBackend):
         where: List[Condition],
         org_id: int,
         rollup: int,
-    ) -> Mapping[Tuple[int, str], Any]:
+    ) -> _OverviewQuery:
         """
         Percentiles of session duration
         """
-        rv_durations: Dict[Tuple[int, str], Any] = {}
-
         release_column_name = tag_key(org_id, "release")
         aggregates: List[SelectableExpression] = [
             Column(release_column_name),
             Column("project_id"),
         ]
 
-        for row in raw_snql_query(
+        def convert(data: Sequence[Mapping[str, Any]]) -> Mapping[Tuple[int, str], Any]:
+            rv_durations: Dict[Tuple[int, str], Any] = {}
+            for row in data:
+                # See https://github.com/getsentry/snuba/blob/8680523617e06979427bfa18c6b4b4e8bf86130f/snuba/datasets/entities/metrics.py#L184 for quantiles
+                key = (row["project_id"], reverse_tag_value(org_id, row[release_column_name]))
+                rv_durations[key] = {
+                    "duration_p50": row["percentiles"][0],
+                    "duration_p90": row["percentiles"][1],
+                }
+            return rv_durations
+
+        return _OverviewQuery(
             Query(
                 dataset=Dataset.Metrics.value,
                 match=Entity(EntityKey.MetricsDistributions.value),
@@ -714,36 +905,34 @@ class MetricsReleaseHealthBackend(ReleaseHealthBackend):
                 groupby=aggregates,
                 granularity=Granularity(rollup),
             ),
-            referrer="release_health.metrics.get_session_duration_data_for_overview",
-        )["data"]:
-            # See https://github.com/getsentry/snuba/blob/8680523617e06979427bfa18c6b4b4e8bf86130f/snuba/datasets/entities/metrics.py#L184 for quantiles
-            key = (row["project_id"], reverse_tag_value(org_id, row[release_column_name]))
-            rv_durations[key] = {
-                "duration_p50": row["percentiles"][0],
-                "duration_p90": row["percentiles"][1],
-            }
-
-        return rv_durations
+            "release_health.metrics.get_session_duration_data_for_overview",
+            convert,
+        )
 
     @staticmethod
     def _get_errored_sessions_for_overview(
         where: List[Condition],
         org_id: int,
         rollup: int,
-    ) -> Mapping[Tuple[int, str], int]:
+    ) -> _OverviewQuery:
         """
         Count of errored sessions, incl fatal (abnormal, crashed) sessions,
         excl errored *preaggregated* sessions
         """
-        rv_errored_sessions: Dict[Tuple[int, str], int] = {}
-
         release_column_name = tag_key(org_id, "release")
         aggregates: List[SelectableExpression] = [
             Column(release_column_name),
             Column("project_id"),
         ]
 
-        for row in raw_snql_query(
+        def convert(data: Sequence[Mapping[str, Any]]) -> Mapping[Tuple[int, str], int]:
+            rv_errored_sessions: Dict[Tuple[int, str], int] = {}
+            for row in data:
+                key = row["project_id"], reverse_tag_value(org_id, row[release_column_name])
+                rv_errored_sessions[key] = row["value"]
+            return rv_errored_sessions
+
+        return _OverviewQuery(
             Query(
                 dataset=Dataset.Metrics.value,
                 match=Entity(EntityKey.MetricsSets.value),
@@ -757,17 +946,14 @@ class MetricsReleaseHealthBackend(ReleaseHealthBackend):
                 groupby=aggregates,
                 granularity=Granularity(rollup),
             ),
-            referrer="release_health.metrics.get_errored_sessions_for_overview",
-        )["data"]:
-            key = row["project_id"], reverse_tag_value(org_id, row[release_column_name])
-            rv_errored_sessions[key] = row["value"]
-
-        return rv_errored_sessions
+            "release_health.metrics.get_errored_sessions_for_overview",
+            convert,
+        )
 
     @staticmethod
     def _get_session_by_status_for_overview(
         where: List[Condition], org_id: int, rollup: int
-    ) -> Mapping[Tuple[int, str, str], int]:
+    ) -> _OverviewQuery:
         """
         Counts of init, abnormal and crashed sessions, purpose-built for overview
         """
@@ -780,9 +966,18 @@ class MetricsReleaseHealthBackend(ReleaseHealthBackend):
             Column(session_status_column_name),
         ]
 
-        rv_sessions: Dict[Tuple[int, str, str], int] = {}
+        def convert(data: Sequence[Mapping[str, Any]]) -> Mapping[Tuple[int, str, str], int]:
+            rv_sessions: Dict[Tuple[int, str, str], int] = {}
+            for row in data:
+                key = (
+                    row["project_id"],
+                    reverse_tag_value(org_id, row[release_column_name]),
+                    reverse_tag_value(org_id, row[session_status_column_name]),
+                )
+                rv_sessions[key] = row["value"]
+            return rv_sessions
 
-        for row in raw_snql_query(
+        return _OverviewQuery(
             Query(
                 dataset=Dataset.Metrics.value,
                 match=Entity(EntityKey.MetricsCounters.value),
@@ -801,21 +996,14 @@ class MetricsReleaseHealthBackend(ReleaseHealthBackend):
                 groupby=aggregates,
                 granularity=Granularity(rollup),
             ),
-            referrer="release_health.metrics.get_abnormal_and_crashed_sessions_for_overview",
-        )["data"]:
-            key = (
-                row["project_id"],
-                reverse_tag_value(org_id, row[release_column_name]),
-                reverse_tag_value(org_id, row[session_status_column_name]),
-            )
-            rv_sessions[key] = row["value"]
-
-        return rv_sessions
+            "release_health.metrics.get_abnormal_and_crashed_sessions_for_overview",
+            convert,
+        )
 
     @staticmethod
     def _get_users_and_crashed_users_for_overview(
         where: List[Condition], org_id: int, rollup: int
-    ) -> Mapping[Tuple[int, str, str], int]:
+    ) -> _OverviewQuery:
         release_column_name = tag_key(org_id, "release")
         session_status_column_name = tag_key(org_id, "session.status")
 
@@ -825,9 +1013,6 @@ class MetricsReleaseHealthBackend(ReleaseHealthBackend):
             Column(session_status_column_name),
         ]
 
-        # Count of users and crashed users
-        rv_users: Dict[Tuple[int, str, str], int] = {}
-
         # Avoid mutating input parameters here
         select = aggregates + [Function("uniq", [Column("value")], "value")]
         where = where + [
@@ -839,7 +1024,19 @@ class MetricsReleaseHealthBackend(ReleaseHealthBackend):
             ),
         ]
 
-        for row in raw_snql_query(
+        def convert(data: Sequence[Mapping[str, Any]]) -> Mapping[Tuple[int, str, str], int]:
+            # Count of users and crashed users
+            rv_users: Dict[Tuple[int, str, str], int] = {}
+            for row in data:
+                key = (
+                    row["project_id"],
+                    reverse_tag_value(org_id, row[release_column_name]),
+                    reverse_tag_value(org_id, row[session_status_column_name]),
+                )
+                rv_users[key] = row["value"]
+            return rv_users
+
+        return _OverviewQuery(
             Query(
                 dataset=Dataset.Metrics.value,
                 match=Entity(EntityKey.MetricsSets.value),
@@ -848,16 +1045,9 @@ class MetricsReleaseHealthBackend(ReleaseHealthBackend):
                 groupby=aggregates,
                 granularity=Granularity(rollup),
             ),
-            referrer="release_health.metrics.get_users_and_crashed_users_for_overview",
-        )["data"]:
-            key = (
-                row["project_id"],
-                reverse_tag_value(org_id, row[release_column_name]),
-                reverse_tag_value(org_id, row[session_status_column_name]),
-            )
-            rv_users[key] = row["value"]
-
-        return rv_users
+            "release_health.metrics.get_users_and_crashed_users_for_overview",
+            convert,
+        )
 
     @staticmethod
     def _get_health_stats_for_overview(
@@ -866,7 +1056,7 @@ class MetricsReleaseHealthBackend(ReleaseHealthBackend):
         health_stats_period: StatsPeriod,
         stat: OverviewStat,
         now: datetime,
-    ) -> Mapping[ProjectRelease, List[List[int]]]:
+    ) -> _OverviewQuery:
         release_column_name = tag_key(org_id, "release")
         session_status_column_name = tag_key(org_id, "session.status")
         session_init_tag_value = tag_value(org_id, "init")
@@ -881,8 +1071,6 @@ class MetricsReleaseHealthBackend(ReleaseHealthBackend):
             Column("bucketed_time"),
         ]
 
-        rv: Dict[ProjectRelease, List[List[int]]] = defaultdict(lambda: _make_stats(stats_start, stats_rollup, stats_buckets))  # type: ignore
-
         entity = {
             "users": EntityKey.MetricsSets.value,
             "sessions": EntityKey.MetricsCounters.value,
@@ -897,7 +1085,20 @@ class MetricsReleaseHealthBackend(ReleaseHealthBackend):
             org_id, {"sessions": MetricKey.SESSION, "users": MetricKey.USER}[stat]
         )
 
-        for row in raw_snql_query(
+        def convert(data: Sequence[Mapping[str, Any]]) -> Mapping[ProjectRelease, List[List[int]]]:
+            rv: Dict[ProjectRelease, List[List[int]]] = defaultdict(lambda: _make_stats(stats_start, stats_rollup, stats_buckets))  # type: ignore
+            for row in data:
+                time_bucket = int(
+                    (parse_snuba_datetime(row["bucketed_time"]) - stats_start).total_seconds()
+                    / stats_rollup
+                )
+                key = row["project_id"], reverse_tag_value(org_id, row[release_column_name])
+                timeseries = rv[key]
+                if time_bucket < len(timeseries):
+                    timeseries[time_bucket][1] = row["value"]
+            return rv
+
+        return _OverviewQuery(
             Query(
                 dataset=Dataset.Metrics.value,
                 match=Entity(entity),
@@ -916,19 +1117,11 @@ class MetricsReleaseHealthBackend(ReleaseHealthBackend):
                 granularity=Granularity(stats_rollup),
                 groupby=aggregates,
             ),
-            referrer="release_health.metrics.get_health_stats_for_overview",
-        )["data"]:
-            time_bucket = int(
-                (parse_snuba_datetime(row["bucketed_time"]) - stats_start).total_seconds()
-                / stats_rollup
-            )
-            key = row["project_id"], reverse_tag_value(org_id, row[release_column_name])
-            timeseries = rv[key]
-            if time_bucket < len(timeseries):
-                timeseries[time_bucket][1] = row["value"]
-
-        return rv
+            "release_health.metrics.get_health_stats_for_overview",
+            convert,
+        )
 
+    @_with_string_resolver
     def get_release_health_data_overview(
         self,
         project_releases: Sequence[ProjectRelease],
@@ -961,17 +1154,21 @@ class MetricsReleaseHealthBackend(ReleaseHealthBackend):
                 )
             )
 
+        queries: List[_OverviewQuery] = [
+            self._get_session_duration_data_for_overview(where, org_id, rollup),
+            self._get_errored_sessions_for_overview(where, org_id, rollup),
+            self._get_session_by_status_for_overview(where, org_id, rollup),
+            self._get_users_and_crashed_users_for_overview(where, org_id, rollup),
+        ]
         if health_stats_period:
-            health_stats_data = self._get_health_stats_for_overview(
-                where, org_id, health_stats_period, stat, now
+            queries.append(
+                self._get_health_stats_for_overview(where, org_id, health_stats_period, stat, now)
             )
-        else:
-            health_stats_data = {}
 
-        rv_durations = self._get_session_duration_data_for_overview(where, org_id, rollup)
-        rv_errored_sessions = self._get_errored_sessions_for_overview(where, org_id, rollup)
-        rv_sessions = self._get_session_by_status_for_overview(where, org_id, rollup)
-        rv_users = self._get_users_and_crashed_users_for_overview(where, org_id, rollup)
+        with metrics.timer("release_health.metrics.overview.queries"):
+            results = _run_overview_queries(queries)
+        rv_durations, rv_errored_sessions, rv_sessions, rv_users = results[:4]
+        health_stats_data = results[4] if health_stats_period else {}
 
         # XXX: In order to be able to dual-read and compare results from both
         # old and new backend, this should really go back through the
@@ -1124,7 +1321,7 @@ class MetricsReleaseHealthBackend(ReleaseHealthBackend):
                         raise NotImplementedError(f"No support for entity: {entity_key}")
                     columns = [Function(aggregation_function, [Column("value")], "value")]
 
-                    data = raw_snql_query(
+                    data = _raw_snql_query(
                         Query(
                             dataset=Dataset.Metrics.value,
                             match=Entity(entity_key.value),
@@ -1161,6 +1358,7 @@ class MetricsReleaseHealthBackend(ReleaseHealthBackend):
 
         return query_stats
 
+    @_with_string_resolver
     def get_crash_free_breakdown(
         self,
         project_id: ProjectId,
@@ -1199,6 +1397,7 @@ class MetricsReleaseHealthBackend(ReleaseHealthBackend):
 
         return rv
 
+    @_with_string_resolver
     def get_changed_project_release_model_adoptions(
         self,
         project_ids: Sequence[ProjectId],
@@ -1233,7 +1432,7 @@ class MetricsReleaseHealthBackend(ReleaseHealthBackend):
             groupby=query_cols,
             orderby=[OrderBy(col, Direction.DESC) for col in query_cols],
         )
-        result = raw_snql_query(
+        result = _raw_snql_query(
             query,
             referrer="release_health.metrics.get_changed_project_release_model_adoptions",
             use_cache=False,
@@ -1244,6 +1443,7 @@ class MetricsReleaseHealthBackend(ReleaseHealthBackend):
 
         return [extract_row_info(row) for row in result["data"]]
 
+    @_with_string_resolver
     def get_oldest_health_data_for_releases(
         self,
         project_releases: Sequence[ProjectRelease],
@@ -1290,7 +1490,7 @@ class MetricsReleaseHealthBackend(ReleaseHealthBackend):
             groupby=group_by,
             granularity=Granularity(3600),
         )
-        rows = raw_snql_query(
+        rows = _raw_snql_query(
             query,
             referrer="release_health.metrics.get_oldest_health_data_for_releases",
             use_cache=False,
@@ -1305,6 +1505,7 @@ class MetricsReleaseHealthBackend(ReleaseHealthBackend):
 
         return result
 
+    @_with_string_resolver
     def get_project_releases_count(
         self,
         organization_id: OrganizationId,
@@ -1367,7 +1568,7 @@ class MetricsReleaseHealthBackend(ReleaseHealthBackend):
             granularity=Granularity(granularity),
         )
 
-        rows = raw_snql_query(query, referrer="release_health.metrics.get_project_releases_count")[
+        rows = _raw_snql_query(query, referrer="release_health.metrics.get_project_releases_count")[
             "data"
         ]
 
@@ -1393,7 +1594,7 @@ class MetricsReleaseHealthBackend(ReleaseHealthBackend):
         series: MutableMapping[datetime, DurationPercentiles] = {}
         session_status_healthy = try_get_string_index(org_id, "exited")
         if session_status_healthy is not None:
-            duration_series_data = raw_snql_query(
+            duration_series_data = _raw_snql_query(
                 Query(
                     dataset=Dataset.Metrics.value,
                     where=where
@@ -1438,7 +1639,7 @@ class MetricsReleaseHealthBackend(ReleaseHealthBackend):
         session_status_key: str,
         rollup: int,
     ) -> Tuple[Mapping[datetime, SessionCounts], SessionCounts]:
-        session_series_data = raw_snql_query(
+        session_series_data = _raw_snql_query(
             Query(
                 dataset=Dataset.Metrics.value,
                 where=where
@@ -1477,7 +1678,7 @@ class MetricsReleaseHealthBackend(ReleaseHealthBackend):
             else:
                 logger.warning("Unexpected session.status '%s'", status)
 
-        session_error_series_data = raw_snql_query(
+        session_error_series_data = _raw_snql_query(
             Query(
                 dataset=Dataset.Metrics.value,
                 where=where
@@ -1533,7 +1734,7 @@ class MetricsReleaseHealthBackend(ReleaseHealthBackend):
         rollup: int,
     ) -> Tuple[Mapping[datetime, UserCounts], UserCounts]:
 
-        user_series_data = raw_snql_query(
+        user_series_data = _raw_snql_query(
             Query(
                 dataset=Dataset.Metrics.value,
                 where=where
@@ -1547,7 +1748,7 @@ class MetricsReleaseHealthBackend(ReleaseHealthBackend):
             )
         )["data"]
 
-        user_totals_data = raw_snql_query(
+        user_totals_data = _raw_snql_query(
             Query(
                 dataset=Dataset.Metrics.value,
                 where=where
@@ -1609,6 +1810,7 @@ class MetricsReleaseHealthBackend(ReleaseHealthBackend):
 
         return rv
 
+    @_with_string_resolver
     def get_project_release_stats(
         self,
         project_id: ProjectId,
@@ -1710,6 +1912,7 @@ class MetricsReleaseHealthBackend(ReleaseHealthBackend):
 
         return sorted_series, merged_totals  # type: ignore
 
+    @_with_string_resolver
     def get_project_sessions_count(
         self,
         project_id: ProjectId,
@@ -1761,13 +1964,14 @@ class MetricsReleaseHealthBackend(ReleaseHealthBackend):
             granularity=Granularity(rollup),
         )
 
-        rows = raw_snql_query(query, referrer="release_health.metrics.get_project_sessions_count")[
+        rows = _raw_snql_query(query, referrer="release_health.metrics.get_project_sessions_count")[
             "data"
         ]
 
         ret_val: int = rows[0]["value"] if rows else 0
         return ret_val
 
+    @_with_string_resolver
     def get_num_sessions_per_project(
         self,
         project_ids: Sequence[ProjectId],
@@ -1820,12 +2024,13 @@ class MetricsReleaseHealthBackend(ReleaseHealthBackend):
             granularity=Granularity(rollup) if rollup is not None else None,
         )
 
-        rows = raw_snql_query(
+        rows = _raw_snql_query(
             query, referrer="release_health.metrics.get_num_sessions_per_project"
         )["data"]
 
         return [(row["project_id"], row["value"]) for row in rows]
 
+    @_with_string_resolver
     def get_project_releases_by_stability(
         self,
         project_ids: Sequence[ProjectId],
@@ -1985,7 +2190,7 @@ class MetricsReleaseHealthBackend(ReleaseHealthBackend):
             granularity=Granularity(granularity),
         )
 
-        rows = raw_snql_query(
+        rows = _raw_snql_query(
             query,
             referrer="release_health.metrics.get_project_releases_by_stability",
             use_cache=False,
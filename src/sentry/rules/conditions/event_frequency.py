@@ -10,6 +10,7 @@ from sentry import release_health, tsdb
 from sentry.receivers.rules import DEFAULT_RULE_LABEL
 from sentry.rules.conditions.base import EventCondition
 from sentry.utils import metrics
+from sentry.utils.hashlib import hash_values
 from sentry.utils.snuba import options_override
 
 standard_intervals = {
@@ -36,6 +37,60 @@ comparison_types = {
     COMPARISON_TYPE_PERCENT: COMPARISON_TYPE_PERCENT,
 }
 
+# How long results of frequency queries are shared between events of the same
+# group, in seconds.
+FREQUENCY_QUERY_CACHE_TTL = 10
+
+
+class EventFrequencyQueries:
+    """
+    Shares frequency queries between the conditions of all rules evaluated for
+    a single event.
+
+    All conditions measure their intervals from the same point in time, so
+    conditions asking for the same condition type, interval and environment are
+    answered by a single query. Results are also memoized per group for
+    ``cache_ttl`` seconds, so a burst of events for one group does not query the
+    same counts over and over again.
+    """
+
+    def __init__(self, group_id, cache_ttl=FREQUENCY_QUERY_CACHE_TTL):
+        self.group_id = group_id
+        self.cache_ttl = cache_ttl
+        self.now = timezone.now()
+        self._results = {}
+
+    def _build_cache_key(self, key):
+        return "r.c.fq:%s" % hash_values([self.group_id, *key])
+
+    def get(self, condition_id, start, end, environment_id, query):
+        """
+        Returns the result of ``query(start, end)`` for the given condition type,
+        reusing earlier results for the same window relative to ``now``.
+        """
+        key = (
+            condition_id,
+            environment_id,
+            int((end - start).total_seconds()),
+            int((self.now - end).total_seconds()),
+        )
+        if key in self._results:
+            metrics.incr("rules.conditions.frequency_queries", tags={"source": "local"})
+            return self._results[key]
+
+        cache_key = self._build_cache_key(key)
+        result = cache.get(cache_key) if self.cache_ttl else None
+        if result is None:
+            metrics.incr("rules.conditions.frequency_queries", tags={"source": "query"})
+            result = query(start, end)
+            if self.cache_ttl:
+                cache.set(cache_key, result, self.cache_ttl)
+        else:
+            metrics.incr("rules.conditions.frequency_queries", tags={"source": "cache"})
+
+        self._results[key] = result
+        return result
+
 
 class EventFrequencyForm(forms.Form):
     intervals = standard_intervals
@@ -84,6 +139,7 @@ class BaseEventFrequencyCondition(EventCondition):
 
     def __init__(self, *args, **kwargs):
         self.tsdb = kwargs.pop("tsdb", tsdb)
+        self.frequency_queries = kwargs.pop("frequency_queries", None)
         self.form_fields = {
             "value": {"type": "number", "placeholder": 100},
             "interval": {
@@ -114,6 +170,17 @@ class BaseEventFrequencyCondition(EventCondition):
         return current_value > value
 
     def query(self, event, start, end, environment_id):
+        if self.frequency_queries is not None:
+            return self.frequency_queries.get(
+                self.id,
+                start,
+                end,
+                environment_id,
+                lambda start, end: self._query(event, start, end, environment_id),
+            )
+        return self._query(event, start, end, environment_id)
+
+    def _query(self, event, start, end, environment_id):
         query_result = self.query_hook(event, start, end, environment_id)
         metrics.incr(
             "rules.conditions.queried_snuba",
@@ -130,15 +197,14 @@ class BaseEventFrequencyCondition(EventCondition):
 
     def get_rate(self, event, interval, environment_id):
         _, duration = self.intervals[interval]
-        end = timezone.now()
+        end = self.frequency_queries.now if self.frequency_queries is not None else timezone.now()
         result = self.query(event, end - duration, end, environment_id=environment_id)
         comparison_type = self.get_option("comparisonType", COMPARISON_TYPE_COUNT)
         if comparison_type == COMPARISON_TYPE_PERCENT:
             comparison_interval = comparison_intervals[self.get_option("comparisonInterval")][1]
             comparison_end = end - comparison_interval
-            # TODO: Figure out if there's a way we can do this less frequently. All queries are
-            # automatically cached for 10s. We could consider trying to cache this and the main
-            # query for 20s to reduce the load.
+            # When evaluated through the `RuleProcessor` both this and the main query are
+            # shared with other rules and memoized per group via `EventFrequencyQueries`.
             comparison_result = self.query(
                 event, comparison_end - duration, comparison_end, environment_id=environment_id
             )
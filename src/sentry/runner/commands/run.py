@@ -529,6 +529,19 @@ def ingest_consumer(consumer_types, all_consumer_types, **options):
 @run.command("ingest-metrics-consumer")
 @log_options()
 @click.option("--topic", default="ingest-metrics", help="Topic to get subscription updates from.")
+@click.option(
+    "--pipelined",
+    is_flag=True,
+    default=False,
+    help="Consume the next batch while the deliveries of the previous batch are in flight.",
+)
+@click.option(
+    "--max-pending-flushes",
+    "max_pending_flushes",
+    default=1,
+    type=int,
+    help="How many batches may be waiting for their deliveries in pipelined mode.",
+)
 @batching_kafka_options("ingest-metrics-consumer")
 @configuration
 def metrics_consumer(**options):
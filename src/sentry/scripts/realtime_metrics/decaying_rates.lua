@@ -0,0 +1,35 @@
+-- Maintain exponentially decayed event rates of a project, packed into a
+-- single field of a hash that is shared by all projects.
+--
+-- The field is stored as ``timestamp,rate,rate,...`` with one rate (in events
+-- per second) for every time constant passed as ``ARGV``. Whenever an event is
+-- recorded, every rate decays by ``exp(-elapsed / tau)`` and grows by
+-- ``1 / tau``, which makes it converge to the actual rate of events averaged
+-- over roughly the last ``tau`` seconds.
+--
+--   KEYS = {hash}
+--   ARGV = {field, timestamp, ttl, tau, tau, ...}
+local key, field = KEYS[1], ARGV[1]
+local timestamp = tonumber(ARGV[2])
+local ttl = tonumber(ARGV[3])
+
+local last = timestamp
+local rates = {}
+local value = redis.call('HGET', key, field)
+if value then
+    for part in string.gmatch(value, '[^,]+') do
+        table.insert(rates, tonumber(part))
+    end
+    last = table.remove(rates, 1)
+end
+
+local elapsed = math.max(timestamp - last, 0)
+local packed = {string.format('%d', math.max(timestamp, last))}
+for i = 4, #ARGV do
+    local tau = tonumber(ARGV[i])
+    local rate = (rates[i - 3] or 0) * math.exp(-elapsed / tau) + 1 / tau
+    table.insert(packed, string.format('%.6g', rate))
+end
+
+redis.call('HSET', key, field, table.concat(packed, ','))
+redis.call('EXPIRE', key, ttl)
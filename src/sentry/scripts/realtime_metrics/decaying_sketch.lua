@@ -0,0 +1,48 @@
+-- Maintain an exponentially decayed, logarithmically bucketed sketch of the
+-- processing durations of a project, packed into a single field of a hash that
+-- is shared by all projects.
+--
+-- The field is stored as ``timestamp|index:count,index:count,...``. Whenever a
+-- duration is recorded, all counts decay by ``exp(-elapsed / tau)`` and the
+-- count of the bucket at ``index`` grows by one. Buckets whose count decayed
+-- below ``min_count`` are dropped to keep the field compact. The mapping of
+-- durations to bucket indexes is left to the caller.
+--
+--   KEYS = {hash}
+--   ARGV = {field, timestamp, ttl, tau, index, min_count}
+local key, field = KEYS[1], ARGV[1]
+local timestamp = tonumber(ARGV[2])
+local ttl = tonumber(ARGV[3])
+local tau = tonumber(ARGV[4])
+local index = tonumber(ARGV[5])
+local min_count = tonumber(ARGV[6])
+
+local last = timestamp
+local counts = {}
+local value = redis.call('HGET', key, field)
+if value then
+    local separator = string.find(value, '|', 1, true)
+    last = tonumber(string.sub(value, 1, separator - 1))
+    for i, count in string.gmatch(string.sub(value, separator + 1), '(%-?%d+):([^,]+)') do
+        counts[tonumber(i)] = tonumber(count)
+    end
+end
+
+local decay = math.exp(-math.max(timestamp - last, 0) / tau)
+for i, count in pairs(counts) do
+    counts[i] = count * decay
+end
+counts[index] = (counts[index] or 0) + 1
+
+local packed = {}
+for i, count in pairs(counts) do
+    if count >= min_count then
+        table.insert(packed, string.format('%d:%.6g', i, count))
+    end
+end
+
+redis.call(
+    'HSET', key, field,
+    string.format('%d|', math.max(timestamp, last)) .. table.concat(packed, ',')
+)
+redis.call('EXPIRE', key, ttl)
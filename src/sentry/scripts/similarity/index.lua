@@ -363,6 +363,23 @@ local function get_frequency_key(configuration, index, item)
     )
 end
 
+local function get_result_cache_key(configuration, limit, item, parameters)
+    -- NB: The index names used by callers never start with a tilde, so this
+    -- cannot collide with any of the index keys sharing this prefix.
+    local components = {}
+    for i, p in ipairs(parameters) do
+        components[i] = string.format('%s=%s', p.index, p.threshold)
+    end
+    return string.format(
+        '%s:{%s}:~c:%s:%s:%s',
+        configuration.namespace,
+        configuration.scope,
+        item,
+        limit,
+        table.concat(components, ',')
+    )
+end
+
 local function get_manhattan_distance(target, other)
     local keys = {}
     for k, _ in pairs(target) do
@@ -542,7 +559,7 @@ local function fetch_candidates(configuration, index, frequencies)
     return results
 end
 
-local function search(configuration, parameters, limit)
+local function search(configuration, parameters, limit, frequency_cache)
     local possible_candidates = {}
     local create_table = function ()
         return {}
@@ -591,7 +608,21 @@ local function search(configuration, parameters, limit)
     for i, candidate in ipairs(candidates) do
         local result = {}
         for j, p in ipairs(parameters) do
-            local candidate_frequencies = get_frequencies(configuration, p.index, candidate.key)
+            local candidate_frequencies
+            if frequency_cache ~= nil then
+                -- When evaluating multiple queries in a single invocation,
+                -- candidates are frequently shared between queries so we
+                -- avoid fetching their frequencies more than once.
+                candidate_frequencies = table.get_or_set_default(
+                    table.get_or_set_default(frequency_cache, p.index, create_table),
+                    candidate.key,
+                    function ()
+                        return get_frequencies(configuration, p.index, candidate.key)
+                    end
+                )
+            else
+                candidate_frequencies = get_frequencies(configuration, p.index, candidate.key)
+            end
             result[j] = string.format('%f', calculate_similarity(
                 configuration,
                 p.frequencies,
@@ -674,6 +705,90 @@ local commands = {
             limit
         )
     end,
+    CLASSIFY_MANY = function (configuration, cursor, arguments)
+        --[[
+        Performs multiple ``CLASSIFY`` queries in a single invocation. Each
+        query is provided as a count of parameters, followed by that many
+        ``index``, ``threshold`` and ``frequencies`` arguments. Results are
+        returned in the same order as the queries are provided.
+        ]]--
+        local cursor, limit, queries = multiple_argument_parser(
+            argument_parser(validate_integer),
+            variadic_argument_parser(
+                repeated_argument_parser(
+                    object_argument_parser({
+                        {"index", argument_parser(validate_value)},
+                        {"threshold", argument_parser(validate_integer)},
+                        {"frequencies", frequencies_argument_parser(configuration)},
+                    })
+                )
+            )
+        )(cursor, arguments)
+
+        local frequency_cache = {}
+        return table.imap(
+            queries,
+            function (parameters)
+                return search(configuration, parameters, limit, frequency_cache)
+            end
+        )
+    end,
+    COMPARE_MANY = function (configuration, cursor, arguments)
+        --[[
+        Performs multiple ``COMPARE`` queries in a single invocation. Each
+        query is provided as an item key and a count of parameters, followed
+        by that many ``index`` and ``threshold`` arguments. Results are
+        returned in the same order as the queries are provided.
+
+        If ``cache_ttl`` is positive, each result is cached for that many
+        seconds and returned without performing the search for subsequent
+        queries with the same key, limit and parameters.
+        ]]--
+        local cursor, limit, cache_ttl, queries = multiple_argument_parser(
+            argument_parser(validate_integer),
+            argument_parser(validate_integer),
+            variadic_argument_parser(
+                object_argument_parser({
+                    {"key", argument_parser(validate_value)},
+                    {"parameters", repeated_argument_parser(
+                        object_argument_parser({
+                            {"index", argument_parser(validate_value)},
+                            {"threshold", argument_parser(validate_integer)},
+                        })
+                    )},
+                })
+            )
+        )(cursor, arguments)
+
+        local frequency_cache = {}
+        return table.imap(
+            queries,
+            function (query)
+                local cache_key
+                if cache_ttl > 0 then
+                    cache_key = get_result_cache_key(configuration, limit, query.key, query.parameters)
+                    local cached = redis.call('GET', cache_key)
+                    if cached then
+                        return cmsgpack.unpack(cached)
+                    end
+                end
+
+                for _, parameter in ipairs(query.parameters) do
+                    parameter.frequencies = get_frequencies(
+                        configuration,
+                        parameter.index,
+                        query.key
+                    )
+                end
+
+                local results = search(configuration, query.parameters, limit, frequency_cache)
+                if cache_key ~= nil then
+                    redis.call('SETEX', cache_key, cache_ttl, cmsgpack.pack(results))
+                end
+                return results
+            end
+        )
+    end,
     MERGE = function (configuration, cursor, arguments)
         local cursor, destination_key = argument_parser(validate_value)(cursor, arguments)
         local cursor, sources = variadic_argument_parser(
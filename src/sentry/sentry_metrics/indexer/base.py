@@ -1,4 +1,4 @@
-from typing import Dict, List, Optional
+from typing import Dict, List, Mapping, Optional, Sequence
 
 from sentry.utils.services import Service
 
@@ -9,7 +9,14 @@ class StringIndexer(Service):  # type: ignore
     and the corresponding reverse lookup.
     """
 
-    __all__ = ("record", "resolve", "reverse_resolve", "bulk_record")
+    __all__ = (
+        "record",
+        "resolve",
+        "reverse_resolve",
+        "bulk_record",
+        "bulk_resolve",
+        "bulk_reverse_resolve",
+    )
 
     def bulk_record(self, strings: List[str]) -> Dict[str, int]:
         raise NotImplementedError()
@@ -37,3 +44,27 @@ class StringIndexer(Service):  # type: ignore
         Returns None if the entry cannot be found.
         """
         raise NotImplementedError()
+
+    def bulk_resolve(self, strings: Sequence[str]) -> Mapping[str, int]:
+        """Lookup the integer IDs for many strings at once.
+
+        Strings that cannot be found are left out of the result.
+        """
+        rv = {}
+        for string in strings:
+            id = self.resolve(string)
+            if id is not None:
+                rv[string] = id
+        return rv
+
+    def bulk_reverse_resolve(self, ids: Sequence[int]) -> Mapping[int, str]:
+        """Lookup the stored strings for many integer IDs at once.
+
+        IDs that cannot be found are left out of the result.
+        """
+        rv = {}
+        for id in ids:
+            string = self.reverse_resolve(id)
+            if string is not None:
+                rv[id] = string
+        return rv
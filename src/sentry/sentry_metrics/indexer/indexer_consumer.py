@@ -1,5 +1,6 @@
 import logging
-from typing import Any, Dict, MutableMapping, Optional, Sequence
+import time
+from typing import Any, Callable, Dict, MutableMapping, Optional, Sequence
 
 from confluent_kafka import Producer
 from django.conf import settings
@@ -7,14 +8,24 @@ from django.conf import settings
 from sentry.sentry_metrics import indexer
 from sentry.sentry_metrics.indexer.tasks import process_indexed_metrics
 from sentry.utils import json, kafka_config, metrics
-from sentry.utils.batching_kafka_consumer import AbstractBatchWorker, BatchingKafkaConsumer
+from sentry.utils.batching_kafka_consumer import (
+    AbstractBatchWorker,
+    BatchingKafkaConsumer,
+    PendingFlush,
+)
 from sentry.utils.kafka import create_batching_kafka_consumer
 
 logger = logging.getLogger(__name__)
 
+# How long to wait for all messages of a batch to be delivered.
+FLUSH_TIMEOUT = 5.0
+# How many produced messages may be waiting for delivery in pipelined mode
+# before producing blocks.
+MAX_OUTSTANDING_MESSAGES = 50000
+
 
 def get_metrics_consumer(
-    topic: Optional[str] = None, **options: Dict[str, str]
+    topic: Optional[str] = None, pipelined: bool = False, **options: Dict[str, str]
 ) -> BatchingKafkaConsumer:
     snuba_metrics = settings.KAFKA_TOPICS[settings.KAFKA_SNUBA_METRICS]
     snuba_metrics_producer = Producer(
@@ -22,55 +33,127 @@ def get_metrics_consumer(
     )
     return create_batching_kafka_consumer(
         {topic},
-        worker=MetricsIndexerWorker(producer=snuba_metrics_producer),
+        worker=MetricsIndexerWorker(producer=snuba_metrics_producer, pipelined=pipelined),
         **options,
     )
 
 
+class BatchDelivery(PendingFlush):  # type: ignore
+    """
+    Tracks delivery of all messages produced for a batch. Delivery callbacks
+    are only invoked while polling the producer, which happens when waiting.
+    The consumer waits without a timeout on every iteration of its run loop,
+    which serves the callbacks of deliveries completed in the meantime.
+    """
+
+    def __init__(
+        self, producer: Producer, size: int, on_complete: Callable[[], None], timeout: float
+    ) -> None:
+        self.__producer = producer
+        self.__on_complete = on_complete
+        self.__deadline = time.time() + timeout
+        self.remaining = size
+        self.error: Optional[Any] = None
+
+    def callback(self, error: Any, message: Any) -> None:
+        if error is not None and self.error is None:
+            self.error = error
+        self.remaining -= 1
+        if self.remaining == 0 and self.error is None:
+            self.__on_complete()
+
+    def wait(self, timeout: float) -> bool:
+        deadline = min(time.time() + timeout, self.__deadline)
+        while True:
+            # Serve callbacks of completed deliveries before checking the
+            # deadlines, so that they aren't reported as late.
+            self.__producer.poll(0)
+            if self.error is not None:
+                raise Exception(self.error.str())
+            if self.remaining == 0:
+                return True
+
+            now = time.time()
+            if now >= self.__deadline:
+                metrics.incr("metrics_consumer.producer.messages_left")
+                raise Exception(f"didn't get all the callbacks: {self.remaining} left")
+            if now >= deadline:
+                return False
+            self.__producer.poll(deadline - now)
+
+
 class MetricsIndexerWorker(AbstractBatchWorker):  # type: ignore
-    def __init__(self, producer: Producer) -> None:
+    """
+    Indexes metric names and tags, and produces the translated messages to
+    the snuba-metrics topic.
+
+    By default, `flush_batch` waits for all messages of a batch to be
+    delivered. In pipelined mode it returns as soon as the messages have been
+    produced, so that the next batch can be consumed and indexed while the
+    deliveries are still in flight. Offsets are committed by the consumer once
+    all messages of the batch have been delivered.
+    """
+
+    def __init__(
+        self,
+        producer: Producer,
+        pipelined: bool = False,
+        max_outstanding_messages: int = MAX_OUTSTANDING_MESSAGES,
+    ) -> None:
         self.__producer = producer
         self.__producer_topic = settings.KAFKA_TOPICS[settings.KAFKA_SNUBA_METRICS].get(
             "topic", "snuba-metrics"
         )
+        self.__pipelined = pipelined
+        self.__max_outstanding_messages = max_outstanding_messages
 
     def process_message(self, message: Any) -> MutableMapping[str, Any]:
         parsed_message: MutableMapping[str, Any] = json.loads(message.value(), use_rapid_json=True)
 
-        metric_name = parsed_message["name"]
-        tags = parsed_message.get("tags", {})
+        # Fail early (sending the message to the dead letter topic if one is
+        # configured) rather than failing the entire batch when it's indexed.
+        if "name" not in parsed_message:
+            raise ValueError("Metric message is missing the metric name")
 
-        strings = {
-            metric_name,
-            *tags.keys(),
-            *tags.values(),
-        }
+        return parsed_message
+
+    def index_batch(self, batch: Sequence[MutableMapping[str, Any]]) -> None:
+        """
+        Replaces metric names and tags of all messages in the batch with their
+        indexed IDs. All strings in the batch are resolved with a single call
+        to the indexer, as they tend to be heavily repeated across messages.
+        """
+        strings = set()
+        for message in batch:
+            tags = message.get("tags", {})
+            strings.update([message["name"], *tags.keys(), *tags.values()])
 
         with metrics.timer("metrics_consumer.bulk_record"):
             mapping = indexer.bulk_record(list(strings))  # type: ignore
 
-        new_tags = {mapping[k]: mapping[v] for k, v in tags.items()}
-
-        parsed_message["tags"] = new_tags
-        parsed_message["metric_id"] = mapping[metric_name]
-        parsed_message["retention_days"] = 90
-        return parsed_message
-
-    def flush_batch(self, batch: Sequence[MutableMapping[str, Any]]) -> None:
-        # produce the translated message to snuba-metrics topic
         for message in batch:
-            self.__producer.produce(
-                topic=self.__producer_topic,
-                key=None,
-                value=json.dumps(message).encode(),
-                on_delivery=self.callback,
-            )
-            message_type = message.get("type", "unknown")
-            metrics.incr(
-                "metrics_consumer.producer.messages_seen", tags={"metric_type": message_type}
+            tags = message.get("tags", {})
+            message["tags"] = {mapping[k]: mapping[v] for k, v in tags.items()}
+            message["metric_id"] = mapping[message["name"]]
+            message["retention_days"] = 90
+
+    def flush_batch(self, batch: Sequence[MutableMapping[str, Any]]) -> Optional[BatchDelivery]:
+        self.index_batch(batch)
+
+        if self.__pipelined:
+            delivery = BatchDelivery(
+                self.__producer,
+                len(batch),
+                on_complete=lambda: self.__enqueue_indexed_metrics(batch),
+                timeout=FLUSH_TIMEOUT,
             )
+            with metrics.timer("metrics_consumer.producer.produce"):
+                self.__produce(batch, delivery.callback)
+            return delivery
+
+        self.__produce(batch, self.callback)
         with metrics.timer("metrics_consumer.producer.flush"):
-            messages_left = self.__producer.flush(5.0)
+            messages_left = self.__producer.flush(FLUSH_TIMEOUT)
 
         if messages_left != 0:
             # TODO(meredith): We are not currently keeping track of
@@ -84,6 +167,32 @@ class MetricsIndexerWorker(AbstractBatchWorker):  # type: ignore
             metrics.incr("metrics_consumer.producer.messages_left")
             raise Exception(f"didn't get all the callbacks: {messages_left} left")
 
+        self.__enqueue_indexed_metrics(batch)
+        return None
+
+    def __produce(
+        self, batch: Sequence[MutableMapping[str, Any]], on_delivery: Callable[[Any, Any], None]
+    ) -> None:
+        # produce the translated message to snuba-metrics topic
+        for message in batch:
+            # Apply backpressure if deliveries can't keep up (only relevant
+            # in pipelined mode, batches are fully flushed otherwise).
+            while len(self.__producer) >= self.__max_outstanding_messages:
+                metrics.incr("metrics_consumer.producer.backpressure")
+                self.__producer.poll(0.1)
+
+            self.__producer.produce(
+                topic=self.__producer_topic,
+                key=None,
+                value=json.dumps(message).encode(),
+                on_delivery=on_delivery,
+            )
+            message_type = message.get("type", "unknown")
+            metrics.incr(
+                "metrics_consumer.producer.messages_seen", tags={"metric_type": message_type}
+            )
+
+    def __enqueue_indexed_metrics(self, batch: Sequence[MutableMapping[str, Any]]) -> None:
         # if we have successfully produced messages to the snuba-metrics topic
         # then enque task to send a slimmed down payload to the product metrics data model.
         # TODO(meredith): once we know more about what the product data model needs
@@ -1,4 +1,4 @@
-from typing import Any
+from typing import Any, Mapping, Sequence
 
 from django.conf import settings
 from django.db import connections, models, router
@@ -32,3 +32,35 @@ class MetricsKeyIndexer(Model):  # type: ignore
             "SELECT nextval('sentry_metricskeyindexer_id_seq') from generate_series(1,%s)", [num]
         )
         return connection.fetchall()
+
+    @classmethod
+    def bulk_insert(cls, strings: Sequence[str]) -> Mapping[str, int]:
+        """
+        Inserts rows for the given strings, skipping strings that already
+        exist, and returns the IDs of all inserted rows in a single round trip.
+
+        As the rows are not created through `save`, the inserted instances are
+        pushed into the model cache explicitly.
+        """
+        if not strings:
+            return {}
+
+        using = router.db_for_write(cls)
+        now = timezone.now()
+        params = []
+        for string in strings:
+            params.extend([string, now])
+
+        with connections[using].cursor() as cursor:
+            cursor.execute(
+                "INSERT INTO sentry_metricskeyindexer (string, date_added) VALUES %s "
+                "ON CONFLICT (string) DO NOTHING RETURNING id, string"
+                % ", ".join(["(%s, %s)"] * len(strings)),
+                params,
+            )
+            inserted = {string: id for id, string in cursor.fetchall()}
+
+        cls.objects.cache_instances(
+            [cls(id=id, string=string, date_added=now) for string, id in inserted.items()]
+        )
+        return inserted
@@ -1,44 +1,89 @@
 from typing import Any, List, Mapping, MutableMapping, Optional, Sequence, Set
 
 from sentry.sentry_metrics.indexer.models import MetricsKeyIndexer
+from sentry.utils import metrics
+from sentry.utils.iterators import chunked
+from sentry.utils.lru import LRUCache
 from sentry.utils.services import Service
 
+# The maximum number of strings inserted with a single statement.
+BULK_INSERT_CHUNK_SIZE = 1000
+
 
 class PGStringIndexer(Service):  # type: ignore
     """
     Provides integer IDs for metric names, tag keys and tag values
     and the corresponding reverse lookup.
+
+    Lookups go through a process-local LRU cache first, then through the
+    model cache and finally through the database. Strings are never mapped
+    to a different ID once recorded, so local entries never need to be
+    invalidated.
     """
 
-    __all__ = ("record", "resolve", "reverse_resolve", "bulk_record")
-
-    def _bulk_record(self, unmapped_strings: Set[str]) -> Any:
-        records = [MetricsKeyIndexer(string=string) for string in unmapped_strings]
-        # We use `ignore_conflicts=True` here to avoid race conditions where metric indexer
-        # records might have be created between when we queried in `bulk_record` and the
-        # attempt to create the rows down below.
-        MetricsKeyIndexer.objects.bulk_create(records, ignore_conflicts=True)
-        # Using `ignore_conflicts=True` prevents the pk from being set on the model
-        # instances.
-        #
-        # Using `get_many_from_cache` will not only re-query the database to fetch the rows
-        # (which should all exist point at this point), but also cache the results
-        return MetricsKeyIndexer.objects.get_many_from_cache(list(unmapped_strings), key="string")
+    __all__ = (
+        "record",
+        "resolve",
+        "reverse_resolve",
+        "bulk_record",
+        "bulk_resolve",
+        "bulk_reverse_resolve",
+    )
+
+    def __init__(self, local_cache_size: int = 100000) -> None:
+        self._ids: LRUCache[str, int] = LRUCache(local_cache_size)
+        self._strings: LRUCache[int, str] = LRUCache(local_cache_size)
+
+    def _cache_locally(self, mapping: Mapping[str, int]) -> None:
+        for string, id in mapping.items():
+            self._ids.set(string, id)
+            self._strings.set(id, string)
+
+    def _bulk_record(self, unmapped_strings: Set[str]) -> Mapping[str, int]:
+        mapped: MutableMapping[str, int] = {}
+        # Inserting in a consistent order avoids deadlocks between consumers
+        # inserting overlapping sets of strings.
+        for chunk in chunked(sorted(unmapped_strings), BULK_INSERT_CHUNK_SIZE):
+            mapped.update(MetricsKeyIndexer.bulk_insert(chunk))
+
+        # Strings that have not been inserted have been created concurrently
+        # between when we queried in `bulk_record` and the attempt to insert
+        # them. Using `get_many_from_cache` will not only fetch the rows, but
+        # also cache the results.
+        conflicting = unmapped_strings.difference(mapped.keys())
+        if conflicting:
+            for r in MetricsKeyIndexer.objects.get_many_from_cache(list(conflicting), key="string"):
+                mapped[r.string] = r.id
+
+        return mapped
 
     def bulk_record(self, strings: List[str]) -> Mapping[str, int]:
-
-        cache_results: Sequence[Any] = MetricsKeyIndexer.objects.get_many_from_cache(
-            strings, key="string"
+        mapped_result: MutableMapping[str, int] = self._ids.get_many(strings)
+        metrics.incr(
+            "sentry_metrics.indexer.lookups", amount=len(mapped_result), tags={"source": "local"}
         )
 
-        mapped_result: MutableMapping[str, int] = {r.string: r.id for r in cache_results}
+        uncached = set(strings).difference(mapped_result.keys())
+        if not uncached:
+            return mapped_result
 
-        unmapped = set(strings).difference(mapped_result.keys())
-        new_mapped = self._bulk_record(unmapped)
+        cache_results: Sequence[Any] = MetricsKeyIndexer.objects.get_many_from_cache(
+            list(uncached), key="string"
+        )
+        new_mapped: MutableMapping[str, int] = {r.string: r.id for r in cache_results}
+        metrics.incr(
+            "sentry_metrics.indexer.lookups", amount=len(new_mapped), tags={"source": "cache"}
+        )
 
-        for new in new_mapped:
-            mapped_result[new.string] = new.id
+        unmapped = uncached.difference(new_mapped.keys())
+        if unmapped:
+            new_mapped.update(self._bulk_record(unmapped))
+            metrics.incr(
+                "sentry_metrics.indexer.lookups", amount=len(unmapped), tags={"source": "insert"}
+            )
 
+        self._cache_locally(new_mapped)
+        mapped_result.update(new_mapped)
         return mapped_result
 
     def record(self, string: str) -> int:
@@ -51,11 +96,16 @@ class PGStringIndexer(Service):  # type: ignore
 
         Returns None if the entry cannot be found.
         """
+        id: Optional[int] = self._ids.get(string)
+        if id is not None:
+            return id
+
         try:
-            id: int = MetricsKeyIndexer.objects.get_from_cache(string=string).id
+            id = MetricsKeyIndexer.objects.get_from_cache(string=string).id
         except MetricsKeyIndexer.DoesNotExist:
             return None
 
+        self._cache_locally({string: id})
         return id
 
     def reverse_resolve(self, id: int) -> Optional[str]:
@@ -63,9 +113,46 @@ class PGStringIndexer(Service):  # type: ignore
 
         Returns None if the entry cannot be found.
         """
+        string: Optional[str] = self._strings.get(id)
+        if string is not None:
+            return string
+
         try:
-            string: str = MetricsKeyIndexer.objects.get_from_cache(pk=id).string
+            string = MetricsKeyIndexer.objects.get_from_cache(pk=id).string
         except MetricsKeyIndexer.DoesNotExist:
             return None
 
+        self._cache_locally({string: id})
         return string
+
+    def bulk_resolve(self, strings: Sequence[str]) -> Mapping[str, int]:
+        """Lookup the integer IDs for many strings at once.
+
+        Strings that cannot be found are left out of the result.
+        """
+        mapped: MutableMapping[str, int] = self._ids.get_many(strings)
+        uncached = set(strings).difference(mapped.keys())
+        if uncached:
+            new_mapped = {
+                r.string: r.id
+                for r in MetricsKeyIndexer.objects.get_many_from_cache(list(uncached), key="string")
+            }
+            self._cache_locally(new_mapped)
+            mapped.update(new_mapped)
+        return mapped
+
+    def bulk_reverse_resolve(self, ids: Sequence[int]) -> Mapping[int, str]:
+        """Lookup the stored strings for many integer IDs at once.
+
+        IDs that cannot be found are left out of the result.
+        """
+        mapped: MutableMapping[int, str] = self._strings.get_many(ids)
+        uncached = set(ids).difference(mapped.keys())
+        if uncached:
+            new_mapped = {
+                r.id: r.string
+                for r in MetricsKeyIndexer.objects.get_many_from_cache(list(uncached))
+            }
+            self._cache_locally({string: id for id, string in new_mapped.items()})
+            mapped.update(new_mapped)
+        return mapped
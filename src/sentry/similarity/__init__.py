@@ -72,7 +72,14 @@ def _make_index_backend(cluster, namespace="sim:1"):
 
     return MetricsWrapper(
         RedisScriptMinHashIndexBackend(
-            cluster, namespace, MinHashSignatureBuilder(16, 0xFFFF), 8, 60 * 60 * 24 * 30, 3, 5000
+            cluster,
+            namespace,
+            MinHashSignatureBuilder(16, 0xFFFF),
+            8,
+            60 * 60 * 24 * 30,
+            3,
+            5000,
+            result_cache_ttl=getattr(settings, "SENTRY_SIMILARITY_RESULT_CACHE_TTL", 60),
         ),
         scope_tag_name=None,
     )
@@ -10,6 +10,14 @@ class AbstractIndexBackend(metaclass=ABCMeta):
     def compare(self, scope, key, items, limit=None, timestamp=None):
         pass
 
+    @abstractmethod
+    def classify_many(self, scope, requests, limit=None, timestamp=None):
+        pass
+
+    @abstractmethod
+    def compare_many(self, scope, requests, limit=None, timestamp=None):
+        pass
+
     @abstractmethod
     def record(self, scope, key, items, timestamp=None):
         pass
@@ -8,6 +8,12 @@ class DummyIndexBackend(AbstractIndexBackend):
     def compare(self, scope, key, items, limit=None, timestamp=None):
         return []
 
+    def classify_many(self, scope, requests, limit=None, timestamp=None):
+        return [[] for _ in requests]
+
+    def compare_many(self, scope, requests, limit=None, timestamp=None):
+        return [[] for _ in requests]
+
     def record(self, scope, key, items, timestamp=None):
         return {}
 
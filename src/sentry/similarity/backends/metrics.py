@@ -28,6 +28,12 @@ class MetricsWrapper(AbstractIndexBackend):
     def compare(self, *args, **kwargs):
         return self.__instrumented_method_call("compare", *args, **kwargs)
 
+    def classify_many(self, *args, **kwargs):
+        return self.__instrumented_method_call("classify_many", *args, **kwargs)
+
+    def compare_many(self, *args, **kwargs):
+        return self.__instrumented_method_call("compare_many", *args, **kwargs)
+
     def merge(self, *args, **kwargs):
         return self.__instrumented_method_call("merge", *args, **kwargs)
 
@@ -22,7 +22,15 @@ def flatten(value):
 
 class RedisScriptMinHashIndexBackend(AbstractIndexBackend):
     def __init__(
-        self, cluster, namespace, signature_builder, bands, interval, retention, candidate_set_limit
+        self,
+        cluster,
+        namespace,
+        signature_builder,
+        bands,
+        interval,
+        retention,
+        candidate_set_limit,
+        result_cache_ttl=0,
     ):
         self.cluster = cluster
         self.namespace = namespace
@@ -31,6 +39,7 @@ class RedisScriptMinHashIndexBackend(AbstractIndexBackend):
         self.interval = interval
         self.retention = retention
         self.candidate_set_limit = candidate_set_limit
+        self.result_cache_ttl = result_cache_ttl
 
     def _build_signature_arguments(self, features):
         if not features:
@@ -118,6 +127,60 @@ class RedisScriptMinHashIndexBackend(AbstractIndexBackend):
 
         return self._as_search_result(self.__index(scope, arguments))
 
+    def classify_many(self, scope, requests, limit=None, timestamp=None):
+        if not requests:
+            return []
+
+        if timestamp is None:
+            timestamp = int(time.time())
+
+        arguments = [
+            "CLASSIFY_MANY",
+            timestamp,
+            self.namespace,
+            self.bands,
+            self.interval,
+            self.retention,
+            self.candidate_set_limit,
+            scope,
+            limit if limit is not None else -1,
+        ]
+
+        for items in requests:
+            arguments.append(len(items))
+            for idx, threshold, features in items:
+                arguments.extend([idx, threshold])
+                arguments.extend(self._build_signature_arguments(features))
+
+        return map(self._as_search_result, self.__index(scope, arguments))
+
+    def compare_many(self, scope, requests, limit=None, timestamp=None):
+        if not requests:
+            return []
+
+        if timestamp is None:
+            timestamp = int(time.time())
+
+        arguments = [
+            "COMPARE_MANY",
+            timestamp,
+            self.namespace,
+            self.bands,
+            self.interval,
+            self.retention,
+            self.candidate_set_limit,
+            scope,
+            limit if limit is not None else -1,
+            self.result_cache_ttl,
+        ]
+
+        for key, items in requests:
+            arguments.extend([key, len(items)])
+            for idx, threshold in items:
+                arguments.extend([idx, threshold])
+
+        return map(self._as_search_result, self.__index(scope, arguments))
+
     def record(self, scope, key, items, timestamp=None):
         if not items:
             return  # nothing to do
@@ -202,6 +202,39 @@ class FeatureSet:
             ),
         )
 
+    def compare_many(self, groups, limit=None, thresholds=None):
+        """\
+        Compare multiple groups against the index, returning a list of results
+        (in the same format as ``compare``) in the same order as the provided
+        groups. All groups that belong to the same project are evaluated with
+        a single query.
+        """
+        if thresholds is None:
+            thresholds = {}
+
+        features = list(self.features.keys())
+
+        items = [(self.aliases[label], thresholds.get(label, 0)) for label in features]
+
+        scopes = {}
+        for i, group in enumerate(groups):
+            scopes.setdefault(self.__get_scope(group.project), []).append(i)
+
+        results = [None] * len(groups)
+        for scope, indices in scopes.items():
+            responses = self.index.compare_many(
+                scope,
+                [(self.__get_key(groups[i]), items) for i in indices],
+                limit=limit,
+            )
+            for i, response in zip(indices, responses):
+                results[i] = map(
+                    lambda key__scores: (int(key__scores[0]), dict(zip(features, key__scores[1]))),
+                    response,
+                )
+
+        return results
+
     def merge(self, destination, sources, allow_unsafe=False):
         def add_index_aliases_to_key(key):
             return [(self.aliases[label], key) for label in self.features.keys()]
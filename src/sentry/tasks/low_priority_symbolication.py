@@ -10,7 +10,7 @@ This has three major tasks, executed in the following general order:
 
 import logging
 import time
-from typing import Literal
+from typing import Literal, Mapping
 
 import sentry_sdk
 
@@ -21,6 +21,7 @@ from sentry.processing.realtime_metrics.base import (
     BucketedCounts,
     BucketedDurationsHistograms,
     DurationsHistogram,
+    ProjectMetrics,
 )
 from sentry.tasks.base import instrumented_task
 from sentry.utils import metrics
@@ -46,6 +47,11 @@ def _scan_for_suspect_projects() -> None:
     suspect_projects = set()
     now = int(time.time())
 
+    project_metrics = realtime_metrics.get_project_metrics(now)
+    if project_metrics is not None:
+        _update_lpq_eligibility_from_metrics(project_metrics)
+        return
+
     for project_id in realtime_metrics.projects():
         suspect_projects.add(project_id)
         update_lpq_eligibility.delay(project_id=project_id, cutoff=now)
@@ -105,6 +111,54 @@ def _update_lpq_eligibility(project_id: int, cutoff: int) -> None:
             _report_change(project_id=project_id, change="removed", reason="ineligible")
 
 
+def _update_lpq_eligibility_from_metrics(project_metrics: Mapping[int, ProjectMetrics]) -> None:
+    """
+    Updates the low priority queue from the summarized metrics of all projects at once.
+
+    Unlike `update_lpq_eligibility` this only touches projects whose assignment actually changes.
+    """
+    reasons = {}
+    excessive_rate_count = 0
+    excessive_duration_count = 0
+    for project_id, project in project_metrics.items():
+        excessive_rate = _excessive_rate(project.recent_rate, project.total_rate)
+        excessive_duration = project.p75_duration is not None and _excessive_duration(
+            project.p75_duration, project.events_per_minute
+        )
+        excessive_rate_count += excessive_rate
+        excessive_duration_count += excessive_duration
+        if excessive_rate and excessive_duration:
+            reasons[project_id] = "rate-duration"
+        elif excessive_rate:
+            reasons[project_id] = "rate"
+        elif excessive_duration:
+            reasons[project_id] = "duration"
+
+    # Per-project values are not reported here, unlike in `update_lpq_eligibility`, since this
+    # checks all projects in a single run.
+    metrics.gauge("symbolication.lpq.computation.projects", len(project_metrics))
+    metrics.gauge("symbolication.lpq.computation.excessive_rate", excessive_rate_count)
+    metrics.gauge("symbolication.lpq.computation.excessive_duration", excessive_duration_count)
+
+    current_lpq_projects = realtime_metrics.get_lpq_projects() or set()
+
+    for project_id in reasons.keys() - current_lpq_projects:
+        if realtime_metrics.add_project_to_lpq(project_id):
+            _report_change(project_id=project_id, change="added", reason=reasons[project_id])
+
+    ineligible_projects = current_lpq_projects - reasons.keys()
+    if not ineligible_projects:
+        return
+
+    # Projects which are backing off stay in the queue, so check which ones actually left it.
+    realtime_metrics.remove_projects_from_lpq(ineligible_projects)
+    remaining_lpq_projects = realtime_metrics.get_lpq_projects() or set()
+
+    for project_id in ineligible_projects - remaining_lpq_projects:
+        reason = "ineligible" if project_id in project_metrics else "no metrics"
+        _report_change(project_id=project_id, change="removed", reason=reason)
+
+
 def excessive_event_rate(project_id: int, event_counts: BucketedCounts) -> bool:
     """Whether the project is sending too many symbolication requests."""
     total_rate = event_counts.rate(event_counts.TOTAL_PERIOD)
@@ -116,6 +170,10 @@ def excessive_event_rate(project_id: int, event_counts: BucketedCounts) -> bool:
     metrics.gauge("symbolication.lpq.computation.rate.total", total_rate)
     metrics.gauge("symbolication.lpq.computation.rate.recent", recent_rate)
 
+    return _excessive_rate(recent_rate, total_rate)
+
+
+def _excessive_rate(recent_rate: float, total_rate: float) -> bool:
     if recent_rate > 50 and recent_rate > 5 * total_rate:
         return True
     else:
@@ -140,6 +198,10 @@ def excessive_event_duration(project_id: int, durations: BucketedDurationsHistog
     metrics.gauge("symbolication.lpq.computation.durations.p75", p75_duration)
     metrics.gauge("symbolication.lpq.computation.durations.events_per_minutes", events_per_minute)
 
+    return _excessive_duration(p75_duration, events_per_minute)
+
+
+def _excessive_duration(p75_duration: float, events_per_minute: float) -> bool:
     if events_per_minute > 15 and p75_duration > 6 * 60:
         return True
     else:
@@ -1,6 +1,9 @@
 import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
 
 import sentry_sdk
+from django.conf import settings
 
 from sentry import analytics, features
 from sentry.app import locks
@@ -13,6 +16,7 @@ from sentry.utils.cache import cache
 from sentry.utils.locking import UnableToAcquireLock
 from sentry.utils.safe import safe_execute
 from sentry.utils.sdk import bind_organization_context, set_current_event_project
+from sentry.utils.stages import StageGraph, StageTimings
 
 logger = logging.getLogger("sentry")
 
@@ -213,6 +217,87 @@ def update_existing_attachments(event):
     )
 
 
+def handle_suspect_commits(event, **kwargs):
+    from sentry.models import Commit
+    from sentry.tasks.groupowner import process_suspect_commits
+
+    try:
+        lock = locks.get(
+            f"w-o:{event.group_id}-d-l",
+            duration=10,
+        )
+        with lock.acquire():
+            has_commit_key = f"w-o:{event.project.organization_id}-h-c"
+            org_has_commit = cache.get(has_commit_key)
+            if org_has_commit is None:
+                org_has_commit = Commit.objects.filter(
+                    organization_id=event.project.organization_id
+                ).exists()
+                cache.set(has_commit_key, org_has_commit, 3600)
+
+            if org_has_commit:
+                group_cache_key = f"w-o-i:g-{event.group_id}"
+                if cache.get(group_cache_key):
+                    metrics.incr(
+                        "sentry.tasks.process_suspect_commits.debounce",
+                        tags={"detail": "w-o-i:g debounce"},
+                    )
+                else:
+                    from sentry.utils.committers import get_frame_paths
+
+                    cache.set(group_cache_key, True, 604800)  # 1 week in seconds
+                    event_frames = get_frame_paths(event.data)
+                    process_suspect_commits.delay(
+                        event_id=event.event_id,
+                        event_platform=event.platform,
+                        event_frames=event_frames,
+                        group_id=event.group_id,
+                        project_id=event.project_id,
+                    )
+    except UnableToAcquireLock:
+        pass
+    except Exception:
+        logger.exception("Failed to process suspect commits")
+
+
+def handle_plugins(event, is_new, is_regression, **kwargs):
+    from sentry.plugins.base import plugins
+
+    for plugin in plugins.for_project(event.project):
+        plugin_post_process_group(
+            plugin_slug=plugin.slug, event=event, is_new=is_new, is_regresion=is_regression
+        )
+
+
+def record_similarity(event, **kwargs):
+    from sentry import similarity
+
+    with sentry_sdk.start_span(op="tasks.post_process_group.similarity"):
+        safe_execute(similarity.record, event.project, [event], _with_transaction=False)
+
+
+# Post processing stages that may be deferred to `post_process_deferred_stage`.
+DEFERRABLE_STAGES = {
+    "suspect_commits": handle_suspect_commits,
+    "plugins": handle_plugins,
+    "similarity": record_similarity,
+}
+
+_stage_timings = StageTimings()
+_stage_executor = None
+
+
+def _get_stage_executor():
+    global _stage_executor
+
+    if not settings.SENTRY_POST_PROCESS_STAGE_WORKERS:
+        return None
+    # Created lazily so that every worker process gets its own pool.
+    if _stage_executor is None:
+        _stage_executor = ThreadPoolExecutor(max_workers=settings.SENTRY_POST_PROCESS_STAGE_WORKERS)
+    return _stage_executor
+
+
 @instrumented_task(
     name="sentry.tasks.post_process.post_process_group",
     time_limit=120,
@@ -282,11 +367,10 @@ def post_process_group(
         # NOTE: we must pass through the full Event object, and not an
         # event_id since the Event object may not actually have been stored
         # in the database due to sampling.
-        from sentry.models import Commit, GroupInboxReason
+        from sentry.models import GroupInboxReason
         from sentry.models.group import get_group_with_redirect
         from sentry.models.groupinbox import add_group_to_inbox
         from sentry.rules.processor import RuleProcessor
-        from sentry.tasks.groupowner import process_suspect_commits
         from sentry.tasks.servicehooks import process_service_hook
 
         # Re-bind Group since we're reading the Event object
@@ -309,113 +393,127 @@ def post_process_group(
                 logger.exception("Failed to add group to inbox for reprocessed groups")
 
         if not is_reprocessed:
-            # we process snoozes before rules as it might create a regression
-            # but not if it's new because you can't immediately snooze a new group
-            has_reappeared = not is_new
-            try:
-                if has_reappeared:
-                    has_reappeared = process_snoozes(event.group)
-            except Exception:
-                logger.exception("Failed to process snoozes for group")
-
-            try:
-                if not has_reappeared:  # If true, we added the .UNIGNORED reason already
-                    if is_new:
-                        add_group_to_inbox(event.group, GroupInboxReason.NEW)
-                    elif is_regression:
-                        add_group_to_inbox(event.group, GroupInboxReason.REGRESSION)
-            except Exception:
-                logger.exception("Failed to add group to inbox for non-reprocessed groups")
 
-            with sentry_sdk.start_span(op="tasks.post_process_group.handle_owner_assignment"):
+            def snoozes(results):
+                # we process snoozes before rules as it might create a regression
+                # but not if it's new because you can't immediately snooze a new group
+                has_reappeared = not is_new
                 try:
-                    handle_owner_assignment(event.project, event.group, event)
+                    if has_reappeared:
+                        has_reappeared = process_snoozes(event.group)
                 except Exception:
-                    logger.exception("Failed to handle owner assignments")
-
-            rp = RuleProcessor(
-                event, is_new, is_regression, is_new_group_environment, has_reappeared
-            )
-            has_alert = False
-            with sentry_sdk.start_span(op="tasks.post_process_group.rule_processor_callbacks"):
-                # TODO(dcramer): ideally this would fanout, but serializing giant
-                # objects back and forth isn't super efficient
-                for callback, futures in rp.apply():
-                    has_alert = True
-                    safe_execute(callback, event, futures, _with_transaction=False)
+                    logger.exception("Failed to process snoozes for group")
+                return has_reappeared
 
-            try:
-                lock = locks.get(
-                    f"w-o:{event.group_id}-d-l",
-                    duration=10,
-                )
-                with lock.acquire():
-                    has_commit_key = f"w-o:{event.project.organization_id}-h-c"
-                    org_has_commit = cache.get(has_commit_key)
-                    if org_has_commit is None:
-                        org_has_commit = Commit.objects.filter(
-                            organization_id=event.project.organization_id
-                        ).exists()
-                        cache.set(has_commit_key, org_has_commit, 3600)
-
-                    if org_has_commit:
-                        group_cache_key = f"w-o-i:g-{event.group_id}"
-                        if cache.get(group_cache_key):
-                            metrics.incr(
-                                "sentry.tasks.process_suspect_commits.debounce",
-                                tags={"detail": "w-o-i:g debounce"},
-                            )
-                        else:
-                            from sentry.utils.committers import get_frame_paths
-
-                            cache.set(group_cache_key, True, 604800)  # 1 week in seconds
-                            event_frames = get_frame_paths(event.data)
-                            process_suspect_commits.delay(
-                                event_id=event.event_id,
-                                event_platform=event.platform,
-                                event_frames=event_frames,
-                                group_id=event.group_id,
-                                project_id=event.project_id,
-                            )
-            except UnableToAcquireLock:
-                pass
-            except Exception:
-                logger.exception("Failed to process suspect commits")
-
-            if features.has("projects:servicehooks", project=event.project):
-                allowed_events = {"event.created"}
-                if has_alert:
-                    allowed_events.add("event.alert")
-
-                if allowed_events:
-                    for servicehook_id, events in _get_service_hooks(project_id=event.project_id):
-                        if any(e in allowed_events for e in events):
-                            process_service_hook.delay(servicehook_id=servicehook_id, event=event)
-
-            from sentry.tasks.sentry_apps import process_resource_change_bound
-
-            if event.get_event_type() == "error" and _should_send_error_created_hooks(
-                event.project
-            ):
-                process_resource_change_bound.delay(
-                    action="created", sender="Error", instance_id=event.event_id, instance=event
-                )
-            if is_new:
-                process_resource_change_bound.delay(
-                    action="created", sender="Group", instance_id=event.group_id
+            def inbox(results):
+                try:
+                    if not results["snoozes"]:  # If true, we added the .UNIGNORED reason already
+                        if is_new:
+                            add_group_to_inbox(event.group, GroupInboxReason.NEW)
+                        elif is_regression:
+                            add_group_to_inbox(event.group, GroupInboxReason.REGRESSION)
+                except Exception:
+                    logger.exception("Failed to add group to inbox for non-reprocessed groups")
+
+            def owner_assignment(results):
+                with sentry_sdk.start_span(op="tasks.post_process_group.handle_owner_assignment"):
+                    try:
+                        handle_owner_assignment(event.project, event.group, event)
+                    except Exception:
+                        logger.exception("Failed to handle owner assignments")
+
+            def rules(results):
+                rp = RuleProcessor(
+                    event, is_new, is_regression, is_new_group_environment, results["snoozes"]
                 )
+                has_alert = False
+                with sentry_sdk.start_span(op="tasks.post_process_group.rule_processor_callbacks"):
+                    # TODO(dcramer): ideally this would fanout, but serializing giant
+                    # objects back and forth isn't super efficient
+                    for callback, futures in rp.apply():
+                        has_alert = True
+                        safe_execute(callback, event, futures, _with_transaction=False)
+                return has_alert
+
+            def service_hooks(results):
+                if features.has("projects:servicehooks", project=event.project):
+                    allowed_events = {"event.created"}
+                    if results["rules"]:
+                        allowed_events.add("event.alert")
+
+                    if allowed_events:
+                        for servicehook_id, events in _get_service_hooks(
+                            project_id=event.project_id
+                        ):
+                            if any(e in allowed_events for e in events):
+                                process_service_hook.delay(
+                                    servicehook_id=servicehook_id, event=event
+                                )
+
+            def sentry_app_hooks(results):
+                from sentry.tasks.sentry_apps import process_resource_change_bound
+
+                if event.get_event_type() == "error" and _should_send_error_created_hooks(
+                    event.project
+                ):
+                    process_resource_change_bound.delay(
+                        action="created", sender="Error", instance_id=event.event_id, instance=event
+                    )
+                if is_new:
+                    process_resource_change_bound.delay(
+                        action="created", sender="Group", instance_id=event.group_id
+                    )
 
-            from sentry.plugins.base import plugins
-
-            for plugin in plugins.for_project(event.project):
-                plugin_post_process_group(
-                    plugin_slug=plugin.slug, event=event, is_new=is_new, is_regresion=is_regression
+            def deferrable(name):
+                return lambda results: DEFERRABLE_STAGES[name](
+                    event=event, is_new=is_new, is_regression=is_regression
                 )
 
-            from sentry import similarity
-
-            with sentry_sdk.start_span(op="tasks.post_process_group.similarity"):
-                safe_execute(similarity.record, event.project, [event], _with_transaction=False)
+            # Stages that don't affect alerting have a budget, and are deferred to a
+            # follow-up task when they have recently been slower than that.
+            budgets = settings.SENTRY_POST_PROCESS_STAGE_BUDGETS
+            graph = StageGraph(
+                "tasks.post_process_group",
+                executor=_get_stage_executor(),
+                timings=_stage_timings,
+                defer=lambda stage: post_process_deferred_stage.delay(
+                    stage=stage,
+                    project_id=event.project_id,
+                    event_id=event.event_id,
+                    group_id=event.group_id,
+                    is_new=is_new,
+                    is_regression=is_regression,
+                ),
+            )
+            # Processing snoozes may update `event.group`, which all other
+            # stages read, so nothing runs concurrently with it. Owners are
+            # assigned after the group was added to the inbox and rules run
+            # after that, as they did when all stages ran in sequence.
+            graph.add("snoozes", snoozes)
+            graph.add("inbox", inbox, depends_on=["snoozes"])
+            graph.add("owner_assignment", owner_assignment, depends_on=["inbox"])
+            graph.add("rules", rules, depends_on=["snoozes", "owner_assignment"])
+            graph.add(
+                "suspect_commits",
+                deferrable("suspect_commits"),
+                depends_on=["snoozes"],
+                budget=budgets.get("suspect_commits"),
+            )
+            graph.add("service_hooks", service_hooks, depends_on=["rules"])
+            graph.add("sentry_app_hooks", sentry_app_hooks, depends_on=["snoozes"])
+            graph.add(
+                "plugins",
+                deferrable("plugins"),
+                depends_on=["snoozes"],
+                budget=budgets.get("plugins"),
+            )
+            graph.add(
+                "similarity",
+                deferrable("similarity"),
+                depends_on=["snoozes"],
+                budget=budgets.get("similarity"),
+            )
+            graph.run()
 
         # Patch attachments that were ingested on the standalone path.
         with sentry_sdk.start_span(op="tasks.post_process_group.update_existing_attachments"):
@@ -433,6 +531,36 @@ def post_process_group(
             )
 
 
+@instrumented_task(
+    name="sentry.tasks.post_process.post_process_deferred_stage",
+    queue="events.post_process_deferred_stage",
+)
+def post_process_deferred_stage(
+    stage, project_id, event_id, group_id, is_new, is_regression, **kwargs
+):
+    """
+    Runs a post processing stage that was deferred by `post_process_group`
+    because it exceeded its budget.
+
+    The event is loaded from the event store, so the stage is skipped for
+    events that have not been stored (e.g. because of sampling).
+    """
+    from sentry import eventstore
+
+    set_current_event_project(project_id)
+
+    event = eventstore.get_event_by_id(project_id, event_id, group_id=group_id)
+    if event is None:
+        metrics.incr("tasks.post_process_deferred_stage.missing_event", tags={"stage": stage})
+        return
+
+    start = time.time()
+    try:
+        DEFERRABLE_STAGES[stage](event=event, is_new=is_new, is_regression=is_regression)
+    finally:
+        _stage_timings.record(stage, time.time() - start)
+
+
 def process_snoozes(group):
     """
     Return True if the group is transitioning from "resolved" to "unresolved",
@@ -4,10 +4,10 @@ import math
 import operator
 import zlib
 from calendar import Calendar
-from collections import OrderedDict, namedtuple
+from collections import OrderedDict, defaultdict, namedtuple
 from datetime import datetime, timedelta
 from functools import partial, reduce
-from itertools import zip_longest
+from itertools import groupby, zip_longest
 from typing import Iterable, Mapping, NamedTuple, Tuple
 
 import pytz
@@ -17,7 +17,7 @@ from django.utils.http import urlencode
 from snuba_sdk.column import Column
 from snuba_sdk.conditions import Condition, Op
 from snuba_sdk.entity import Entity
-from snuba_sdk.expressions import Granularity
+from snuba_sdk.expressions import Granularity, Limit
 from snuba_sdk.function import Function
 from snuba_sdk.query import Query
 
@@ -26,6 +26,7 @@ from sentry.app import tsdb
 from sentry.constants import DataCategory
 from sentry.models import (
     Activity,
+    Group,
     GroupStatus,
     Organization,
     OrganizationStatus,
@@ -55,6 +56,10 @@ BATCH_SIZE = 20000
 
 ONE_DAY = int(timedelta(days=1).total_seconds())
 
+# Row limit of usage outcomes queries. The default limit of Snuba is lower,
+# which would silently cut off the results of large organizations.
+OUTCOMES_QUERY_LIMIT = 10000
+
 project_breakdown_colors = ["#422C6E", "#895289", "#D6567F", "#F38150", "#F2B713"]
 
 calendar_heat_colors = [
@@ -213,16 +218,26 @@ def merge_series(target, other, function=operator.add):
     return results
 
 
-def _query_tsdb_groups_chunked(func, issue_ids, start, stop, rollup):
+def _query_tsdb_chunked(func, model, keys, start, stop, rollup):
     combined = {}
 
-    for chunk in chunked(issue_ids, BATCH_SIZE):
-        combined.update(func(tsdb.models.group, chunk, start, stop, rollup=rollup))
+    for chunk in chunked(keys, BATCH_SIZE):
+        combined.update(func(model, chunk, start, stop, rollup=rollup))
 
     return combined
 
 
-def build_project_series(start__stop, project):
+def _query_tsdb_groups_chunked(func, issue_ids, start, stop, rollup):
+    return _query_tsdb_chunked(func, tsdb.models.group, issue_ids, start, stop, rollup)
+
+
+def _query_tsdb_projects_chunked(func, projects, start, stop, rollup):
+    return _query_tsdb_chunked(
+        func, tsdb.models.project, [project.id for project in projects], start, stop, rollup
+    )
+
+
+def build_project_series_many(start__stop, projects):
     start, stop = start__stop
     rollup = ONE_DAY
 
@@ -230,29 +245,43 @@ def build_project_series(start__stop, project):
     assert resolution == rollup, "resolution does not match requested value"
 
     clean = partial(clean_series, start, stop, rollup)
-    issue_ids = project.group_set.filter(
-        status=GroupStatus.RESOLVED, resolved_at__gte=start, resolved_at__lt=stop
-    ).values_list("id", flat=True)
-
-    tsdb_range_resolved = _query_tsdb_groups_chunked(tsdb.get_range, issue_ids, start, stop, rollup)
-    resolved_series = reduce(
-        merge_series,
-        map(clean, tsdb_range_resolved.values()),
-        clean([(timestamp, 0) for timestamp in series]),
+    issue_ids = defaultdict(list)
+    for issue_id, project_id in Group.objects.filter(
+        project__in=projects,
+        status=GroupStatus.RESOLVED,
+        resolved_at__gte=start,
+        resolved_at__lt=stop,
+    ).values_list("id", "project_id"):
+        issue_ids[project_id].append(issue_id)
+
+    tsdb_range_resolved = _query_tsdb_groups_chunked(
+        tsdb.get_range, [id for ids in issue_ids.values() for id in ids], start, stop, rollup
     )
+    tsdb_range_total = _query_tsdb_projects_chunked(tsdb.get_range, projects, start, stop, rollup)
 
-    total_series = clean(
-        tsdb.get_range(tsdb.models.project, [project.id], start, stop, rollup=rollup)[project.id]
-    )
+    def build(project):
+        resolved_series = reduce(
+            merge_series,
+            map(clean, [tsdb_range_resolved[id] for id in issue_ids[project.id]]),
+            clean([(timestamp, 0) for timestamp in series]),
+        )
 
-    return merge_series(
-        resolved_series,
-        total_series,
-        lambda resolved, total: (resolved, total - resolved),  # unresolved
-    )
+        total_series = clean(tsdb_range_total[project.id])
 
+        return merge_series(
+            resolved_series,
+            total_series,
+            lambda resolved, total: (resolved, total - resolved),  # unresolved
+        )
 
-def build_project_aggregates(ignore__stop, project):
+    return {project.id: build(project) for project in projects}
+
+
+def build_project_series(start__stop, project):
+    return build_project_series_many(start__stop, [project])[project.id]
+
+
+def build_project_aggregates_many(ignore__stop, projects):
     # TODO: This needs to return ``None`` for periods that don't have any data
     # (because the project is not old enough) and possibly extrapolate for
     # periods that only have partial periods.
@@ -261,26 +290,34 @@ def build_project_aggregates(ignore__stop, project):
     period = timedelta(days=7)
     start = stop - (period * segments)
 
-    def get_aggregate_value(start, stop):
-        return tsdb.get_sums(tsdb.models.project, (project.id,), start, stop, rollup=ONE_DAY)[
-            project.id
-        ]
+    def get_aggregate_values(start, stop):
+        return _query_tsdb_projects_chunked(tsdb.get_sums, projects, start, stop, ONE_DAY)
 
-    return [
-        get_aggregate_value(start + (period * i), start + (period * (i + 1) - timedelta(seconds=1)))
+    aggregates = [
+        get_aggregate_values(
+            start + (period * i), start + (period * (i + 1) - timedelta(seconds=1))
+        )
         for i in range(segments)
     ]
 
+    return {project.id: [values[project.id] for values in aggregates] for project in projects}
 
-def build_project_issue_summaries(interval, project):
+
+def build_project_aggregates(ignore__stop, project):
+    return build_project_aggregates_many(ignore__stop, [project])[project.id]
+
+
+def build_project_issue_summaries_many(interval, projects):
     start, stop = interval
 
-    queryset = project.group_set.exclude(status=GroupStatus.IGNORED)
+    queryset = Group.objects.filter(project__in=projects).exclude(status=GroupStatus.IGNORED)
 
     # Fetch all new issues.
-    new_issue_ids = set(
-        queryset.filter(first_seen__gte=start, first_seen__lt=stop).values_list("id", flat=True)
-    )
+    new_issue_ids = defaultdict(set)
+    for issue_id, project_id in queryset.filter(
+        first_seen__gte=start, first_seen__lt=stop
+    ).values_list("id", "project_id"):
+        new_issue_ids[project_id].add(issue_id)
 
     # Fetch all regressions. This is a little weird, since there's no way to
     # tell *when* a group regressed using the Group model. Instead, we query
@@ -289,7 +326,8 @@ def build_project_issue_summaries(interval, project):
     # past week. (In theory, the activity table *could* be used to answer this
     # query without the subselect, but there's no suitable indexes to make it's
     # performance predictable.)
-    reopened_issue_ids = set(
+    reopened_issue_ids = defaultdict(set)
+    for issue_id, project_id in (
         Activity.objects.filter(
             group__in=queryset.filter(
                 last_seen__gte=start,
@@ -301,27 +339,40 @@ def build_project_issue_summaries(interval, project):
             datetime__lt=stop,
         )
         .distinct()
-        .values_list("group_id", flat=True)
-    )
+        .values_list("group_id", "project_id")
+    ):
+        reopened_issue_ids[project_id].add(issue_id)
 
     rollup = ONE_DAY
     event_counts = _query_tsdb_groups_chunked(
-        tsdb.get_sums, new_issue_ids | reopened_issue_ids, start, stop, rollup
+        tsdb.get_sums,
+        set().union(*new_issue_ids.values(), *reopened_issue_ids.values()),
+        start,
+        stop,
+        rollup,
     )
-
-    new_issue_count = sum(event_counts[id] for id in new_issue_ids)
-    reopened_issue_count = sum(event_counts[id] for id in reopened_issue_ids)
-    existing_issue_count = max(
-        tsdb.get_sums(tsdb.models.project, [project.id], start, stop, rollup=rollup)[project.id]
-        - new_issue_count
-        - reopened_issue_count,
-        0,
+    project_event_counts = _query_tsdb_projects_chunked(
+        tsdb.get_sums, projects, start, stop, rollup
     )
 
-    return [new_issue_count, reopened_issue_count, existing_issue_count]
+    def build(project):
+        new_issue_count = sum(event_counts[id] for id in new_issue_ids[project.id])
+        reopened_issue_count = sum(event_counts[id] for id in reopened_issue_ids[project.id])
+        existing_issue_count = max(
+            project_event_counts[project.id] - new_issue_count - reopened_issue_count,
+            0,
+        )
 
+        return [new_issue_count, reopened_issue_count, existing_issue_count]
 
-def build_project_usage_outcomes(start__stop, project):
+    return {project.id: build(project) for project in projects}
+
+
+def build_project_issue_summaries(interval, project):
+    return build_project_issue_summaries_many(interval, [project])[project.id]
+
+
+def build_project_usage_outcomes_many(start__stop, projects):
     start, stop = start__stop
 
     # XXX(epurkhiser): Tsdb used to use day buckets, where the end would
@@ -329,33 +380,47 @@ def build_project_usage_outcomes(start__stop, project):
     # capture the entire last day
     end = stop + timedelta(days=1)
 
-    query = Query(
-        dataset=Dataset.Outcomes.value,
-        match=Entity("outcomes"),
-        select=[
-            Column("outcome"),
-            Column("category"),
-            Function("sum", [Column("quantity")], "total"),
-        ],
-        where=[
-            Condition(Column("timestamp"), Op.GTE, start),
-            Condition(Column("timestamp"), Op.LT, end),
-            Condition(Column("project_id"), Op.EQ, project.id),
-            Condition(Column("org_id"), Op.EQ, project.organization_id),
-            Condition(
-                Column("outcome"), Op.IN, [Outcome.ACCEPTED, Outcome.FILTERED, Outcome.RATE_LIMITED]
-            ),
-            Condition(
-                Column("category"),
-                Op.IN,
-                [*DataCategory.error_categories(), DataCategory.TRANSACTION],
-            ),
-        ],
-        groupby=[Column("outcome"), Column("category")],
-        granularity=Granularity(ONE_DAY),
-    )
-    data = raw_snql_query(query, referrer="reports.outcomes")["data"]
+    outcomes = [Outcome.ACCEPTED, Outcome.FILTERED, Outcome.RATE_LIMITED]
+    categories = [*DataCategory.error_categories(), DataCategory.TRANSACTION]
+    # Each project has at most one row per outcome and category.
+    projects_per_query = max(OUTCOMES_QUERY_LIMIT // (len(outcomes) * len(categories)), 1)
+
+    data = defaultdict(list)
+    for organization_id, organization_projects in groupby(
+        sorted(projects, key=lambda project: project.organization_id),
+        key=lambda project: project.organization_id,
+    ):
+        for project_ids in chunked(
+            (project.id for project in organization_projects), projects_per_query
+        ):
+            query = Query(
+                dataset=Dataset.Outcomes.value,
+                match=Entity("outcomes"),
+                select=[
+                    Column("project_id"),
+                    Column("outcome"),
+                    Column("category"),
+                    Function("sum", [Column("quantity")], "total"),
+                ],
+                where=[
+                    Condition(Column("timestamp"), Op.GTE, start),
+                    Condition(Column("timestamp"), Op.LT, end),
+                    Condition(Column("project_id"), Op.IN, project_ids),
+                    Condition(Column("org_id"), Op.EQ, organization_id),
+                    Condition(Column("outcome"), Op.IN, outcomes),
+                    Condition(Column("category"), Op.IN, categories),
+                ],
+                groupby=[Column("project_id"), Column("outcome"), Column("category")],
+                granularity=Granularity(ONE_DAY),
+                limit=Limit(OUTCOMES_QUERY_LIMIT),
+            )
+            for row in raw_snql_query(query, referrer="reports.outcomes")["data"]:
+                data[row["project_id"]].append(row)
+
+    return {project.id: _summarize_usage_outcomes(data[project.id]) for project in projects}
 
+
+def _summarize_usage_outcomes(data):
     return (
         # Accepted errors
         sum(
@@ -387,6 +452,10 @@ def build_project_usage_outcomes(start__stop, project):
     )
 
 
+def build_project_usage_outcomes(start__stop, project):
+    return build_project_usage_outcomes_many(start__stop, [project])[project.id]
+
+
 def get_calendar_range(ignore__stop_time, months):
     _, stop_time = ignore__stop_time
     assert (
@@ -427,15 +496,20 @@ def clean_calendar_data(project, series, start, stop, rollup, timestamp=None):
     return map(remove_invalid_values, clean_series(start, stop, rollup, series))
 
 
-def build_project_calendar_series(interval, project):
+def build_project_calendar_series_many(interval, projects):
     start, stop = get_calendar_query_range(interval, 3)
 
     rollup = ONE_DAY
-    series = tsdb.get_range(tsdb.models.project, [project.id], start, stop, rollup=rollup)[
-        project.id
-    ]
+    series = _query_tsdb_projects_chunked(tsdb.get_range, projects, start, stop, rollup)
 
-    return clean_calendar_data(project, series, start, stop, rollup)
+    return {
+        project.id: clean_calendar_data(project, series[project.id], start, stop, rollup)
+        for project in projects
+    }
+
+
+def build_project_calendar_series(interval, project):
+    return build_project_calendar_series_many(interval, [project])[project.id]
 
 
 def build_report(fields):
@@ -445,6 +519,11 @@ def build_report(fields):
 
     Each field is a tuple of the (field name, builder fn, merge fn).
 
+    The builder function builds the values of that field for a list of
+    projects, keyed by project ID, so that each field is fetched with a few
+    queries for all projects. `prepare_many` builds the reports of a list of
+    projects, `prepare` the report of a single project.
+
     The merge function is used to merge the value of that field together for
     multiple reports.
     """
@@ -452,32 +531,36 @@ def build_report(fields):
 
     cls = namedtuple("Report", names)
 
-    def prepare(*args):
-        return cls(*(f(*args) for f in field_builders))
+    def prepare_many(interval, projects):
+        values = [f(interval, projects) for f in field_builders]
+        return {project.id: cls(*(v[project.id] for v in values)) for project in projects}
+
+    def prepare(interval, project):
+        return prepare_many(interval, [project])[project.id]
 
     def merge(target, other):
         return cls(*(f(target[i], other[i]) for i, f in enumerate(field_mergers)))
 
-    return cls, prepare, merge
+    return cls, prepare, prepare_many, merge
 
 
-Report, build_project_report, merge_reports = build_report(
+Report, build_project_report, build_project_reports, merge_reports = build_report(
     [
         (
             "series",
-            build_project_series,
+            build_project_series_many,
             partial(merge_series, function=merge_sequences),
         ),
         (
             "aggregates",
-            build_project_aggregates,
+            build_project_aggregates_many,
             partial(merge_sequences, function=safe_add),
         ),
-        ("issue_summaries", build_project_issue_summaries, merge_sequences),
-        ("series_outcomes", build_project_usage_outcomes, merge_sequences),
+        ("issue_summaries", build_project_issue_summaries_many, merge_sequences),
+        ("series_outcomes", build_project_usage_outcomes_many, merge_sequences),
         (
             "calendar_series",
-            build_project_calendar_series,
+            build_project_calendar_series_many,
             partial(merge_series, function=safe_add),
         ),
     ],
@@ -491,6 +574,12 @@ class ReportBackend:
         """
         return build_project_report(_to_interval(timestamp, duration), project)
 
+    def build_many(self, timestamp, duration, projects):
+        """
+        Constructs the reports for a list of projects, keyed by project ID.
+        """
+        return build_project_reports(_to_interval(timestamp, duration), projects)
+
     def prepare(self, timestamp, duration, organization):
         """
         Build and store reports for all projects in an organization.
@@ -511,7 +600,8 @@ class DummyReportBackend(ReportBackend):
 
     def fetch(self, timestamp, duration, organization, projects):
         assert all(project.organization_id == organization.id for project in projects)
-        return map(partial(self.build, timestamp, duration), projects)
+        reports = self.build_many(timestamp, duration, projects)
+        return [reports[project.id] for project in projects]
 
 
 class RedisReportBackend(ReportBackend):
@@ -537,9 +627,12 @@ class RedisReportBackend(ReportBackend):
         return Report(*json.loads(zlib.decompress(value)))
 
     def prepare(self, timestamp, duration, organization):
-        reports = {}
-        for project in organization.project_set.all():
-            reports[project.id] = self.__encode(self.build(timestamp, duration, project))
+        reports = {
+            project_id: self.__encode(report)
+            for project_id, report in self.build_many(
+                timestamp, duration, list(organization.project_set.all())
+            ).items()
+        }
 
         if not reports:
             # XXX: HMSET requires at least one key/value pair, so we need to
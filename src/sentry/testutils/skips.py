@@ -40,6 +40,20 @@ requires_snuba_metrics = pytest.mark.skipif(
 )
 
 
+def pytest_benchmark_available():
+    try:
+        import pytest_benchmark  # NOQA
+    except ModuleNotFoundError:
+        return False
+    else:
+        return True
+
+
+requires_pytest_benchmark = pytest.mark.skipif(
+    not pytest_benchmark_available(), reason="requires pytest-benchmark"
+)
+
+
 def xfail_if_not_postgres(reason):
     def decorator(function):
         return pytest.mark.xfail(os.environ.get("TEST_SUITE") != "postgres", reason=reason)(
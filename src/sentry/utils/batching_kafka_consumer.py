@@ -1,6 +1,7 @@
 import abc
 import logging
 import time
+from collections import deque
 from typing import List
 
 from confluent_kafka import (
@@ -11,6 +12,7 @@ from confluent_kafka import (
     Consumer,
     KafkaError,
     KafkaException,
+    TopicPartition,
 )
 from confluent_kafka.admin import AdminClient
 from django.conf import settings
@@ -119,6 +121,11 @@ class AbstractBatchWorker(metaclass=abc.ABCMeta):
         store(s) it is maintaining. Afterwards the Kafka offsets are committed.
 
         A simple example would be writing the batch to another Kafka topic.
+
+        If the worker writes the batch asynchronously, it can return a
+        `PendingFlush` instead of waiting for the writes to complete. The
+        `BatchingKafkaConsumer` then continues consuming the next batch, and
+        only commits the offsets of this batch once the flush has completed.
         """
 
     @abc.abstractmethod
@@ -130,6 +137,24 @@ class AbstractBatchWorker(metaclass=abc.ABCMeta):
         A simple example would be closing any remaining backend connections."""
 
 
+class PendingFlush(metaclass=abc.ABCMeta):
+    """A batch that has been handed off by `AbstractBatchWorker.flush_batch`,
+    but has not been fully written yet."""
+
+    @abc.abstractmethod
+    def wait(self, timeout):
+        """Waits up to `timeout` seconds for the flush to complete, returning
+        whether it has completed. Raises an exception if the flush failed.
+
+        Implementations must eventually either complete or fail, so that the
+        consumer does not block forever when waiting for a flush."""
+
+
+class _CompletedFlush(PendingFlush):
+    def wait(self, timeout):
+        return True
+
+
 class BatchingKafkaConsumer:
     """The `BatchingKafkaConsumer` is an abstraction over most Kafka consumer's main event
     loops. For this reason it uses inversion of control: the user provides an implementation
@@ -200,6 +225,7 @@ class BatchingKafkaConsumer:
         metrics_sample_rates=None,
         metrics_default_tags=None,
         commit_on_shutdown: bool = False,
+        max_pending_flushes: int = 1,
     ):
         assert isinstance(worker, AbstractBatchWorker)
         self.worker = worker
@@ -213,6 +239,10 @@ class BatchingKafkaConsumer:
         self.__metrics_default_tags = metrics_default_tags or {}
         self.group_id = group_id
         self.commit_on_shutdown = commit_on_shutdown
+        # The number of batches returned as `PendingFlush` by the worker that
+        # may be in flight while consuming the next batch.
+        self.max_pending_flushes = max_pending_flushes
+        self.__pending_flushes = deque()
 
         self.shutdown = False
 
@@ -256,6 +286,7 @@ class BatchingKafkaConsumer:
             "Reset the current in-memory batch, letting the next consumer take over where we left off."
             logger.info("Partitions revoked: %r", partitions)
             self._flush(force=True)
+            self._wait_for_pending_flushes()
 
         self.consumer.subscribe(
             topics, on_assign=on_partitions_assigned, on_revoke=on_partitions_revoked
@@ -318,6 +349,7 @@ class BatchingKafkaConsumer:
 
     def _run_once(self):
         self._flush()
+        self._commit_completed_flushes()
 
         if self.producer:
             self.producer.poll(0.0)
@@ -386,9 +418,11 @@ class BatchingKafkaConsumer:
 
         if self.commit_on_shutdown:
             self._flush(force=True)
+            self._wait_for_pending_flushes()
         else:
             # drop in-memory events, letting the next consumer take over where we left off
             self._reset_batch()
+            self.__pending_flushes.clear()
 
         # tell the consumer to shutdown, and close the consumer
         logger.debug("Stopping worker")
@@ -436,10 +470,11 @@ class BatchingKafkaConsumer:
 
         batch_results_length = len(self.__batch_results)
         self.__record_timing("batching_consumer.batch.size", batch_results_length)
+        pending = None
         if batch_results_length > 0:
             logger.debug("Flushing batch via worker")
             flush_start = time.time()
-            self.worker.flush_batch(self.__batch_results)
+            pending = self.worker.flush_batch(self.__batch_results)
             flush_duration = (time.time() - flush_start) * 1000
             logger.info("Worker flush took %dms", flush_duration)
             self.__record_timing("batching_consumer.batch.flush", flush_duration)
@@ -447,6 +482,26 @@ class BatchingKafkaConsumer:
                 "batching_consumer.batch.flush.normalized", flush_duration / batch_results_length
             )
 
+        if pending is not None or self.__pending_flushes:
+            # The offsets of this batch can only be committed after all
+            # previous batches have been committed, and after the batch itself
+            # has been written.
+            self.__pending_flushes.append(
+                (
+                    pending if pending is not None else _CompletedFlush(),
+                    [
+                        TopicPartition(topic, partition, high + 1)
+                        for (topic, partition), (_, high) in self.__batch_offsets.items()
+                    ],
+                )
+            )
+            self._reset_batch()
+
+            # Apply backpressure if the worker can't keep up with writing batches.
+            while len(self.__pending_flushes) > self.max_pending_flushes:
+                self._commit_completed_flushes(timeout=1.0)
+            return
+
         logger.debug("Committing Kafka offsets")
         commit_start = time.time()
         self._commit()
@@ -459,11 +514,37 @@ class BatchingKafkaConsumer:
         if error is not None:
             raise Exception(error.str())
 
-    def _commit(self):
+    def _commit_completed_flushes(self, timeout=0.0):
+        """Commits the offsets of pending flushes that have completed, in the
+        order they were flushed in. Returns whether all pending flushes have
+        been committed."""
+        while self.__pending_flushes:
+            pending, offsets = self.__pending_flushes[0]
+            wait_start = time.time()
+            completed = pending.wait(timeout)
+            self.__record_timing(
+                "batching_consumer.batch.flush.wait", (time.time() - wait_start) * 1000
+            )
+            if not completed:
+                return False
+
+            self.__pending_flushes.popleft()
+            logger.debug("Committing Kafka offsets for completed flush")
+            self._commit(offsets)
+        return True
+
+    def _wait_for_pending_flushes(self):
+        while not self._commit_completed_flushes(timeout=1.0):
+            pass
+
+    def _commit(self, offsets=None):
         retries = 3
         while True:
             try:
-                offsets = self.consumer.commit(asynchronous=False)
+                if offsets is not None:
+                    offsets = self.consumer.commit(offsets=offsets, asynchronous=False)
+                else:
+                    offsets = self.consumer.commit(asynchronous=False)
                 logger.debug("Committed offsets: %s", offsets)
                 break  # success
             except KafkaException as e:
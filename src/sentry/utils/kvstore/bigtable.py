@@ -170,9 +170,28 @@ class BigtableKVStorage(KVStorage[str, bytes]):
         return value
 
     def set(self, key: str, value: bytes, ttl: Optional[timedelta] = None) -> None:
+        row = self.__build_row(self._get_table(), key, value, ttl)
+
+        status = row.commit()
+        if status.code != 0:
+            raise BigtableError(status.code, status.message)
+
+    def set_many(self, items: Sequence[Tuple[str, bytes]], ttl: Optional[timedelta] = None) -> None:
+        table = self._get_table()
+        rows = [self.__build_row(table, key, value, ttl) for key, value in items]
+
+        errors = []
+        for status in table.mutate_rows(rows):
+            if status.code != 0:
+                errors.append(BigtableError(status.code, status.message))
+
+        if errors:
+            raise BigtableError(errors)
+
+    def __build_row(self, table: Table, key: str, value: bytes, ttl: Optional[timedelta]) -> Any:
         # XXX: There is a type mismatch here -- ``direct_row`` expects
         # ``bytes`` but we are providing it with ``str``.
-        row = self._get_table().direct_row(key)
+        row = table.direct_row(key)
 
         # Call to delete is just a state mutation, and in this case is just
         # used to clear all columns so the entire row will be replaced.
@@ -229,10 +248,7 @@ class BigtableKVStorage(KVStorage[str, bytes]):
         assert len(value) <= self.max_size
 
         row.set_cell(self.column_family, self.data_column, value, timestamp=ts)
-
-        status = row.commit()
-        if status.code != 0:
-            raise BigtableError(status.code, status.message)
+        return row
 
     def delete(self, key: str) -> None:
         # XXX: There is a type mismatch here -- ``direct_row`` expects
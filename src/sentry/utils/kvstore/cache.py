@@ -25,18 +25,41 @@ class CacheKVStorage(KVStorage[Any, Any]):
     # value encoding strategies that are not always compatible (generally
     # pickle and JSON.)
 
-    def __init__(self, backend: BaseCache) -> None:
+    # If ``raw`` is set, values are read and written without being encoded by
+    # the backend. This is only meaningful for the Redis cache backends, which
+    # otherwise encode values as JSON.
+
+    def __init__(self, backend: BaseCache, raw: bool = False) -> None:
         self.backend = backend
+        self.raw = raw
 
     def get(self, key: Any) -> Optional[Any]:
-        return self.backend.get(key)
+        return self.backend.get(key, raw=self.raw)
 
     def set(self, key: Any, value: Any, ttl: Optional[timedelta] = None) -> None:
-        self.backend.set(key, value, timeout=int(ttl.total_seconds()) if ttl is not None else None)
+        self.backend.set(
+            key,
+            value,
+            timeout=int(ttl.total_seconds()) if ttl is not None else None,
+            raw=self.raw,
+        )
+
+    def get_many(self, keys: Sequence[Any]) -> Iterator[Tuple[Any, Any]]:
+        yield from self.backend.get_many(keys, raw=self.raw).items()
+
+    def set_many(self, items: Sequence[Tuple[Any, Any]], ttl: Optional[timedelta] = None) -> None:
+        self.backend.set_many(
+            dict(items),
+            timeout=int(ttl.total_seconds()) if ttl is not None else None,
+            raw=self.raw,
+        )
 
     def delete(self, key: Any) -> None:
         self.backend.delete(key)
 
+    def delete_many(self, keys: Sequence[Any]) -> None:
+        self.backend.delete_many(keys)
+
     def bootstrap(self) -> None:
         # Nothing to do in this method: the backend is expected to either not
         # require any explicit setup action (memcached, Redis) or that setup is
@@ -91,6 +114,11 @@ class CacheKeyWrapper(KVStorage[str, V]):
             ttl,
         )
 
+    def set_many(self, items: Sequence[Tuple[str, V]], ttl: Optional[timedelta] = None) -> None:
+        return self.storage.set_many(
+            [(wrap_key(self.prefix, self.version, key), value) for key, value in items], ttl
+        )
+
     def delete(self, key: str) -> None:
         self.storage.delete(wrap_key(self.prefix, self.version, key))
 
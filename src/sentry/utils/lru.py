@@ -0,0 +1,92 @@
+import threading
+from collections import OrderedDict
+from typing import Callable, Generic, Hashable, Iterable, MutableMapping, Optional, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+__unset__ = object()
+
+
+class LRUCache(Generic[K, V]):
+    """
+    A thread-safe, process-local cache that evicts the least recently used
+    entries once the total weight of all entries exceeds ``max_weight``.
+
+    By default every entry has a weight of one, which bounds the number of
+    entries. A ``weigher`` can be provided to bound the cache by some other
+    measure instead, such as the approximate size of the values in bytes.
+    Entries heavier than ``max_weight`` are never stored.
+    """
+
+    def __init__(self, max_weight: int, weigher: Optional[Callable[[K, V], int]] = None) -> None:
+        self.max_weight = max_weight
+        self.weigher = weigher
+        self.weight = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.__lock = threading.Lock()
+        self.__data: "OrderedDict[K, V]" = OrderedDict()
+        self.__weights: MutableMapping[K, int] = {}
+
+    def __len__(self) -> int:
+        return len(self.__data)
+
+    def __contains__(self, key: K) -> bool:
+        return key in self.__data
+
+    def get(self, key: K, default: Optional[V] = None) -> Optional[V]:
+        with self.__lock:
+            value = self.__data.get(key, __unset__)
+            if value is __unset__:
+                self.misses += 1
+                return default
+            self.hits += 1
+            self.__data.move_to_end(key)
+            return value  # type: ignore
+
+    def get_many(self, keys: Iterable[K]) -> MutableMapping[K, V]:
+        """Returns a mapping of all provided keys that are in the cache."""
+        results = {}
+        with self.__lock:
+            for key in keys:
+                value = self.__data.get(key, __unset__)
+                if value is __unset__:
+                    self.misses += 1
+                    continue
+                self.hits += 1
+                self.__data.move_to_end(key)
+                results[key] = value
+        return results  # type: ignore
+
+    def set(self, key: K, value: V) -> None:
+        weight = self.weigher(key, value) if self.weigher is not None else 1
+        with self.__lock:
+            self.__remove(key)
+            if weight > self.max_weight:
+                return
+            self.__data[key] = value
+            self.__weights[key] = weight
+            self.weight += weight
+            while self.weight > self.max_weight:
+                self.__remove(next(iter(self.__data)))
+                self.evictions += 1
+
+    def set_many(self, values: MutableMapping[K, V]) -> None:
+        for key, value in values.items():
+            self.set(key, value)
+
+    def delete(self, key: K) -> None:
+        with self.__lock:
+            self.__remove(key)
+
+    def clear(self) -> None:
+        with self.__lock:
+            self.__data.clear()
+            self.__weights.clear()
+            self.weight = 0
+
+    def __remove(self, key: K) -> None:
+        if self.__data.pop(key, __unset__) is not __unset__:
+            self.weight -= self.__weights.pop(key)
@@ -92,6 +92,13 @@ def pytest_configure(config):
     settings.SENTRY_TSDB = "sentry.tsdb.inmemory.InMemoryTSDB"
     settings.SENTRY_TSDB_OPTIONS = {}
 
+    # IDs are not stable across tests as the database is rolled back, so
+    # they must not be cached by the indexer service between tests.
+    settings.SENTRY_METRICS_INDEXER_OPTIONS = {"local_cache_size": 0}
+    settings.SENTRY_POST_PROCESS_STAGE_WORKERS = 0
+    settings.SENTRY_POST_PROCESS_STAGE_BUDGETS = {}
+    settings.SYMBOLICATOR_PAYLOAD_CACHE_TTL = 0
+
     settings.SENTRY_NEWSLETTER = "sentry.newsletter.dummy.DummyNewsletter"
     settings.SENTRY_NEWSLETTER_OPTIONS = {}
 
@@ -0,0 +1,195 @@
+"""
+A small executor for a graph of dependent processing stages.
+
+Stages declare which other stages they depend on. Stages whose dependencies
+are satisfied run concurrently on an optional thread pool, or one after
+another in declaration order when no pool is given. A semaphore shared by all
+users of the pool can bound the stages in flight; stages run on the calling
+thread while it is exhausted. Every stage is timed, and stages with a budget
+are deferred through a callback instead of being run once their recent
+durations exceed that budget.
+"""
+
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, wait
+from typing import Any, Callable, Mapping, MutableMapping, Optional, Sequence
+
+from django.db import close_old_connections
+from sentry_sdk import Hub
+
+from sentry.utils import metrics
+
+
+class StageTimings:
+    """
+    Process-local, exponentially weighted moving averages of stage durations.
+
+    Whenever a stage is deferred its average decays as well, so that a stage
+    which was slow for a while is eventually run (and measured) again.
+    """
+
+    def __init__(self, alpha: float = 0.2) -> None:
+        self.alpha = alpha
+        self.__lock = threading.Lock()
+        self.__averages: MutableMapping[str, float] = {}
+
+    def get(self, name: str) -> Optional[float]:
+        return self.__averages.get(name)
+
+    def record(self, name: str, duration: float) -> None:
+        with self.__lock:
+            average = self.__averages.get(name)
+            if average is None:
+                self.__averages[name] = duration
+            else:
+                self.__averages[name] = average + self.alpha * (duration - average)
+
+    def decay(self, name: str) -> None:
+        with self.__lock:
+            if name in self.__averages:
+                self.__averages[name] *= 1 - self.alpha
+
+
+class Stage:
+    __slots__ = ("name", "func", "depends_on", "budget")
+
+    def __init__(
+        self,
+        name: str,
+        func: Callable[[Mapping[str, Any]], Any],
+        depends_on: Sequence[str] = (),
+        budget: Optional[float] = None,
+    ) -> None:
+        self.name = name
+        self.func = func
+        self.depends_on = tuple(depends_on)
+        self.budget = budget
+
+
+class StageGraph:
+    """
+    Runs a set of stages respecting their dependencies.
+
+    Each stage function is called with a mapping of the results of all stages
+    completed so far, which always includes the results of its dependencies.
+    ``run`` returns the results of all stages. Deferred stages have a result
+    of ``None``; because of this, stages with a budget cannot be depended on.
+    If a stage raises, no further stages are started and the exception is
+    re-raised once the stages already running have finished.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        executor=None,
+        timings: Optional[StageTimings] = None,
+        defer: Optional[Callable[[str], None]] = None,
+        slots: Optional[threading.Semaphore] = None,
+    ) -> None:
+        self.name = name
+        self.executor = executor
+        self.timings = timings
+        self.defer = defer
+        self.slots = slots
+        self.stages: MutableMapping[str, Stage] = {}
+
+    def add(
+        self,
+        name: str,
+        func: Callable[[Mapping[str, Any]], Any],
+        depends_on: Sequence[str] = (),
+        budget: Optional[float] = None,
+    ) -> None:
+        if name in self.stages:
+            raise ValueError(f"Duplicate stage: {name!r}")
+        for dependency in depends_on:
+            if dependency not in self.stages:
+                raise ValueError(f"Unknown dependency of stage {name!r}: {dependency!r}")
+            if self.stages[dependency].budget is not None:
+                raise ValueError(f"Stage {name!r} cannot depend on deferrable {dependency!r}")
+        self.stages[name] = Stage(name, func, depends_on, budget)
+
+    def should_defer(self, stage: Stage) -> bool:
+        if stage.budget is None or self.timings is None or self.defer is None:
+            return False
+        average = self.timings.get(stage.name)
+        return average is not None and average > stage.budget
+
+    def run_stage(self, stage: Stage, results: Mapping[str, Any], hub: Optional[Hub] = None) -> Any:
+        with Hub(hub or Hub.current):
+            start = time.time()
+            try:
+                return stage.func(results)
+            finally:
+                duration = time.time() - start
+                if self.timings is not None:
+                    self.timings.record(stage.name, duration)
+                metrics.timing(f"{self.name}.stage.duration", duration, tags={"stage": stage.name})
+
+    def run_stage_in_pool(self, stage: Stage, results: Mapping[str, Any], hub: Hub) -> Any:
+        # Connections of the pool's threads outlive the task the stage runs
+        # for, so they are cleaned up like those of a request or task.
+        close_old_connections()
+        try:
+            return self.run_stage(stage, results, hub)
+        finally:
+            close_old_connections()
+
+    def run(self) -> Mapping[str, Any]:
+        results: MutableMapping[str, Any] = {}
+        pending = list(self.stages.values())
+        running = {}
+        error = None
+
+        while True:
+            ready = None
+            if error is None:
+                ready = next((s for s in pending if all(d in results for d in s.depends_on)), None)
+
+            if ready is not None:
+                pending.remove(ready)
+                if self.should_defer(ready):
+                    metrics.incr(f"{self.name}.stage.deferred", tags={"stage": ready.name})
+                    self.timings.decay(ready.name)
+                    self.defer(ready.name)
+                    results[ready.name] = None
+                elif self.executor is None:
+                    results[ready.name] = self.run_stage(ready, results)
+                elif self.slots is not None and not self.slots.acquire(blocking=False):
+                    # The pool is saturated, rather than queueing behind
+                    # other users of it run the stage on this thread.
+                    metrics.incr(f"{self.name}.stage.inline", tags={"stage": ready.name})
+                    try:
+                        results[ready.name] = self.run_stage(ready, results)
+                    except Exception as e:
+                        error = e
+                else:
+                    try:
+                        future = self.executor.submit(
+                            self.run_stage_in_pool, ready, dict(results), Hub(Hub.current)
+                        )
+                    except Exception:
+                        if self.slots is not None:
+                            self.slots.release()
+                        raise
+                    if self.slots is not None:
+                        future.add_done_callback(lambda future: self.slots.release())
+                    running[future] = ready
+                continue
+
+            if not running:
+                break
+
+            done, _ = wait(list(running), return_when=FIRST_COMPLETED)
+            for future in done:
+                stage = running.pop(future)
+                try:
+                    results[stage.name] = future.result()
+                except Exception as e:
+                    if error is None:
+                        error = e
+
+        if error is not None:
+            raise error
+        return results
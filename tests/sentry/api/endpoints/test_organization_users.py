@@ -1,3 +1,5 @@
+from rest_framework.renderers import JSONRenderer
+
 from sentry.api.serializers import OrganizationMemberWithProjectsSerializer, serialize
 from sentry.testutils import APITestCase
 
@@ -44,3 +46,19 @@ class OrganizationMemberListTest(APITestCase):
             OrganizationMemberWithProjectsSerializer(project_ids=projects_ids),
         )
         assert response.data == expected
+
+    def test_streaming(self):
+        projects_ids = [self.project_1.id, self.project_2.id]
+        with self.options({"api.stream-responses": ["OrganizationUsersEndpoint"]}):
+            response = self.get_valid_response(self.org.slug, project=projects_ids)
+        assert response.streaming
+        expected = serialize(
+            list(
+                self.org.member_set.filter(user__in=[self.owner_user, self.user_2]).order_by(
+                    "user__email"
+                )
+            ),
+            self.user_2,
+            OrganizationMemberWithProjectsSerializer(project_ids=projects_ids),
+        )
+        assert b"".join(response.streaming_content) == JSONRenderer().render(expected)
@@ -1,4 +1,4 @@
-from sentry.api.serializers import Serializer, serialize
+from sentry.api.serializers import Serializer, serialize, serialize_iter
 from sentry.testutils import TestCase
 
 
@@ -16,6 +16,14 @@ class VariadicSerializer(Serializer):
         return {"kw": kw}
 
 
+class ChunkSerializer(Serializer):
+    def get_attrs(self, item_list, user, **kwargs):
+        return {item: len(item_list) for item in item_list}
+
+    def serialize(self, obj, attrs, user, **kwargs):
+        return {"obj": obj, "chunk_size": attrs}
+
+
 class BaseSerializerTest(TestCase):
     def test_serialize(self):
         assert serialize([]) == []
@@ -53,3 +61,15 @@ class BaseSerializerTest(TestCase):
         user = self.create_user()
         result = serialize(foo, user, VariadicSerializer(), kw="keyword")
         assert result["kw"] == "keyword"
+
+    def test_serialize_iter(self):
+        result = serialize_iter(range(5), serializer=ChunkSerializer(), chunk_size=2)
+        assert not isinstance(result, list)
+        assert list(result) == [
+            {"obj": 0, "chunk_size": 2},
+            {"obj": 1, "chunk_size": 2},
+            {"obj": 2, "chunk_size": 2},
+            {"obj": 3, "chunk_size": 2},
+            {"obj": 4, "chunk_size": 1},
+        ]
+        assert list(serialize_iter([], serializer=ChunkSerializer())) == []
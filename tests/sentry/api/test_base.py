@@ -1,9 +1,11 @@
 import base64
+from datetime import datetime
 
 from django.http import HttpRequest
+from rest_framework.renderers import JSONRenderer
 from rest_framework.response import Response
 
-from sentry.api.base import Endpoint
+from sentry.api.base import Endpoint, stream_json_list
 from sentry.api.paginator import GenericOffsetPaginator
 from sentry.models import ApiKey
 from sentry.testutils import APITestCase
@@ -149,3 +151,16 @@ class EndpointJSONBodyTest(APITestCase):
         Endpoint().load_json_body(self.request)
 
         assert not self.request.json_body
+
+
+def test_stream_json_list():
+    items = [
+        {"id": str(i), "date": datetime(2021, 10, 10, 10, 15), "name": "\u00e9"} for i in range(10)
+    ]
+    expected = JSONRenderer().render(items)
+
+    chunks = list(stream_json_list(iter(items), "test", buffer_size=50))
+    assert len(chunks) > 1
+    assert b"".join(chunks) == expected
+
+    assert b"".join(stream_json_list(iter([]), "test")) == JSONRenderer().render([])
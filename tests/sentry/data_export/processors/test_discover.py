@@ -71,3 +71,16 @@ class DiscoverProcessorTestWithSnql(DiscoverProcessorTest):
             "query": "",
             "use_snql": True,
         }
+
+    def test_get_keyset_orderby(self):
+        assert DiscoverProcessor.get_keyset_orderby(["title"], [], None) == [
+            "-timestamp",
+            "-id",
+        ]
+        assert DiscoverProcessor.get_keyset_orderby(["title"], [], ["timestamp"]) == [
+            "timestamp",
+            "id",
+        ]
+        assert DiscoverProcessor.get_keyset_orderby(["title"], [], "title") is None
+        assert DiscoverProcessor.get_keyset_orderby(["count(id)"], [], None) is None
+        assert DiscoverProcessor.get_keyset_orderby(["title"], ["count(id) / 2"], None) is None
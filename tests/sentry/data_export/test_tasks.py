@@ -1,12 +1,13 @@
 from unittest.mock import patch
 
+from django.core.files.base import ContentFile
 from django.db import IntegrityError
 
-from sentry.data_export.base import ExportQueryType
-from sentry.data_export.models import ExportedData
+from sentry.data_export.base import FRAGMENT_OFFSET_STRIDE, ExportQueryType
+from sentry.data_export.models import ExportedData, ExportedDataBlob
 from sentry.data_export.tasks import assemble_download, merge_export_blobs
 from sentry.exceptions import InvalidSearchQuery
-from sentry.models import File
+from sentry.models import File, FileBlob
 from sentry.search.events.constants import TIMEOUT_ERROR_MESSAGE
 from sentry.testutils import SnubaTestCase, TestCase
 from sentry.testutils.helpers.datetime import before_now, iso_format
@@ -598,6 +599,29 @@ class AssembleDownloadTest(TestCase, SnubaTestCase):
 
         assert emailer.called
 
+    @patch("sentry.data_export.models.ExportedData.email_success")
+    def test_discover_keyset(self, emailer):
+        de = ExportedData.objects.create(
+            user=self.user,
+            organization=self.org,
+            query_type=ExportQueryType.DISCOVER,
+            query_info={
+                "project": [self.project.id],
+                "field": ["environment"],
+                "query": "",
+            },
+        )
+        with self.options({"data-export.keyset-fragments": 3}), self.tasks():
+            assemble_download(de.id, batch_size=1)
+        de = ExportedData.objects.get(id=de.id)
+        assert de._get_file().checksum is None
+        # Convert raw csv to list of line-strings
+        header, *rows = de._get_file().getfile().read().strip().split(b"\r\n")
+        assert header == b"environment"
+        assert sorted(rows) == [b"dev", b"prod", b"prod"]
+
+        assert emailer.called
+
 
 class AssembleDownloadLargeTest(TestCase, SnubaTestCase):
     def setUp(self):
@@ -647,3 +671,26 @@ class AssembleDownloadLargeTest(TestCase, SnubaTestCase):
 class MergeExportBlobsTest(TestCase, SnubaTestCase):
     def test_task_persistent_name(self):
         assert merge_export_blobs.name == "sentry.data_export.tasks.merge_blobs"
+
+    @patch("sentry.data_export.models.ExportedData.email_success")
+    @patch("sentry.data_export.tasks.MAX_FILE_SIZE", 9)
+    def test_leaves_out_fragments_past_size_limit(self, emailer):
+        de = ExportedData.objects.create(
+            user=self.user,
+            organization=self.organization,
+            query_type=ExportQueryType.DISCOVER,
+            query_info={"project": [self.project.id], "field": ["title"], "query": ""},
+        )
+        for fragment, contents in enumerate([b"a\r\n", b"b\r\nc\r\n", b"d\r\n"]):
+            blob = FileBlob.from_file(ContentFile(contents))
+            ExportedDataBlob.objects.create(
+                data_export=de, blob_id=blob.id, offset=FRAGMENT_OFFSET_STRIDE * fragment
+            )
+
+        with self.tasks():
+            merge_export_blobs(de.id, verify_checksums=False)
+
+        de = ExportedData.objects.get(id=de.id)
+        # The last fragment would exceed the limit, the file ends after a whole row.
+        assert de._get_file().getfile().read() == b"a\r\nb\r\nc\r\n"
+        assert emailer.called
@@ -0,0 +1,120 @@
+import threading
+import time
+from unittest.mock import patch
+
+import pytest
+
+from sentry.db.models.manager import make_key
+from sentry.db.models.manager.base import _SingleFlight
+from sentry.models import Organization, ProjectKey
+from sentry.testutils import TestCase
+from sentry.utils.cache import cache
+
+
+class GetFromCacheTest(TestCase):
+    def test_secondary_key_lookup_is_a_single_cache_read(self):
+        key = ProjectKey.objects.create(project=self.project)
+        ProjectKey.objects.get_from_cache(public_key=key.public_key)
+
+        with patch.object(cache, "get", wraps=cache.get) as cache_get:
+            result = ProjectKey.objects.get_from_cache(public_key=key.public_key)
+
+        assert result == key
+        assert cache_get.call_count == 1
+
+    def test_secondary_key_lookup_by_reference(self):
+        org = self.create_organization(slug="cached-org")
+        Organization.objects.get_from_cache(slug="cached-org")
+
+        with patch.object(cache, "get", wraps=cache.get) as cache_get:
+            result = Organization.objects.get_from_cache(slug="cached-org")
+
+        assert result == org
+        assert cache_get.call_count == 2
+
+    def test_secondary_instances_are_updated(self):
+        key = ProjectKey.objects.create(project=self.project, label="old")
+        ProjectKey.objects.get_from_cache(public_key=key.public_key)
+
+        key.label = "new"
+        key.save()
+        assert ProjectKey.objects.get_from_cache(public_key=key.public_key).label == "new"
+
+        ProjectKey.objects.filter(id=key.id).update(label="newer")
+        ProjectKey.objects.uncache_object(key.id)
+        assert ProjectKey.objects.get_from_cache(public_key=key.public_key).label == "newer"
+
+        key.delete()
+        with pytest.raises(ProjectKey.DoesNotExist):
+            ProjectKey.objects.get_from_cache(public_key=key.public_key)
+
+    def test_uncache_secondary_instances_without_primary_entry(self):
+        key = ProjectKey.objects.create(project=self.project, label="old")
+        ProjectKey.objects.get_from_cache(public_key=key.public_key)
+        cache.delete(
+            make_key(ProjectKey, "modelcache", {"id": key.id}),
+            version=ProjectKey.objects.cache_version,
+        )
+
+        ProjectKey.objects.filter(id=key.id).update(label="new")
+        ProjectKey.objects.uncache_object(key.id)
+        assert ProjectKey.objects.get_from_cache(public_key=key.public_key).label == "new"
+
+    def test_get_many_from_cache_secondary_instances(self):
+        keys = [ProjectKey.objects.create(project=self.project) for _ in range(3)]
+        public_keys = [key.public_key for key in keys]
+        ProjectKey.objects.get_many_from_cache(public_keys, key="public_key")
+
+        with patch.object(cache, "get_many", wraps=cache.get_many) as cache_get_many:
+            results = ProjectKey.objects.get_many_from_cache(public_keys, key="public_key")
+
+        assert {result.id for result in results} == {key.id for key in keys}
+        assert cache_get_many.call_count == 1
+
+
+class SingleFlightTest(TestCase):
+    def test_concurrent_calls_run_once(self):
+        single_flight = _SingleFlight()
+        started = threading.Event()
+        release = threading.Event()
+        calls = []
+        results = []
+
+        def func():
+            calls.append(1)
+            started.set()
+            release.wait()
+            return "result"
+
+        def leader():
+            results.append(single_flight.do("key", func))
+
+        def waiter():
+            results.append(single_flight.do("key", func))
+
+        threads = [threading.Thread(target=leader)]
+        threads[0].start()
+        started.wait()
+        threads.extend(threading.Thread(target=waiter) for _ in range(3))
+        for thread in threads[1:]:
+            thread.start()
+        while single_flight._calls["key"].waiters < 3:
+            time.sleep(0.001)
+        release.set()
+        for thread in threads:
+            thread.join()
+
+        assert len(calls) == 1
+        assert sorted(results, key=lambda r: r[1]) == [(None, False)] * 3 + [("result", True)]
+
+        # once completed, the next call runs the function again
+        assert single_flight.do("key", lambda: "again") == ("again", True)
+
+    def test_errors_are_raised_in_all_callers(self):
+        single_flight = _SingleFlight()
+
+        def func():
+            raise ValueError("failed")
+
+        with pytest.raises(ValueError):
+            single_flight.do("key", func)
@@ -0,0 +1,53 @@
+import logging
+import uuid
+from time import time
+
+import pytest
+
+from sentry.event_manager import EventManager, save_error_events
+from sentry.testutils.skips import requires_pytest_benchmark
+
+EVENT_COUNT = 100
+
+
+def make_jobs(project):
+    jobs = []
+    for i in range(EVENT_COUNT):
+        manager = EventManager(
+            {
+                "event_id": uuid.uuid4().hex,
+                "level": logging.ERROR,
+                "logger": "default",
+                "message": "benchmark",
+                "release": "1.0",
+                "fingerprint": [str(i % 10)],
+            }
+        )
+        manager.normalize()
+        jobs.append(
+            {
+                "data": manager.get_data(),
+                "project_id": project.id,
+                "raw": False,
+                "start_time": time(),
+                "cache_key": None,
+            }
+        )
+    return jobs
+
+
+def save_in_batches(project, jobs, batch_size):
+    for i in range(0, len(jobs), batch_size):
+        save_error_events(jobs[i : i + batch_size], {project.id: project})
+
+
+# `EventManager.save` saves events as batches of one, so this compares batch
+# sizes rather than the batched path with the per-event path that preceded it.
+@pytest.mark.django_db
+@requires_pytest_benchmark
+@pytest.mark.parametrize("batch_size", [1, 20], ids=lambda x: f"batch_size_{x}")
+def test_benchmark_save_error_events(default_project, batch_size, benchmark):
+    def setup():
+        return (default_project, make_jobs(default_project), batch_size), {}
+
+    benchmark.pedantic(save_in_batches, setup=setup, rounds=3)
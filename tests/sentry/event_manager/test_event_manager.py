@@ -16,8 +16,9 @@ from sentry.event_manager import (
     EventUser,
     HashDiscarded,
     has_pending_commit_resolution,
+    save_error_events,
 )
-from sentry.eventstore.models import Event
+from sentry.eventstore.models import CalculatedHashes, Event
 from sentry.grouping.utils import hash_from_values
 from sentry.ingest.inbound_filters import FilterStatKeys
 from sentry.models import (
@@ -1990,3 +1991,80 @@ class ReleaseIssueTest(TestCase):
             last_seen=self.timestamp + 100,
             first_seen=self.timestamp + 100,
         )
+
+
+class SaveErrorEventsTest(TestCase):
+    def make_job(self, **kwargs):
+        manager = EventManager(make_event(**kwargs))
+        manager.normalize()
+        return {
+            "data": manager.get_data(),
+            "project_id": self.project.id,
+            "raw": False,
+            "start_time": time(),
+            "cache_key": None,
+        }
+
+    def test_batch(self):
+        jobs = [
+            self.make_job(checksum="a" * 32, release="1.0", environment="prod"),
+            self.make_job(checksum="a" * 32, release="1.0", environment="prod"),
+            self.make_job(checksum="b" * 32, release="1.0", environment="prod"),
+        ]
+
+        saved_jobs = save_error_events(jobs, {self.project.id: self.project})
+
+        assert saved_jobs == jobs
+        event1, event2, event3 = (job["event"] for job in jobs)
+        assert event1.group_id == event2.group_id
+        assert event1.group_id != event3.group_id
+        assert [job["is_new"] for job in jobs] == [True, False, True]
+        assert [job["is_new_group_environment"] for job in jobs] == [True, False, True]
+        assert jobs[0]["grouprelease"] == jobs[1]["grouprelease"]
+        assert GroupRelease.objects.filter(release_id=jobs[0]["release"].id).count() == 2
+        assert GroupEnvironment.objects.filter(group_id=event1.group_id).count() == 1
+
+        for job in jobs:
+            assert nodestore.get(job["event"].data.id)
+
+    @mock.patch("sentry.event_manager._calculate_event_grouping")
+    def test_batch_overlapping_hashes(self, mock_calculate_event_grouping):
+        # The second event shares a hash with each of the others.
+        batch_hashes = iter([["a" * 32], ["a" * 32, "b" * 32], ["b" * 32]])
+
+        def calculate_event_grouping(project, event, grouping_config):
+            hashes = CalculatedHashes(
+                hashes=next(batch_hashes), hierarchical_hashes=[], tree_labels=[]
+            )
+            hashes.write_to_event(event.data)
+            return hashes
+
+        mock_calculate_event_grouping.side_effect = calculate_event_grouping
+        jobs = [self.make_job(), self.make_job(), self.make_job()]
+
+        saved_jobs = save_error_events(jobs, {self.project.id: self.project})
+
+        assert saved_jobs == jobs
+        group_id = jobs[0]["event"].group_id
+        assert [job["event"].group_id for job in jobs] == [group_id] * 3
+        assert [job["is_new"] for job in jobs] == [True, False, False]
+        assert jobs[2]["grouphashes"]["b" * 32].group_id == group_id
+        assert GroupHash.objects.get(project=self.project, hash="b" * 32).group_id == group_id
+
+    def test_discarded(self):
+        manager = EventManager(make_event(checksum="a" * 32))
+        manager.normalize()
+        event = manager.save(self.project.id)
+        tombstone = GroupTombstone.objects.create(
+            project_id=self.project.id, previous_group_id=event.group_id
+        )
+        GroupHash.objects.filter(group_id=event.group_id).update(
+            group=None, group_tombstone_id=tombstone.id
+        )
+
+        jobs = [self.make_job(checksum="a" * 32), self.make_job(checksum="b" * 32)]
+        saved_jobs = save_error_events(jobs, {self.project.id: self.project})
+
+        assert saved_jobs == jobs[1:]
+        assert isinstance(jobs[0]["discarded"], HashDiscarded)
+        assert jobs[1]["event"].group_id is not None
@@ -0,0 +1,59 @@
+from sentry.eventstore.processing.base import EventProcessingStore
+from sentry.utils import json
+from sentry.utils.codecs import BytesCodec, JSONCodec
+from sentry.utils.kvstore.encoding import KVStorageCodecWrapper
+from sentry.utils.kvstore.memory import MemoryKVStorage
+
+EVENT = {"event_id": "a" * 32, "project": 1, "message": "hello world"}
+
+
+def test_store_raw() -> None:
+    storage = MemoryKVStorage()
+    store = EventProcessingStore(
+        KVStorageCodecWrapper(storage, JSONCodec() | BytesCodec()), raw=storage
+    )
+
+    payload = json.dumps(EVENT)
+    key = store.store_raw(EVENT, payload)
+
+    assert storage.get(key) == payload.encode("utf-8")
+    assert store.get(key) == EVENT
+    assert store.store(EVENT) == key
+
+
+def test_store_raw_unsupported() -> None:
+    store = EventProcessingStore(MemoryKVStorage())
+
+    key = store.store_raw(EVENT, json.dumps({"unrelated": True}))
+    assert store.get(key) == EVENT
+
+
+def test_multiple_events() -> None:
+    store = EventProcessingStore(MemoryKVStorage())
+    events = [{"event_id": "%032x" % i, "project": 1} for i in range(3)]
+
+    keys = store.store_many(events)
+    assert keys == [store.store(event) for event in events]
+    assert store.get_many([*keys, "missing"]) == dict(zip(keys, events))
+
+    unprocessed_keys = store.store_many(events[:1], unprocessed=True)
+    assert unprocessed_keys == [f"{keys[0]}:u"]
+    assert store.get_many(keys, unprocessed=True) == {keys[0]: events[0]}
+
+    store.delete_many(events[:2])
+    assert store.get_many(keys) == {keys[2]: events[2]}
+    assert store.get_many(keys, unprocessed=True) == {}
+
+    store.delete_many_by_key(keys[2:])
+    assert store.get_many(keys) == {}
+
+
+def test_store_raw_many() -> None:
+    storage = MemoryKVStorage()
+    store = EventProcessingStore(
+        KVStorageCodecWrapper(storage, JSONCodec() | BytesCodec()), raw=storage
+    )
+    events = [{"event_id": "%032x" % i, "project": 1} for i in range(3)]
+
+    keys = store.store_raw_many([(event, json.dumps(event)) for event in events])
+    assert store.get_many(keys) == dict(zip(keys, events))
@@ -1,3 +1,4 @@
+import copy
 import pickle
 
 import pytest
@@ -243,6 +244,54 @@ class EventTest(TestCase):
         assert not event_from_nodestore.group_id
         assert not event_from_nodestore.group
 
+    def test_copy_for_grouping(self):
+        event_data = {
+            "exception": {
+                "values": [
+                    {
+                        "type": "Hello",
+                        "stacktrace": {
+                            "frames": [
+                                {"function": "foo", "vars": {"x": "y"}},
+                                {"function": "bar"},
+                            ]
+                        },
+                    }
+                ]
+            },
+            "breadcrumbs": {"values": [{"message": "crumb"}]},
+        }
+
+        enhancement = Enhancements.from_config_string(
+            """
+            function:foo category=foo_like +app
+            """,
+        )
+        grouping_config = {
+            "enhancements": enhancement.dumps(),
+            "id": "mobile:2021-02-12",
+        }
+
+        event = Event(event_id="a" * 32, data=event_data, project_id=self.project.id)
+        original = copy.deepcopy(dict(event.data.items()))
+        copied = event.copy_for_grouping()
+        copied.get_grouping_variants(grouping_config, normalize_stacktraces=True)
+        copied.data["fingerprint"] = ["foo"]
+
+        assert dict(event.data.items()) == original
+        assert "fingerprint" not in event.data
+        frame = event.data["exception"]["values"][0]["stacktrace"]["frames"][0]
+        assert "data" not in frame
+        assert frame.get("in_app") is None
+
+        copied_frame = copied.data["exception"]["values"][0]["stacktrace"]["frames"][0]
+        assert copied_frame["in_app"] is True
+        assert copied_frame["data"]["category"] == "foo_like"
+
+        # Data not touched by grouping is shared with the original event.
+        assert copied_frame["vars"] is frame["vars"]
+        assert copied.data["breadcrumbs"] is event.data["breadcrumbs"]
+
     def test_grouping_reset(self):
         """
         Regression test against a specific mutability bug involving grouping,
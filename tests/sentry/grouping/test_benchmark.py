@@ -1,22 +1,23 @@
+import tracemalloc
+
 import pytest
 
+from sentry import eventstore
+from sentry.event_manager import EventManager
 from sentry.grouping.api import get_default_grouping_config_dict
+from sentry.grouping.strategies import newstyle
 from sentry.grouping.strategies.configurations import CONFIGURATIONS
+from sentry.testutils.skips import requires_pytest_benchmark
 from tests.sentry.grouping import grouping_input as grouping_inputs
 
 CONFIGS = {key: get_default_grouping_config_dict(key) for key in sorted(CONFIGURATIONS.keys())}
 
-
-def benchmark_available():
-    try:
-        import pytest_benchmark  # NOQA
-    except ModuleNotFoundError:
-        return False
-    else:
-        return True
+# Number of frames in the stacktrace of each thread of the large native event
+LARGE_EVENT_FRAME_COUNT = 500
+LARGE_EVENT_THREAD_COUNT = 20
 
 
-@pytest.mark.skipif(not benchmark_available(), reason="requires pytest-benchmark")
+@requires_pytest_benchmark
 @pytest.mark.parametrize(
     "config_name", sorted(CONFIGURATIONS.keys()), ids=lambda x: x.replace("-", "_")
 )
@@ -37,3 +38,58 @@ def run_configuration(grouping_input, config):
     event.project = None
 
     event.get_hashes()
+
+
+def create_large_native_event(config):
+    frames = [
+        {
+            "function": f"namespace::Class::method_{i}(int, char const*)",
+            "package": f"/usr/lib/libexample{i % 7}.so",
+            "instruction_addr": hex(0x1000 + i * 16),
+            "in_app": i % 3 == 0,
+        }
+        for i in range(LARGE_EVENT_FRAME_COUNT)
+    ]
+    data = {
+        "platform": "native",
+        "exception": {
+            "values": [{"type": "EXC_BAD_ACCESS", "stacktrace": {"frames": frames}}],
+        },
+        "threads": {
+            "values": [
+                {"id": i, "crashed": i == 0, "stacktrace": {"frames": frames}}
+                for i in range(LARGE_EVENT_THREAD_COUNT)
+            ]
+        },
+    }
+    mgr = EventManager(data=data, grouping_config=config)
+    mgr.normalize()
+    event = eventstore.create_event(data=mgr.get_data())
+    event.project = None
+    return event
+
+
+def group_with_tracemalloc(event, config, extra_info):
+    newstyle._get_frame_component_cache().clear()
+    tracemalloc.start()
+    try:
+        variants = event.get_grouping_variants(config)
+        snapshot = tracemalloc.take_snapshot()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    extra_info["peak_memory"] = max(extra_info.get("peak_memory", 0), peak)
+    extra_info["allocated_blocks"] = sum(stat.count for stat in snapshot.statistics("filename"))
+    return variants
+
+
+@requires_pytest_benchmark
+@pytest.mark.parametrize(
+    "config_name", sorted(CONFIGURATIONS.keys()), ids=lambda x: x.replace("-", "_")
+)
+def test_benchmark_grouping_large_event_memory(config_name, benchmark):
+    config = CONFIGS[config_name]
+    event = create_large_native_event(config)
+
+    benchmark.pedantic(group_with_tracemalloc, args=(event, config, benchmark.extra_info), rounds=3)
@@ -0,0 +1,40 @@
+from sentry.grouping.component import GroupingComponent
+from sentry.grouping.utils import hash_from_values
+
+
+def test_hash_is_updated_with_children():
+    function = GroupingComponent(id="function", values=["foo"])
+    module = GroupingComponent(id="module", values=["bar"])
+    frame = GroupingComponent(id="frame", values=[function, module])
+    stacktrace = GroupingComponent(id="stacktrace", values=[frame])
+
+    assert list(stacktrace.iter_values()) == ["foo", "bar"]
+    assert stacktrace.get_hash() == hash_from_values(["foo", "bar"])
+
+    # Components are modified after their parents have been hashed, e.g.
+    # when enhancements are applied.
+    module.update(contributes=False)
+    assert list(stacktrace.iter_values()) == ["foo"]
+    assert stacktrace.get_hash() == hash_from_values(["foo"])
+
+    frame.update(contributes=False)
+    assert list(stacktrace.iter_values()) == []
+    assert frame.get_hash() is None
+
+
+def test_copies_do_not_share_state():
+    function = GroupingComponent(id="function", values=["foo"])
+    frame = GroupingComponent(id="frame", values=[function], tree_label={"function": "foo"})
+
+    copied = frame.deep_copy()
+    copied.values[0].update(contributes=False)
+    copied.tree_label["function"] = "bar"
+
+    assert frame.get_hash() == hash_from_values(["foo"])
+    assert frame.tree_label == {"function": "foo"}
+    assert copied.get_hash() == hash_from_values([])
+
+    shallow = frame.shallow_copy()
+    shallow.update(contributes=False)
+    assert frame.contributes
+    assert shallow.values[0] is function
@@ -3,6 +3,7 @@ import pytest
 from sentry.eventtypes.base import format_title_from_tree_label
 from sentry.grouping.api import detect_synthetic_exception, get_default_grouping_config_dict
 from sentry.grouping.component import GroupingComponent
+from sentry.grouping.strategies import newstyle
 from sentry.grouping.strategies.configurations import CONFIGURATIONS
 from sentry.utils import json
 from tests.sentry.grouping import with_grouping_input
@@ -76,3 +77,25 @@ def test_event_hash_variant(config_name, grouping_input, insta_snapshot, log):
     assert evt.get_grouping_config() == grouping_config
 
     insta_snapshot(output)
+
+
+@with_grouping_input("grouping_input")
+@pytest.mark.parametrize("config_name", CONFIGURATIONS.keys(), ids=lambda x: x.replace("-", "_"))
+def test_frame_component_cache(config_name, grouping_input):
+    grouping_config = get_default_grouping_config_dict(config_name)
+
+    def get_variants():
+        evt = grouping_input.create_event(grouping_config)
+        evt.project = None
+        detect_synthetic_exception(evt.data, grouping_config)
+        rv = []
+        for (key, value) in sorted(evt.get_grouping_variants().items()):
+            rv.append("%s:" % key)
+            dump_variant(value, rv, 1)
+        return rv
+
+    newstyle._get_frame_component_cache().clear()
+    uncached = get_variants()
+    # Frames of the second event are all served from the cache, and must not
+    # be affected by modifications of the components of the first event.
+    assert get_variants() == uncached
@@ -0,0 +1,77 @@
+import tracemalloc
+
+import pytest
+
+from sentry.ingest.lazy_event import LazyEvent
+from sentry.testutils.skips import requires_pytest_benchmark
+from sentry.utils import json
+from sentry.utils.cache import cache_key_for_event
+
+# Number of spans of the transaction routed by the benchmark
+SPAN_COUNT = 1000
+
+
+def make_payload():
+    return json.dumps(
+        {
+            "event_id": "a" * 32,
+            "project": 42,
+            "type": "transaction",
+            "transaction": "/api/0/organizations/",
+            "contexts": {"trace": {"trace_id": "b" * 32, "span_id": "c" * 16, "op": "http"}},
+            "spans": [
+                {
+                    "span_id": f"{i:016x}",
+                    "parent_span_id": "c" * 16,
+                    "trace_id": "b" * 32,
+                    "op": "db",
+                    "description": f"SELECT * FROM sentry_project WHERE id = {i}",
+                    "start_timestamp": 1000.0 + i,
+                    "timestamp": 1000.5 + i,
+                }
+                for i in range(SPAN_COUNT)
+            ],
+        }
+    ).encode("utf-8")
+
+
+def route_decoded(payload):
+    data = json.loads(payload)
+    return data.get("type"), cache_key_for_event(data)
+
+
+def route_lazy(payload):
+    data = LazyEvent(payload)
+    return data.get("type"), cache_key_for_event(data)
+
+
+def route_with_tracemalloc(route, payload, extra_info):
+    tracemalloc.start()
+    try:
+        result = route(payload)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    extra_info["peak_memory"] = max(extra_info.get("peak_memory", 0), peak)
+    return result
+
+
+@requires_pytest_benchmark
+@pytest.mark.parametrize("route", [route_decoded, route_lazy], ids=["decoded", "lazy"])
+def test_benchmark_route_event(route, benchmark):
+    payload = make_payload()
+
+    result = benchmark(route, payload)
+
+    assert result == ("transaction", f"e:{'a' * 32}:42")
+
+
+@requires_pytest_benchmark
+@pytest.mark.parametrize("route", [route_decoded, route_lazy], ids=["decoded", "lazy"])
+def test_benchmark_route_event_memory(route, benchmark):
+    payload = make_payload()
+
+    benchmark.pedantic(
+        route_with_tracemalloc, args=(route, payload, benchmark.extra_info), rounds=10
+    )
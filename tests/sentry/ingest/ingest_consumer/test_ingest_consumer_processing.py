@@ -1,14 +1,17 @@
 import datetime
 import time
 import uuid
+from concurrent.futures import ThreadPoolExecutor
 from unittest.mock import Mock
 
 import pytest
 
 from sentry.event_manager import EventManager
+from sentry.eventstore.processing import event_processing_store
 from sentry.ingest.ingest_consumer import (
     process_attachment_chunk,
     process_event,
+    process_event_batch,
     process_individual_attachment,
     process_userreport,
 )
@@ -69,6 +72,38 @@ def test_deduplication_works(default_project, task_runner, preprocess_event):
     }
 
 
+@pytest.mark.django_db
+@pytest.mark.parametrize("executor", [None, ThreadPoolExecutor(max_workers=2)])
+def test_event_batch(default_project, task_runner, preprocess_event, monkeypatch, executor):
+    monkeypatch.setattr("sentry.ingest.ingest_consumer.STORE_BATCH_SIZE", 2)
+    payloads = [
+        get_normalized_event({"message": f"hello world {i}"}, default_project) for i in range(3)
+    ]
+    start_time = time.time() - 3600
+
+    messages = [
+        {
+            "payload": json.dumps(payload),
+            "start_time": start_time,
+            "event_id": payload["event_id"],
+            "project_id": default_project.id,
+            "remote_addr": "127.0.0.1",
+        }
+        for payload in payloads
+    ]
+
+    # The duplicated event is only processed once.
+    process_event_batch(
+        messages + messages[:1],
+        projects={default_project.id: default_project},
+        executor=executor,
+    )
+
+    assert [kwargs["data"] for kwargs in preprocess_event] == payloads
+    for kwargs in preprocess_event:
+        assert event_processing_store.get(kwargs["cache_key"]) == kwargs["data"]
+
+
 @pytest.mark.django_db
 def test_transactions_spawn_save_event_transaction(
     default_project,
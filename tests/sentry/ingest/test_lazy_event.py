@@ -0,0 +1,52 @@
+import pytest
+
+from sentry.ingest.lazy_event import LazyEvent
+from sentry.utils import json
+
+PAYLOAD = {
+    "event_id": "a" * 32,
+    "project": 42,
+    "type": "transaction",
+    "message": 'he said "type": "error"',
+    "contexts": {"trace": {"type": "trace", "op": "http"}},
+    "spans": [{"type": "span"}],
+    "sampled": True,
+    "level": None,
+}
+
+
+@pytest.mark.parametrize("encode", [False, True], ids=["str", "bytes"])
+def test_top_level_scalars_without_decoding(encode):
+    payload = json.dumps(PAYLOAD)
+    event = LazyEvent(payload.encode("utf-8") if encode else payload)
+
+    assert event["type"] == "transaction"
+    assert event["project"] == 42
+    assert event["event_id"] == "a" * 32
+    assert event.get("sampled") is True
+    assert event.get("level", "error") is None
+    assert not event.is_decoded
+
+
+def test_decodes_for_other_attributes():
+    event = LazyEvent(json.dumps(PAYLOAD))
+
+    assert event["contexts"] == PAYLOAD["contexts"]
+    assert event.is_decoded
+    assert dict(event) == PAYLOAD
+
+
+def test_missing_attributes():
+    event = LazyEvent(json.dumps({"contexts": {"type": "trace"}}))
+
+    assert event.get("type") is None
+    assert "type" not in event
+    with pytest.raises(KeyError):
+        event["type"]
+
+
+def test_escaped_keys():
+    event = LazyEvent('{"\\u0074ype": "transaction"}')
+
+    assert event["type"] == "transaction"
+    assert event.is_decoded
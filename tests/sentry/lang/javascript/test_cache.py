@@ -1,6 +1,7 @@
 from unittest import TestCase
+from unittest.mock import Mock
 
-from sentry.lang.javascript.cache import SourceCache
+from sentry.lang.javascript.cache import ParsedSourceCache, SourceCache
 
 
 class BasicCacheTest(TestCase):
@@ -37,3 +38,30 @@ class BasicCacheTest(TestCase):
         # fall back to utf-8
         cache.add(url, "foobar".encode("utf-32"), encoding="utf-32")
         assert cache.get(url)[0] == "foobar"
+
+
+class ParsedSourceCacheTest(TestCase):
+    def test_get_or_parse(self):
+        cache = ParsedSourceCache(10)
+        parse = Mock(side_effect=lambda body: body.upper())
+
+        assert cache.get_or_parse("source", (1, None, "a.js"), b"foo", parse) == b"FOO"
+        assert cache.get_or_parse("source", (1, None, "a.js"), b"foo", parse) == b"FOO"
+        assert parse.call_count == 1
+
+        # Different contents for the same url are parsed again
+        assert cache.get_or_parse("source", (1, None, "a.js"), b"bar", parse) == b"BAR"
+        assert parse.call_count == 2
+
+        # Bounded by the total size of the raw files
+        assert cache.get_or_parse("source", (1, None, "b.js"), b"bazbaz", parse) == b"BAZBAZ"
+        assert cache.get_or_parse("source", (1, None, "a.js"), b"foo", parse) == b"FOO"
+        assert parse.call_count == 4
+
+    def test_disabled(self):
+        cache = ParsedSourceCache(0)
+        parse = Mock(side_effect=lambda body: body.upper())
+
+        assert cache.get_or_parse("source", (1, None, "a.js"), b"foo", parse) == b"FOO"
+        assert cache.get_or_parse("source", (1, None, "a.js"), b"foo", parse) == b"FOO"
+        assert parse.call_count == 2
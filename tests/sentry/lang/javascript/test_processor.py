@@ -579,6 +579,38 @@ class FetchFileTest(TestCase):
         result2 = fetch_file("/example.js", release=release)
         assert result2 == result
 
+    @patch("sentry.lang.javascript.processor.ReleaseArchive")
+    def test_non_url_with_release_archive_reads_single_file(self, mock_release_archive):
+        compressed = BytesIO()
+        with zipfile.ZipFile(compressed, mode="w", compression=zipfile.ZIP_DEFLATED) as zip_file:
+            zip_file.writestr(
+                "manifest.json",
+                json.dumps(
+                    {
+                        "files": {
+                            "example.js": {"url": "/example.js"},
+                            "other.js": {"url": "/other.js"},
+                        }
+                    }
+                ),
+            )
+            zip_file.writestr("example.js", b"foo" * 100)
+            zip_file.writestr("other.js", b"bar" * 100)
+
+        release = Release.objects.create(version="1", organization_id=self.project.organization_id)
+        release.add_project(self.project)
+
+        compressed.seek(0)
+        file_ = File.objects.create(name="foo", type="release.bundle")
+        file_.putfile(compressed)
+        update_artifact_index(release, None, file_)
+
+        assert fetch_file("/example.js", release=release).body == b"foo" * 100
+        assert fetch_file("/other.js", release=release).body == b"bar" * 100
+
+        # The archive as a whole is never opened
+        assert not mock_release_archive.called
+
     def _create_archive(self, release, url):
         pseudo_archive = File.objects.create(name="", type="release.bundle")
         pseudo_archive.putfile(BytesIO(b"0123456789"))
@@ -624,10 +656,10 @@ class FetchFileTest(TestCase):
         cache_get.reset_mock()
         cache_set.reset_mock()
 
-        # Still no archive, cache is only read
+        # Still no archive, the cached lookup is used instead of the index
         result = fetch_release_archive_for_url(release, dist=None, url="foo")
         assert result is None
-        assert len(relevant_calls(cache_get, "artifact-index")) == 1
+        assert len(relevant_calls(cache_get, "artifact-index")) == 0
         assert len(relevant_calls(cache_set, "artifact-index")) == 0
         assert len(relevant_calls(cache_get, "releasefile")) == 0
         assert len(relevant_calls(cache_set, "releasefile")) == 0
@@ -651,7 +683,7 @@ class FetchFileTest(TestCase):
         # Second time, get it from cache
         result = fetch_release_archive_for_url(release2, dist=None, url="foo")
         assert result is not None
-        assert len(relevant_calls(cache_get, "artifact-index")) == 1
+        assert len(relevant_calls(cache_get, "artifact-index")) == 0
         assert len(relevant_calls(cache_set, "artifact-index")) == 0
         assert len(relevant_calls(cache_get, "releasefile")) == 1
         assert len(relevant_calls(cache_set, "releasefile")) == 0
@@ -7,6 +7,7 @@ service. Most tests live in tests/symbolicator/
 from unittest import mock
 
 import pytest
+from django.test import override_settings
 
 from sentry.lang.native.processing import _merge_image, process_payload
 from sentry.models.eventerror import EventError
@@ -152,3 +153,52 @@ def test_cocoa_function_name(mock_symbolicator, default_project):
 
     function_name = get_path(data, "exception", "values", 0, "stacktrace", "frames", 0, "function")
     assert function_name == "thunk for closure"
+
+
+@pytest.mark.django_db
+@mock.patch("sentry.lang.native.processing.Symbolicator")
+def test_identical_payloads_are_symbolicated_once(mock_symbolicator, default_project):
+    mock_symbolicator.return_value = mock_symbolicator
+    mock_symbolicator.sess.project_id = str(default_project.id)
+    mock_symbolicator.sess.sources = []
+    mock_symbolicator.sess.options = {}
+
+    def make_data(event_id, instruction_addr):
+        return {
+            "platform": "native",
+            "project": default_project.id,
+            "event_id": event_id,
+            "exception": {
+                "values": [{"stacktrace": {"frames": [{"instruction_addr": instruction_addr}]}}]
+            },
+        }
+
+    def process_payload_response(stacktraces, modules, signal):
+        return {
+            "status": "completed",
+            "stacktraces": [
+                {
+                    "frames": [
+                        {
+                            "original_index": 0,
+                            "function": "func_%s" % stacktraces[0]["frames"][0]["instruction_addr"],
+                        }
+                    ]
+                }
+            ],
+            "modules": [],
+        }
+
+    mock_symbolicator.process_payload.side_effect = process_payload_response
+
+    with override_settings(SYMBOLICATOR_PAYLOAD_CACHE_TTL=60):
+        results = [
+            process_payload(make_data(event_id, instruction_addr))
+            for event_id, instruction_addr in [("1", "0x1"), ("2", "0x1"), ("3", "0x2")]
+        ]
+
+    assert mock_symbolicator.process_payload.call_count == 2
+    assert [
+        get_path(data, "exception", "values", 0, "stacktrace", "frames", 0, "function")
+        for data in results
+    ] == ["func_0x1", "func_0x1", "func_0x2"]
@@ -1,9 +1,17 @@
 import copy
+from unittest import mock
 
 import pytest
+from django.test import override_settings
 
 from sentry.lang.native import symbolicator
-from sentry.lang.native.symbolicator import get_sources_for_project, redact_internal_sources
+from sentry.lang.native.symbolicator import (
+    Symbolicator,
+    SymbolicatorSession,
+    get_sources_for_project,
+    redact_internal_sources,
+)
+from sentry.tasks.symbolication import RetrySymbolication
 from sentry.testutils.helpers import Feature
 
 CUSTOM_SOURCE_CONFIG = """
@@ -264,3 +272,29 @@ class TestAliasReversion:
         reverse_aliases = symbolicator.reverse_aliases_map(builtin_sources)
         expected = {"sentry:ios-source": "sentry:ios", "sentry:tvos-source": "sentry:ios"}
         assert reverse_aliases == expected
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "long_poll_timeout, query_timeout, retry_after",
+    [(0, 0, 2), (30, 30, 0)],
+)
+def test_process_pending(default_project, long_poll_timeout, query_timeout, retry_after):
+    pending = {"status": "pending", "request_id": "abc", "retry_after": 2}
+    completed = {"status": "completed", "stacktraces": []}
+
+    with override_settings(SYMBOLICATOR_LONG_POLL_TIMEOUT=long_poll_timeout), mock.patch.object(
+        SymbolicatorSession, "symbolicate_stacktraces", return_value=pending
+    ), mock.patch.object(
+        SymbolicatorSession, "query_task", side_effect=[pending, completed]
+    ) as query_task:
+        processor = Symbolicator(project=default_project, event_id="a" * 32)
+
+        for _ in range(2):
+            with pytest.raises(RetrySymbolication) as e:
+                processor.process_payload(stacktraces=[], modules=[])
+            assert e.value.retry_after == retry_after
+
+        assert processor.process_payload(stacktraces=[], modules=[]) == completed
+
+    assert query_task.call_args_list == [mock.call("abc", timeout=query_timeout)] * 2
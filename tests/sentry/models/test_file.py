@@ -1,4 +1,5 @@
 import os
+from hashlib import sha1
 from io import BytesIO
 from unittest.mock import patch
 
@@ -25,6 +26,20 @@ class FileBlobTest(TestCase):
         assert my_file1.checksum == my_file2.checksum
         assert my_file1.path == my_file2.path
 
+    def test_from_files(self):
+        # more files than concurrent uploads, including a duplicate
+        contents = [f"blob {i}".encode() for i in range(20)] + [b"blob 0"]
+
+        FileBlob.from_files([ContentFile(c) for c in contents], organization=self.organization)
+
+        blobs = FileBlob.objects.filter(
+            checksum__in=[sha1(c).hexdigest() for c in contents],
+            fileblobowner__organization_id=self.organization.id,
+        )
+        assert len(blobs) == 20
+        for blob in blobs:
+            assert sha1(blob.getfile().read()).hexdigest() == blob.checksum
+
     def test_generate_unique_path(self):
         path = FileBlob.generate_unique_path()
         assert path
@@ -163,3 +178,26 @@ class FileTest(TestCase):
 
         f = file.getfile(prefetch=True)
         assert f.read() == random_data
+
+    def test_read_ahead(self):
+        bytes = BytesIO(b"abcdefghijklmnopqrstuvwxyz")
+        file1 = File.objects.create(name="baz.js", type="default", size=26)
+        results = file1.putfile(bytes, 5)
+        assert len(results) == 6
+
+        with file1.getfile(read_ahead=2) as fp:
+            assert fp.read() == b"abcdefghijklmnopqrstuvwxyz"
+
+            fp.seek(17)
+            assert fp.tell() == 17
+            assert fp.read(4) == b"rstu"
+
+            fp.seek(3)
+            assert fp.tell() == 3
+            assert fp.read(9) == b"defghijkl"
+
+            fp.seek(-1, 2)
+            assert fp.read() == b"z"
+
+        with self.assertRaises(ValueError):
+            fp.read()
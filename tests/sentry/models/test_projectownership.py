@@ -1,4 +1,4 @@
-from sentry.models import ActorTuple, ProjectOwnership, Team, User
+from sentry.models import ActorTuple, ProjectCodeOwners, ProjectOwnership, Team, User
 from sentry.ownership.grammar import Matcher, Owner, Rule, dump_schema, resolve_actors
 from sentry.testutils import TestCase
 from sentry.utils.cache import cache
@@ -243,6 +243,74 @@ class ProjectOwnershipTestCase(TestCase):
             self.project.id, {"stacktrace": {"frames": [frame]}}
         ) == ([ActorTuple(self.team.id, Team)], [rule])
 
+    def test_compiled_rules_follow_schema_changes(self):
+        rule_a = Rule(Matcher("path", "*.py"), [Owner("team", self.team.slug)])
+        rule_b = Rule(Matcher("path", "*.js"), [Owner("team", self.team.slug)])
+        ownership = ProjectOwnership.objects.create(
+            project_id=self.project.id, schema=dump_schema([rule_a]), fallthrough=True
+        )
+        data = {"stacktrace": {"frames": [{"filename": "foo.py"}, {"filename": "foo.js"}]}}
+        assert ProjectOwnership.get_owners(self.project.id, data)[1] == [rule_a]
+        assert ProjectOwnership.get_owners(self.project.id, data)[1] == [rule_a]
+
+        ownership.schema = dump_schema([rule_b, rule_a])
+        ownership.save()
+        assert ProjectOwnership.get_owners(self.project.id, data)[1] == [rule_b, rule_a]
+
+    def test_compiled_rules_with_codeowners(self):
+        self.team = self.create_team(
+            organization=self.organization, slug="tiger-team", members=[self.user]
+        )
+        self.team2 = self.create_team(
+            organization=self.organization, slug="dolphin-team", members=[self.user]
+        )
+        self.project = self.create_project(
+            organization=self.organization, teams=[self.team, self.team2]
+        )
+        self.code_mapping = self.create_code_mapping(project=self.project)
+
+        rule_a = Rule(Matcher("path", "*.py"), [Owner("team", self.team.slug)])
+        rule_b = Rule(Matcher("path", "*.py"), [Owner("team", self.team2.slug)])
+        rule_c = Rule(Matcher("path", "*.py"), [Owner("user", self.user.email)])
+
+        ProjectOwnership.objects.create(
+            project_id=self.project.id, schema=dump_schema([rule_a]), fallthrough=True
+        )
+        codeowners = self.create_codeowners(
+            self.project, self.code_mapping, raw="*.py @dolphin-team", schema=dump_schema([rule_b])
+        )
+        data = {"stacktrace": {"frames": [{"filename": "api/foo.py"}]}}
+
+        # Auto-assignment compiles the ownership rules and code owners separately,
+        # which must not be used for the combined rules of `get_owners`.
+        assert ProjectOwnership.get_autoassign_owners(self.project.id, data) == (
+            False,
+            [self.team, self.team2],
+            False,
+        )
+        self.assert_ownership_equals(
+            ProjectOwnership.get_owners(self.project.id, data),
+            ([ActorTuple(self.team.id, Team), ActorTuple(self.team2.id, Team)], [rule_a, rule_b]),
+        )
+        assert ProjectOwnership.get_autoassign_owners(self.project.id, data) == (
+            False,
+            [self.team, self.team2],
+            False,
+        )
+
+        codeowners.update(raw="*.py user@example.com", schema=dump_schema([rule_c]))
+        cache.delete(ProjectCodeOwners.get_cache_key(self.project.id))
+
+        self.assert_ownership_equals(
+            ProjectOwnership.get_owners(self.project.id, data),
+            ([ActorTuple(self.team.id, Team), ActorTuple(self.user.id, User)], [rule_a, rule_c]),
+        )
+        assert ProjectOwnership.get_autoassign_owners(self.project.id, data) == (
+            False,
+            [self.team, self.user],
+            False,
+        )
+
 
 class ResolveActorsTestCase(TestCase):
     def test_no_actors(self):
@@ -4,7 +4,7 @@ from datetime import datetime, timezone
 from io import BytesIO
 from threading import Thread
 from time import sleep
-from zipfile import ZipFile
+from zipfile import ZIP_DEFLATED, BadZipFile, ZipFile
 
 import pytest
 
@@ -16,6 +16,7 @@ from sentry.models.releasefile import (
     ARTIFACT_INDEX_FILENAME,
     _ArtifactIndexGuard,
     delete_from_artifact_index,
+    read_archived_file,
     read_artifact_index,
     update_artifact_index,
 )
@@ -155,6 +156,12 @@ class ReleaseArchiveTestCase(TestCase):
                     "filename": "bar",
                     "sha1": "62cdb7020ff920e5aa642c3d4066950dd1f01f4d",
                     "size": 3,
+                    "zip": {
+                        "offset": 171,
+                        "compressed_size": 3,
+                        "compression": 0,
+                        "crc32": 1996459178,
+                    },
                 },
                 "fake://baz": {
                     "archive_ident": archive1.ident,
@@ -162,6 +169,12 @@ class ReleaseArchiveTestCase(TestCase):
                     "filename": "baz",
                     "sha1": "1a74885aa2771a6a0edcc80dbd0cf396dfaf1aab",
                     "size": 5,
+                    "zip": {
+                        "offset": 207,
+                        "compressed_size": 5,
+                        "compression": 0,
+                        "crc32": 3112150520,
+                    },
                 },
                 "fake://foo": {
                     "archive_ident": archive1.ident,
@@ -169,6 +182,12 @@ class ReleaseArchiveTestCase(TestCase):
                     "filename": "foo",
                     "sha1": "0beec7b5ea3f0fdbc95d0dd47f3c5bc275da8a33",
                     "size": 3,
+                    "zip": {
+                        "offset": 135,
+                        "compressed_size": 3,
+                        "compression": 0,
+                        "crc32": 2356372769,
+                    },
                 },
             },
         }
@@ -197,6 +216,12 @@ class ReleaseArchiveTestCase(TestCase):
                     "filename": "bar",
                     "sha1": "a5d5c1bba91fdb6c669e1ae0413820885bbfc455",
                     "size": 3,
+                    "zip": {
+                        "offset": 171,
+                        "compressed_size": 3,
+                        "compression": 0,
+                        "crc32": 3763916320,
+                    },
                 },
                 "fake://baz": {
                     "archive_ident": archive1.ident,
@@ -204,6 +229,12 @@ class ReleaseArchiveTestCase(TestCase):
                     "filename": "baz",
                     "sha1": "1a74885aa2771a6a0edcc80dbd0cf396dfaf1aab",
                     "size": 5,
+                    "zip": {
+                        "offset": 207,
+                        "compressed_size": 5,
+                        "compression": 0,
+                        "crc32": 3112150520,
+                    },
                 },
                 "fake://foo": {
                     "archive_ident": archive2.ident,
@@ -211,6 +242,12 @@ class ReleaseArchiveTestCase(TestCase):
                     "filename": "foo",
                     "sha1": "0beec7b5ea3f0fdbc95d0dd47f3c5bc275da8a33",
                     "size": 3,
+                    "zip": {
+                        "offset": 135,
+                        "compressed_size": 3,
+                        "compression": 0,
+                        "crc32": 2356372769,
+                    },
                 },
                 "fake://zap": {
                     "archive_ident": archive2.ident,
@@ -218,6 +255,12 @@ class ReleaseArchiveTestCase(TestCase):
                     "filename": "zap",
                     "sha1": "a7a9c12205f9cb1f53f8b6678265c9e8158f2a8f",
                     "size": 4,
+                    "zip": {
+                        "offset": 207,
+                        "compressed_size": 4,
+                        "compression": 0,
+                        "crc32": 4080852775,
+                    },
                 },
             },
         }
@@ -229,6 +272,30 @@ class ReleaseArchiveTestCase(TestCase):
         expected["files"].pop("fake://foo")
         assert read_artifact_index(self.release, None) == expected
 
+    def test_read_archived_file(self):
+        files = {"foo": b"foo" * 100, "bar": b"bar"}
+        buffer = BytesIO()
+        with ZipFile(buffer, mode="w", compression=ZIP_DEFLATED) as zf:
+            zf.writestr(
+                "manifest.json", json.dumps({"files": {name: {"url": name} for name in files}})
+            )
+            for filename, content in files.items():
+                zf.writestr(filename, content)
+
+        buffer.seek(0)
+        file_ = File.objects.create(name="archive.zip")
+        file_.putfile(buffer)
+        update_artifact_index(self.release, None, file_)
+
+        index = read_artifact_index(self.release, None)
+        for filename, content in files.items():
+            with file_.getfile() as fp:
+                assert read_archived_file(fp, index["files"][filename]["zip"]) == content
+
+        location = dict(index["files"]["bar"]["zip"], crc32=0)
+        with file_.getfile() as fp, pytest.raises(BadZipFile):
+            read_archived_file(fp, location)
+
     def test_same_sha(self):
         """Stand-alone release file has same sha1 as one in manifest"""
         self.create_archive(fields={}, files={"foo": "bar"})
@@ -0,0 +1,63 @@
+import pytest
+
+from sentry.ownership.grammar import CompiledRules, Matcher, Owner, Rule, dump_schema, load_schema
+from sentry.testutils.skips import requires_pytest_benchmark
+
+# Number of rules of each matcher type in the schema
+RULE_COUNT = 100
+# Number of frames in the stacktrace of the event
+FRAME_COUNT = 200
+
+
+def make_schema():
+    owner = Owner("team", "backend")
+    rules = []
+    for i in range(RULE_COUNT):
+        rules.append(Rule(Matcher("path", f"src/app_{i}/*.py"), [owner]))
+        rules.append(Rule(Matcher("module", f"app_{i}.views"), [owner]))
+        rules.append(Rule(Matcher("codeowners", f"/src/app_{i}/**/models.py"), [owner]))
+        rules.append(Rule(Matcher("url", f"https://example.com/app_{i}/*"), [owner]))
+        rules.append(Rule(Matcher("tags.app", f"app_{i}"), [owner]))
+    return dump_schema(rules)
+
+
+def make_event():
+    frames = [
+        {
+            "filename": f"src/app_{i % 50}/models/models.py",
+            "abs_path": f"/srv/src/app_{i % 50}/models/models.py",
+            "module": f"app_{i % 50}.models",
+        }
+        for i in range(FRAME_COUNT)
+    ]
+    return {
+        "exception": {"values": [{"stacktrace": {"frames": frames}}]},
+        "request": {"url": "https://example.com/app_10/index"},
+        "tags": [["app", "app_10"]],
+    }
+
+
+def match_per_rule(schema, data):
+    return [rule for rule in load_schema(schema) if rule.test(data)]
+
+
+def match_compiled(schema, data):
+    return CompiledRules.from_schema(schema).matching_rules(data)
+
+
+def match_compiled_cached(compiled, data):
+    return compiled.matching_rules(data)
+
+
+@requires_pytest_benchmark
+@pytest.mark.parametrize(
+    "match", [match_per_rule, match_compiled, match_compiled_cached], ids=lambda f: f.__name__
+)
+def test_benchmark_ownership_matching(match, benchmark):
+    schema = make_schema()
+    data = make_event()
+    arg = CompiledRules.from_schema(schema) if match is match_compiled_cached else schema
+
+    result = benchmark(match, arg, data)
+
+    assert result == match_per_rule(schema, data)
@@ -1,6 +1,7 @@
 import pytest
 
 from sentry.ownership.grammar import (
+    CompiledRules,
     Matcher,
     Owner,
     Rule,
@@ -210,6 +211,52 @@ def test_matcher_test_tags_without_tag_data(data):
     assert not Matcher("tags.bar", "barval").test(data)
 
 
+@pytest.mark.parametrize(
+    "data",
+    [
+        {},
+        {"request": {"url": "http://google.com/foo"}},
+        {"tags": [["foo", "bar"], ["foo", "bar baz"]]},
+        {"stacktrace": {"frames": [{"filename": "src/sentry/models.py"}, {"module": "foo.bar"}]}},
+        {
+            "exception": {
+                "values": [
+                    {"stacktrace": {"frames": [{"abs_path": "/src/components/app.js"}]}},
+                    {"stacktrace": {"frames": [{"filename": "frontend/index.ts"}]}},
+                    {"stacktrace": {"frames": [{"module": "foo bar", "filename": "x.py"}]}},
+                ]
+            }
+        },
+    ],
+)
+def test_compiled_rules(data):
+    rules = parse_rules(fixture_data)
+    compiled = CompiledRules.from_schema(dump_schema(rules))
+    assert len(compiled) == len(rules)
+    assert compiled.matching_rules(data) == [rule for rule in rules if rule.test(data)]
+
+
+def test_compiled_rules_collects_frames_once(monkeypatch):
+    from sentry.ownership import grammar
+
+    calls = []
+    iter_frames = grammar._iter_frames
+
+    def _iter_frames(data):
+        calls.append(data)
+        return iter_frames(data)
+
+    monkeypatch.setattr(grammar, "_iter_frames", _iter_frames)
+
+    data = {"stacktrace": {"frames": [{"filename": "frontend/index.ts", "module": "foo.bar"}]}}
+    compiled = CompiledRules(parse_rules(fixture_data))
+    assert [rule.matcher for rule in compiled.matching_rules(data)] == [
+        Matcher("module", "foo.bar"),
+        Matcher("codeowners", "frontend/*.ts"),
+    ]
+    assert calls == [data]
+
+
 def _assert_matcher(matcher: Matcher, path_details, expected):
     """Helper function to reduce repeated code"""
     frames = {"stacktrace": {"frames": path_details}}
@@ -0,0 +1,44 @@
+from sentry.processing.realtime_metrics.decaying import DecayingRedisRealtimeMetricsStore
+from sentry.processing.realtime_metrics.redis import RedisRealtimeMetricsStore
+from sentry.testutils.skips import requires_pytest_benchmark
+
+PROJECT_COUNT = 100_000
+
+CONFIG = {
+    "cluster": "default",
+    "counter_bucket_size": 10,
+    "counter_time_window": 600,
+    "duration_bucket_size": 10,
+    "duration_time_window": 600,
+    "backoff_timer": 0,
+}
+
+
+def populate(store):
+    for project_id in range(PROJECT_COUNT):
+        store.increment_project_event_counter(project_id, 1000)
+        store.increment_project_duration_counter(project_id, 1000, project_id % 100)
+
+
+def scan_buckets(store):
+    # What scanning for LPQ projects amounts to with bucketed metrics, which is split across
+    # one task per project.
+    for project_id in store.projects():
+        store.get_counts_for_project(project_id, 1010)
+        store.get_durations_for_project(project_id, 1010)
+
+
+@requires_pytest_benchmark
+def test_benchmark_lpq_bucket_scan(benchmark):
+    store = RedisRealtimeMetricsStore(**CONFIG)
+    populate(store)
+
+    benchmark.pedantic(scan_buckets, args=(store,), rounds=3)
+
+
+@requires_pytest_benchmark
+def test_benchmark_lpq_decaying_metrics(benchmark):
+    store = DecayingRedisRealtimeMetricsStore(**CONFIG)
+    populate(store)
+
+    benchmark.pedantic(store.get_project_metrics, args=(1010,), rounds=3)
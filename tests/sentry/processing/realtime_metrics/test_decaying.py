@@ -0,0 +1,129 @@
+from typing import TYPE_CHECKING, Any, Dict
+
+import pytest
+
+from sentry.exceptions import InvalidConfiguration
+from sentry.processing.realtime_metrics.decaying import DecayingRedisRealtimeMetricsStore
+
+if TYPE_CHECKING:
+    from typing import Callable
+
+    def _fixture(func: Callable[..., Any]) -> Callable[..., None]:
+        ...
+
+    pytest.fixture = _fixture
+
+
+@pytest.fixture
+def config() -> Dict[str, Any]:
+    return {
+        "cluster": "default",
+        "counter_bucket_size": 10,
+        "counter_time_window": 600,
+        "duration_bucket_size": 10,
+        "duration_time_window": 600,
+        "backoff_timer": 1,
+    }
+
+
+@pytest.fixture
+def store(config: Dict[str, Any]) -> DecayingRedisRealtimeMetricsStore:
+    return DecayingRedisRealtimeMetricsStore(**config)
+
+
+def test_invalid_config(config: Dict[str, Any]) -> None:
+    with pytest.raises(InvalidConfiguration):
+        DecayingRedisRealtimeMetricsStore(**config, relative_accuracy=1.5)
+
+
+def test_no_metrics(store: DecayingRedisRealtimeMetricsStore) -> None:
+    assert store.get_project_metrics(1000) == {}
+    assert set(store.projects()) == set()
+
+
+def test_steady_rate(store: DecayingRedisRealtimeMetricsStore) -> None:
+    # Two events per second over the whole time window
+    for timestamp in range(0, 600):
+        store.increment_project_event_counter(17, timestamp)
+        store.increment_project_event_counter(17, timestamp)
+
+    metrics = store.get_project_metrics(600)[17]
+    assert metrics.recent_rate == pytest.approx(2, rel=0.05)
+    # The long rate has not fully converged after a single time window
+    assert metrics.total_rate == pytest.approx(2 * 0.632, rel=0.05)
+    assert metrics.p75_duration is None
+    assert metrics.events_per_minute == 0
+
+
+def test_rate_spike(store: DecayingRedisRealtimeMetricsStore) -> None:
+    for timestamp in range(0, 600, 10):
+        store.increment_project_event_counter(17, timestamp)
+    for timestamp in range(600, 660):
+        for _ in range(100):
+            store.increment_project_event_counter(17, timestamp)
+
+    metrics = store.get_project_metrics(660)[17]
+    assert metrics.recent_rate > 50
+    assert metrics.recent_rate > 5 * metrics.total_rate
+
+
+def test_durations(store: DecayingRedisRealtimeMetricsStore) -> None:
+    for duration in range(0, 1000):
+        store.increment_project_duration_counter(17, 100, duration)
+
+    metrics = store.get_project_metrics(100)[17]
+    assert metrics.p75_duration == pytest.approx(750, rel=0.05)
+    assert metrics.events_per_minute == pytest.approx(100, rel=0.01)
+    assert metrics.recent_rate == 0
+    assert metrics.total_rate == 0
+
+
+def test_bucketed_counts(store: DecayingRedisRealtimeMetricsStore) -> None:
+    for timestamp in range(0, 600, 10):
+        store.increment_project_event_counter(17, timestamp)
+    for timestamp in range(600, 660):
+        for _ in range(100):
+            store.increment_project_event_counter(17, timestamp)
+
+    metrics = store.get_project_metrics(660)[17]
+    counts = store.get_counts_for_project(17, 660)
+    assert counts.timestamp == 60
+    assert counts.width == 10
+    assert len(counts.counts) == 61
+    assert counts.rate(60) == pytest.approx(metrics.recent_rate, rel=0.05)
+    assert counts.rate() >= metrics.total_rate * 0.95
+
+    assert store.get_counts_for_project(42, 660).total_count() == 0
+
+
+def test_bucketed_durations(store: DecayingRedisRealtimeMetricsStore) -> None:
+    for duration in range(0, 1000):
+        store.increment_project_duration_counter(17, 100, duration)
+
+    durations = store.get_durations_for_project(17, 100)
+    assert durations.timestamp == -500
+    assert len(durations.histograms) == 61
+
+    total = durations.histograms[-1]
+    assert total.total_count() == 1000
+    assert total.percentile(0.75) == pytest.approx(750, rel=0.1)
+    assert all(h.total_count() == 0 for h in durations.histograms[:-1])
+
+    assert store.get_durations_for_project(42, 100).histograms[-1].total_count() == 0
+
+
+def test_projects(store: DecayingRedisRealtimeMetricsStore) -> None:
+    store.increment_project_event_counter(17, 100)
+    store.increment_project_duration_counter(42, 100, 10)
+
+    assert set(store.projects()) == {17, 42}
+    assert set(store.get_project_metrics(100)) == {17, 42}
+
+
+def test_expired_projects_removed(store: DecayingRedisRealtimeMetricsStore) -> None:
+    store.increment_project_event_counter(17, 100)
+    store.increment_project_duration_counter(17, 100, 10)
+    store.increment_project_event_counter(42, 800)
+
+    assert set(store.get_project_metrics(800)) == {42}
+    assert set(store.projects()) == {42}
@@ -1,5 +1,5 @@
 from datetime import datetime
-from unittest.mock import MagicMock
+from unittest.mock import MagicMock, patch
 
 import pytest
 
@@ -489,3 +489,33 @@ def test_function_dispatch_is_working():
     duplex.sessions.get_current_and_previous_crash_free_rates.assert_called_with(*call_params)
     # check metrics backend were not called again (only one original call)
     assert duplex.metrics.get_current_and_previous_crash_free_rates.call_count == 1
+
+
+@patch.object(duplex.options, "get", return_value=1.0)
+@patch.object(duplex.features, "has", return_value=True)
+def test_shadow_comparison(has_feature, get_option):
+    duplex_backend = DuplexReleaseHealthBackend(
+        datetime(2021, 10, 4, 12, 0), shadow=True, shadow_concurrency=1
+    )
+    duplex_backend.sessions = MagicMock()
+    duplex_backend.metrics = MagicMock()
+    duplex_backend.sessions.get_project_sessions_count.return_value = 1
+    duplex_backend.metrics.get_project_sessions_count.return_value = 2
+
+    # All slots for shadow calls are taken, so the call is dropped.
+    duplex_backend._shadow_slots.acquire()
+    ret_val = duplex_backend._dispatch_call_inner(
+        "get_project_sessions_count", True, 60, MagicMock(), None, 1, 2
+    )
+    assert ret_val == 1
+    duplex_backend._shadow_slots.release()
+    assert not duplex_backend.metrics.get_project_sessions_count.called
+
+    ret_val = duplex_backend._dispatch_call_inner(
+        "get_project_sessions_count", True, 60, MagicMock(), None, 1, 2
+    )
+    assert ret_val == 1
+    duplex_backend._shadow_executor.shutdown(wait=True)
+    duplex_backend.metrics.get_project_sessions_count.assert_called_once_with(1, 2)
+    # The slot is released once the shadow call has finished.
+    assert duplex_backend._shadow_slots.acquire(blocking=False)
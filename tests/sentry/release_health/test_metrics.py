@@ -0,0 +1,89 @@
+from unittest import mock
+
+from sentry.release_health import metrics
+from sentry.sentry_metrics.indexer.mock import MockIndexer
+from sentry.sentry_metrics.sessions import SessionMetricKey
+
+
+def test_string_resolver():
+    indexer = mock.Mock(wraps=MockIndexer())
+
+    @metrics._with_string_resolver
+    def run():
+        assert metrics.metric_id(1, SessionMetricKey.SESSION) == indexer.resolve(
+            SessionMetricKey.SESSION.value
+        )
+        assert metrics.tag_key(1, "release") == metrics.tag_key(1, "release")
+        assert metrics.try_get_string_index(1, "unknown") is None
+        assert metrics.get_tag_values_list(1, ["production", "staging", "unknown"]) == [
+            indexer.resolve("production"),
+            indexer.resolve("staging"),
+        ]
+        assert metrics.reverse_tag_value(1, indexer.resolve("crashed")) == "crashed"
+
+    with mock.patch.object(metrics, "indexer", indexer):
+        indexer.resolve.reset_mock()
+        run()
+
+    # The assertions above call `resolve` directly on the indexer, while the
+    # helpers only use bulk lookups: one for common strings and one for each
+    # new set of strings.
+    assert indexer.resolve.call_count == 4
+    assert indexer.bulk_resolve.call_count == 3
+    assert indexer.bulk_reverse_resolve.call_count == 0
+
+
+def test_raw_snql_query_reverse_resolves_tags():
+    indexer = mock.Mock(wraps=MockIndexer())
+    release = indexer.resolve("release")
+    rows = [
+        {"project_id": 1, f"tags[{release}]": indexer.resolve("production")},
+        {"project_id": 1, f"tags[{release}]": indexer.resolve("staging")},
+    ]
+
+    @metrics._with_string_resolver
+    def run():
+        result = metrics._raw_snql_query(None, referrer="test")
+        return [metrics.reverse_tag_value(1, row[f"tags[{release}]"]) for row in result["data"]]
+
+    with mock.patch.object(metrics, "indexer", indexer), mock.patch.object(
+        metrics, "raw_snql_query", return_value={"data": rows}
+    ):
+        assert run() == ["production", "staging"]
+
+    assert indexer.bulk_reverse_resolve.call_count == 1
+    assert not indexer.reverse_resolve.called
+
+
+def test_run_overview_queries():
+    indexer = mock.Mock(wraps=MockIndexer())
+    release = indexer.resolve("release")
+    production = indexer.resolve("production")
+    staging = indexer.resolve("staging")
+    responses = {
+        "first": {"data": [{f"tags[{release}]": production}]},
+        "second": {"data": [{f"tags[{release}]": staging}]},
+    }
+
+    def convert(data):
+        return [metrics.reverse_tag_value(1, row[f"tags[{release}]"]) for row in data]
+
+    queries = [
+        metrics._OverviewQuery(None, "first", convert),
+        metrics._OverviewQuery(None, "second", convert),
+    ]
+
+    with mock.patch.object(metrics, "indexer", indexer), mock.patch.object(
+        metrics,
+        "raw_snql_query",
+        side_effect=lambda query, referrer, use_cache: responses[referrer],
+    ) as raw_snql_query:
+        assert metrics._with_string_resolver(metrics._run_overview_queries)(queries) == [
+            ["production"],
+            ["staging"],
+        ]
+
+    assert raw_snql_query.call_count == 2
+    # Tag values of all results are resolved in one lookup.
+    assert indexer.bulk_reverse_resolve.call_count == 1
+    assert not indexer.reverse_resolve.called
@@ -198,6 +198,60 @@ class RuleProcessorTest(TestCase):
         # mock condition first.
         assert passes.call_count == 0
 
+    @patch(
+        "sentry.constants._SENTRY_RULES",
+        [
+            "sentry.mail.actions.NotifyEmailAction",
+            "sentry.rules.conditions.event_frequency.EventFrequencyCondition",
+        ],
+    )
+    def test_frequency_queries_are_shared(self):
+        def frequency_rule(interval, value):
+            return Rule.objects.create(
+                project=self.event.project,
+                data={
+                    "conditions": [
+                        {
+                            "id": "sentry.rules.conditions.event_frequency.EventFrequencyCondition",
+                            "interval": interval,
+                            "value": value,
+                        }
+                    ],
+                    "actions": [EMAIL_ACTION_DATA],
+                },
+            )
+
+        self.rule.delete()
+        passing = [frequency_rule("1h", 5), frequency_rule("1d", 5)]
+        frequency_rule("1h", 50)
+        frequency_rule("1h", 100)
+
+        with patch("sentry.rules.processor.rules", init_registry()), patch(
+            "sentry.rules.conditions.event_frequency.EventFrequencyCondition.query_hook",
+            return_value=10,
+        ) as query_hook:
+            rp = RuleProcessor(
+                self.event,
+                is_new=True,
+                is_regression=True,
+                is_new_group_environment=True,
+                has_reappeared=True,
+            )
+            results = list(rp.apply())
+            assert query_hook.call_count == 2
+            assert {future.rule for _, futures in results for future in futures} == set(passing)
+
+            # Results are memoized per group for subsequent events.
+            rp = RuleProcessor(
+                self.event,
+                is_new=False,
+                is_regression=False,
+                is_new_group_environment=False,
+                has_reappeared=False,
+            )
+            list(rp.apply())
+            assert query_hook.call_count == 2
+
 
 # mock filter which always passes
 class MockFilterTrue(EventFilter):
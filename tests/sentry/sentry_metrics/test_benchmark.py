@@ -0,0 +1,43 @@
+import pytest
+
+from sentry.sentry_metrics.indexer.postgres import PGStringIndexer
+from sentry.testutils.skips import requires_pytest_benchmark
+
+# Number of strings recorded per batch, and how many of them are new
+BATCH_SIZE = 1000
+NEW_STRING_RATIO = 0.1
+
+
+def make_batches(rounds):
+    existing = [f"tag_value_{i}" for i in range(int(BATCH_SIZE * (1 - NEW_STRING_RATIO)))]
+    PGStringIndexer(local_cache_size=0).bulk_record(existing)
+    return iter(
+        existing + [f"new_tag_value_{r}_{i}" for i in range(int(BATCH_SIZE * NEW_STRING_RATIO))]
+        for r in range(rounds)
+    )
+
+
+def record_per_string(indexer, strings):
+    for string in strings:
+        indexer.record(string)
+
+
+def record_batched(indexer, strings):
+    indexer.bulk_record(strings)
+
+
+@pytest.mark.django_db
+@requires_pytest_benchmark
+@pytest.mark.parametrize(
+    "record", [record_per_string, record_batched], ids=["per_string", "batched"]
+)
+@pytest.mark.parametrize("local_cache_size", [0, 100000], ids=["no_local_cache", "local_cache"])
+def test_benchmark_indexer_throughput(record, local_cache_size, benchmark):
+    rounds = 5
+    batches = make_batches(rounds)
+    indexer = PGStringIndexer(local_cache_size=local_cache_size)
+
+    def setup():
+        return (indexer, next(batches)), {}
+
+    benchmark.pedantic(record, setup=setup, rounds=rounds)
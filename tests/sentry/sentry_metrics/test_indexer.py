@@ -11,3 +11,8 @@ def test_resolve():
 def test_reverse_resolve():
     assert INDEXER.reverse_resolve(666) is None
     assert INDEXER.reverse_resolve(11) == "sentry.sessions.user"
+
+
+def test_bulk_resolve():
+    assert INDEXER.bulk_resolve(["what", "sentry.sessions.user"]) == {"sentry.sessions.user": 11}
+    assert INDEXER.bulk_reverse_resolve([666, 11]) == {11: "sentry.sessions.user"}
@@ -1,3 +1,5 @@
+from unittest.mock import patch
+
 from sentry.sentry_metrics.indexer.models import MetricsKeyIndexer
 from sentry.sentry_metrics.indexer.postgres import PGStringIndexer
 from sentry.testutils.cases import TestCase
@@ -28,3 +30,59 @@ class PostgresIndexerTest(TestCase):
         # test invalid values
         assert PGStringIndexer().resolve("beep") is None
         assert PGStringIndexer().reverse_resolve(1234) is None
+
+    def test_bulk_record_existing_and_new_strings(self):
+        existing = PGStringIndexer().bulk_record(strings=["hello", "hey"])
+        results = PGStringIndexer().bulk_record(strings=["hello", "hey", "hi", "hi"])
+
+        assert results["hello"] == existing["hello"]
+        assert results["hey"] == existing["hey"]
+        assert results["hi"] == MetricsKeyIndexer.objects.get(string="hi").id
+
+    def test_bulk_record_populates_model_cache(self):
+        results = PGStringIndexer().bulk_record(strings=["hello", "hey"])
+
+        with self.assertNumQueries(0):
+            assert MetricsKeyIndexer.objects.get_from_cache(string="hello").id == results["hello"]
+            assert MetricsKeyIndexer.objects.get_from_cache(pk=results["hey"]).string == "hey"
+
+    def test_bulk_resolve(self):
+        results = PGStringIndexer().bulk_record(strings=["hello", "hey"])
+
+        indexer = PGStringIndexer()
+        assert indexer.bulk_resolve(["hello", "hey", "beep"]) == results
+        assert indexer.bulk_reverse_resolve([results["hello"], 1234]) == {results["hello"]: "hello"}
+
+        # Resolved strings are cached locally
+        with self.assertNumQueries(0):
+            assert indexer.bulk_reverse_resolve(list(results.values())) == {
+                id: string for string, id in results.items()
+            }
+
+    def test_local_cache(self):
+        indexer = PGStringIndexer(local_cache_size=10)
+        results = indexer.bulk_record(strings=["hello", "hey", "hi"])
+
+        objects = MetricsKeyIndexer.objects
+        with patch.object(objects, "get_many_from_cache") as get_many_from_cache:
+            with patch.object(objects, "get_from_cache") as get_from_cache:
+                with self.assertNumQueries(0):
+                    assert indexer.bulk_record(strings=["hello", "hey", "hi"]) == results
+                    assert indexer.resolve("hello") == results["hello"]
+                    assert indexer.reverse_resolve(results["hey"]) == "hey"
+
+        assert not get_many_from_cache.called
+        assert not get_from_cache.called
+
+    def test_local_cache_disabled(self):
+        indexer = PGStringIndexer(local_cache_size=0)
+        results = indexer.bulk_record(strings=["hello"])
+
+        with patch.object(
+            MetricsKeyIndexer.objects,
+            "get_many_from_cache",
+            wraps=MetricsKeyIndexer.objects.get_many_from_cache,
+        ) as get_many_from_cache:
+            assert indexer.bulk_record(strings=["hello"]) == results
+
+        assert get_many_from_cache.called
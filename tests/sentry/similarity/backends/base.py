@@ -160,6 +160,34 @@ class MinHashIndexBackendTestMixin:
             == [("4", [1.0, None]), ("1", [1.0, 0.0]), ("2", [1.0, 0.0]), ("3", [1.0, 0.0])]
         )
 
+    def test_batched_queries(self):
+        self.index.record("example", "1", [("index:a", "hello world"), ("index:b", "hello world")])
+        self.index.record("example", "2", [("index:a", "hello world"), ("index:b", "hello world")])
+        self.index.record("example", "3", [("index:a", "hello world"), ("index:b", "pizza world")])
+        self.index.record("example", "4", [("index:a", "hello world")])
+        self.index.record("example", "5", [("index:b", "hello world")])
+
+        items = [("index:a", 0), ("index:b", 0)]
+        assert self.index.compare_many("example", [("1", items), ("5", items[1:])]) == [
+            self.index.compare("example", "1", items),
+            self.index.compare("example", "5", items[1:]),
+        ]
+        assert self.index.compare_many("example", [("1", items), ("4", items)], limit=2) == [
+            self.index.compare("example", "1", items, limit=2),
+            self.index.compare("example", "4", items, limit=2),
+        ]
+
+        requests = [
+            [("index:a", 0, "hello world"), ("index:b", 0, "hello world")],
+            [("index:a", self.index.bands, "pizza world"), ("index:b", 8, "pizza world")],
+        ]
+        assert self.index.classify_many("example", requests) == [
+            self.index.classify("example", request) for request in requests
+        ]
+
+        assert self.index.compare_many("example", []) == []
+        assert self.index.classify_many("example", []) == []
+
     def test_merge(self):
         self.index.record("example", "1", [("index", ["foo", "bar"])])
         self.index.record("example", "2", [("index", ["baz"])])
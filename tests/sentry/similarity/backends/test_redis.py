@@ -46,3 +46,38 @@ class RedisScriptMinHashIndexBackendTestCase(MinHashIndexBackendTestMixin, TestC
 
         result = self.index.export("example", [("index", 2)], timestamp=timestamp)
         assert len(result) == 1
+
+    def test_compare_many_result_cache(self):
+        index = RedisScriptMinHashIndexBackend(
+            redis.clusters.get("default").get_local_client(0),
+            "sim",
+            signature_builder,
+            16,
+            60 * 60,
+            12,
+            10,
+            result_cache_ttl=60,
+        )
+
+        index.record("example", "1", [("index", "hello world")])
+        index.record("example", "2", [("index", "hello world")])
+        assert index.compare_many("example", [("1", [("index", 0)])]) == [
+            [("1", [1.0]), ("2", [1.0])]
+        ]
+
+        # Results are served from the cache until it expires, even though
+        # the index has changed in the meantime.
+        index.record("example", "3", [("index", "hello world")])
+        assert index.compare_many("example", [("1", [("index", 0)])]) == [
+            [("1", [1.0]), ("2", [1.0])]
+        ]
+
+        # Queries with different parameters are not affected by the cache.
+        assert index.compare_many("example", [("1", [("index", 0)])], limit=5) == [
+            [("1", [1.0]), ("2", [1.0]), ("3", [1.0])]
+        ]
+        assert index.compare("example", "1", [("index", 0)]) == [
+            ("1", [1.0]),
+            ("2", [1.0]),
+            ("3", [1.0]),
+        ]
@@ -18,12 +18,13 @@ from sentry.models import (
 )
 from sentry.ownership.grammar import Matcher, Owner, Rule, dump_schema
 from sentry.tasks.merge import merge_groups
-from sentry.tasks.post_process import post_process_group
-from sentry.testutils import TestCase
+from sentry.tasks.post_process import post_process_deferred_stage, post_process_group
+from sentry.testutils import TestCase, TransactionTestCase
 from sentry.testutils.helpers import with_feature
 from sentry.testutils.helpers.datetime import before_now, iso_format
 from sentry.testutils.helpers.eventprocessing import write_event_to_cache
 from sentry.utils.cache import cache
+from sentry.utils.stages import StageTimings
 
 
 class EventMatcher:
@@ -537,6 +538,67 @@ class PostProcessGroupTest(TestCase):
                 group_id=event.group_id,
             )
 
+    @patch("sentry.tasks.post_process.post_process_deferred_stage.delay")
+    @patch("sentry.similarity.record")
+    def test_defers_slow_stages(self, mock_record, mock_deferred_stage):
+        event = self.store_event(data={"message": "testing"}, project_id=self.project.id)
+        cache_key = write_event_to_cache(event)
+
+        timings = StageTimings()
+        timings.record("similarity", 2.0)
+        with patch("sentry.tasks.post_process._stage_timings", timings), self.settings(
+            SENTRY_POST_PROCESS_STAGE_BUDGETS={"similarity": 1.0}
+        ):
+            post_process_group(
+                is_new=True,
+                is_regression=False,
+                is_new_group_environment=True,
+                cache_key=cache_key,
+                group_id=event.group_id,
+            )
+
+        assert not mock_record.called
+        deferred_kwargs = {
+            "stage": "similarity",
+            "project_id": self.project.id,
+            "event_id": event.event_id,
+            "group_id": event.group_id,
+            "is_new": True,
+            "is_regression": False,
+        }
+        mock_deferred_stage.assert_called_once_with(**deferred_kwargs)
+
+        post_process_deferred_stage(**deferred_kwargs)
+        assert mock_record.call_count == 1
+        assert mock_record.call_args[0][1] == [EventMatcher(event)]
+
+
+class PostProcessGroupConcurrentStagesTest(TransactionTestCase):
+    @patch("sentry.rules.processor.RuleProcessor")
+    @patch("sentry.tasks.sentry_apps.process_resource_change_bound.delay")
+    def test_concurrent_stages(self, mock_process_resource_change_bound, mock_processor):
+        event = self.store_event(data={"message": "testing"}, project_id=self.project.id)
+        cache_key = write_event_to_cache(event)
+
+        with self.settings(SENTRY_POST_PROCESS_STAGE_WORKERS=4), patch(
+            "sentry.tasks.post_process._stage_executor", None
+        ):
+            post_process_group(
+                is_new=True,
+                is_regression=False,
+                is_new_group_environment=True,
+                cache_key=cache_key,
+                group_id=event.group_id,
+            )
+
+        assert GroupInbox.objects.filter(
+            group=event.group, reason=GroupInboxReason.NEW.value
+        ).exists()
+        mock_processor.assert_called_once_with(EventMatcher(event), True, False, True, False)
+        mock_process_resource_change_bound.assert_called_with(
+            action="created", sender="Group", instance_id=event.group_id
+        )
+
 
 class PostProcessGroupAssignmentTest(TestCase):
     def make_ownership(self, extra_rules=None):
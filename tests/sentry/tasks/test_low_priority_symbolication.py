@@ -54,6 +54,29 @@ def store() -> Generator[RealtimeMetricsStore, None, None]:
     realtime_metrics.__dict__.update(old_properties)
 
 
+@pytest.fixture
+def decaying_store() -> Generator[RealtimeMetricsStore, None, None]:
+    store = LazyServiceWrapper(
+        RealtimeMetricsStore,
+        "sentry.processing.realtime_metrics.decaying.DecayingRedisRealtimeMetricsStore",
+        {
+            "cluster": "default",
+            "counter_bucket_size": 10,
+            "counter_time_window": 600,
+            "duration_bucket_size": 10,
+            "duration_time_window": 600,
+            "backoff_timer": 0,
+        },
+    )
+
+    old_properties = realtime_metrics.__dict__.copy()
+    store.expose(realtime_metrics.__dict__)
+    yield store
+
+    # cleanup
+    realtime_metrics.__dict__.update(old_properties)
+
+
 class TestScanForSuspectProjects:
     @pytest.fixture  # type: ignore
     def mock_update_lpq_eligibility(
@@ -98,6 +121,34 @@ class TestScanForSuspectProjects:
         assert mock_update_lpq_eligibility.delay.called
 
 
+class TestScanForSuspectProjectsFromMetrics:
+    @freeze_time(datetime.fromtimestamp(660))
+    def test_updates_lpq(self, decaying_store: RealtimeMetricsStore) -> None:
+        decaying_store.add_project_to_lpq(17)
+        decaying_store.add_project_to_lpq(18)
+        decaying_store.increment_project_event_counter(project_id=18, timestamp=650)
+
+        for timestamp in range(600, 660):
+            decaying_store.increment_project_event_counter(project_id=19, timestamp=timestamp)
+            for _ in range(100):
+                decaying_store.increment_project_event_counter(project_id=20, timestamp=timestamp)
+
+        _scan_for_suspect_projects()
+
+        assert decaying_store.get_lpq_projects() == {20}
+
+    @freeze_time(datetime.fromtimestamp(660))
+    def test_slow_durations(self, decaying_store: RealtimeMetricsStore) -> None:
+        for timestamp in range(0, 660, 2):
+            decaying_store.increment_project_duration_counter(
+                project_id=17, timestamp=timestamp, duration=600
+            )
+
+        _scan_for_suspect_projects()
+
+        assert decaying_store.get_lpq_projects() == {17}
+
+
 class TestUpdateLpqEligibility:
     def test_no_counts_no_durations_in_lpq(self, store: RealtimeMetricsStore) -> None:
         store.add_project_to_lpq(17)
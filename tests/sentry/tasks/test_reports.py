@@ -18,7 +18,10 @@ from sentry.tasks.reports import (
     Skipped,
     build_message,
     build_project_issue_summaries,
+    build_project_issue_summaries_many,
     build_project_series,
+    build_project_series_many,
+    build_project_usage_outcomes_many,
     change,
     clean_series,
     colorize,
@@ -40,6 +43,7 @@ from sentry.testutils.factories import DEFAULT_EVENT_DATA
 from sentry.testutils.helpers.datetime import iso_format
 from sentry.utils.dates import floor_to_utc_day, to_datetime, to_timestamp
 from sentry.utils.outcomes import Outcome
+from sentry.utils.snuba import raw_snql_query
 
 
 @pytest.yield_fixture(scope="module")
@@ -363,6 +367,40 @@ class ReportTestCase(TestCase, SnubaTestCase):
             map(lambda x: x[1] == (2, 0), response)
         ), "must show two issues resolved in one rollup window"
 
+    def test_build_project_reports_many(self):
+        now = timezone.now()
+        min_ago = iso_format(now - timedelta(minutes=1))
+        two_min_ago = now - timedelta(minutes=2)
+        other_project = self.create_project(organization=self.organization)
+
+        for event_id, fingerprint, project in [
+            ("a" * 32, "group-1", self.project),
+            ("b" * 32, "group-2", self.project),
+            ("c" * 32, "group-3", other_project),
+        ]:
+            self.store_event(
+                data={
+                    "event_id": event_id,
+                    "message": "message",
+                    "timestamp": min_ago,
+                    "stacktrace": copy.deepcopy(DEFAULT_EVENT_DATA["stacktrace"]),
+                    "fingerprint": [fingerprint],
+                },
+                project_id=project.id,
+            )
+
+        interval = [two_min_ago, now]
+        assert build_project_issue_summaries_many(interval, [self.project, other_project]) == {
+            self.project.id: [2, 0, 0],
+            other_project.id: [1, 0, 0],
+        }
+
+        interval = [floor_to_utc_day(now - timedelta(days=7)), floor_to_utc_day(now)]
+        assert build_project_series_many(interval, [self.project, other_project]) == {
+            self.project.id: build_project_series(interval, self.project),
+            other_project.id: build_project_series(interval, other_project),
+        }
+
 
 class ReportAcceptanceTest(OutcomesSnubaTest, SnubaTestCase):
     @mock.patch("sentry.tasks.reports.backend", DummyReportBackend())
@@ -445,3 +483,39 @@ class ReportAcceptanceTest(OutcomesSnubaTest, SnubaTestCase):
         assert ctx["report"]["distribution"]["types"][1][1] == 0
         assert ctx["report"]["distribution"]["types"][2][1] == 0
         assert ctx["report"]["distribution"]["total"] == 1
+
+    @mock.patch("sentry.tasks.reports.OUTCOMES_QUERY_LIMIT", 12)
+    def test_build_project_usage_outcomes_many_past_limit(self):
+        now = timezone.now()
+        two_days_ago = now - timedelta(days=2)
+
+        # With a limit of 12 rows each query covers a single project, while
+        # the outcomes of all projects together take 15 rows.
+        projects = [self.project] + [
+            self.create_project(organization=self.organization) for _ in range(4)
+        ]
+        for i, project in enumerate(projects):
+            for outcome, category, num in [
+                (Outcome.ACCEPTED, DataCategory.ERROR, i + 1),
+                (Outcome.RATE_LIMITED, DataCategory.ERROR, 1),
+                (Outcome.ACCEPTED, DataCategory.TRANSACTION, 2),
+            ]:
+                self.store_outcomes(
+                    {
+                        "org_id": self.organization.id,
+                        "project_id": project.id,
+                        "outcome": outcome,
+                        "category": category,
+                        "timestamp": two_days_ago,
+                        "key_id": 1,
+                    },
+                    num_times=num,
+                )
+
+        with mock.patch(
+            "sentry.tasks.reports.raw_snql_query", wraps=raw_snql_query
+        ) as mock_raw_snql_query:
+            outcomes = build_project_usage_outcomes_many((now - timedelta(days=7), now), projects)
+
+        assert mock_raw_snql_query.call_count == len(projects)
+        assert outcomes == {project.id: (i + 1, 1, 2, 0) for i, project in enumerate(projects)}
@@ -0,0 +1,38 @@
+from datetime import datetime, timedelta
+
+import pytest
+import pytz
+
+from sentry.tasks.reports import build_project_report, build_project_reports
+from sentry.testutils.skips import requires_pytest_benchmark
+
+INTERVAL = (
+    datetime(2016, 9, 5, tzinfo=pytz.utc),
+    datetime(2016, 9, 12, tzinfo=pytz.utc),
+)
+
+
+def build_per_project(projects):
+    return {project.id: build_project_report(INTERVAL, project) for project in projects}
+
+
+def build_per_organization(projects):
+    return build_project_reports(INTERVAL, projects)
+
+
+@pytest.mark.django_db
+@requires_pytest_benchmark
+@pytest.mark.parametrize("project_count", [10, 100, 500])
+@pytest.mark.parametrize(
+    "build", [build_per_project, build_per_organization], ids=["per_project", "per_organization"]
+)
+def test_benchmark_build_reports(factories, default_organization, project_count, build, benchmark):
+    projects = [
+        factories.create_project(
+            organization=default_organization,
+            date_added=INTERVAL[0] - timedelta(days=90),
+        )
+        for _ in range(project_count)
+    ]
+
+    benchmark.pedantic(build, args=(projects,), rounds=3)
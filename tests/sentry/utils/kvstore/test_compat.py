@@ -33,3 +33,14 @@ def test_redis_cache_compat() -> None:
     cache_backend.delete("key")
     assert cache_backend.get("key") is None
     assert redis_backend.get("key") is None
+
+
+def test_redis_cache_raw() -> None:
+    redis = Redis(db=6)
+    cache = CommonRedisCache(redis, version=5, prefix="test")
+
+    CacheKVStorage(cache, raw=True).set("key", b"[1, 2, 3]")
+    assert CacheKVStorage(cache).get("key") == [1, 2, 3]
+    assert CacheKVStorage(cache, raw=True).get("key") == b"[1, 2, 3]"
+
+    CacheKVStorage(cache).delete("key")
@@ -0,0 +1,133 @@
+from unittest.mock import Mock
+
+from sentry.utils.batching_kafka_consumer import (
+    AbstractBatchWorker,
+    BatchingKafkaConsumer,
+    KafkaConsumerFacade,
+    PendingFlush,
+)
+
+
+class FakeConsumer(KafkaConsumerFacade):
+    def __init__(self):
+        self.messages = []
+        self.commits = []
+
+    def subscribe(self, topics, on_assign=None, on_revoke=None):
+        pass
+
+    def poll(self, timeout):
+        return self.messages.pop(0) if self.messages else None
+
+    def commit(self, *args, **kwargs):
+        offsets = kwargs.get("offsets")
+        self.commits.append(
+            None if offsets is None else [(tp.topic, tp.partition, tp.offset) for tp in offsets]
+        )
+        return offsets or []
+
+    def close(self):
+        pass
+
+
+class FakePendingFlush(PendingFlush):
+    def __init__(self):
+        self.completed = False
+
+    def wait(self, timeout):
+        return self.completed
+
+
+class FakeWorker(AbstractBatchWorker):
+    def __init__(self, pipelined):
+        self.pipelined = pipelined
+        self.flushed = []
+
+    def process_message(self, message):
+        return message.value()
+
+    def flush_batch(self, batch):
+        pending = FakePendingFlush() if self.pipelined else None
+        self.flushed.append((list(batch), pending))
+        return pending
+
+    def shutdown(self):
+        pass
+
+
+def make_message(offset):
+    message = Mock()
+    message.error.return_value = None
+    message.topic.return_value = "topic"
+    message.partition.return_value = 0
+    message.offset.return_value = offset
+    message.value.return_value = offset
+    return message
+
+
+def make_consumer(worker, **kwargs):
+    return BatchingKafkaConsumer(
+        "topic",
+        worker=worker,
+        max_batch_size=2,
+        max_batch_time=1000,
+        consumer=FakeConsumer(),
+        **kwargs,
+    )
+
+
+def test_synchronous_flush():
+    worker = FakeWorker(pipelined=False)
+    consumer = make_consumer(worker)
+    consumer.consumer.messages = [make_message(i) for i in range(4)]
+
+    for _ in range(5):
+        consumer._run_once()
+
+    assert [batch for batch, _ in worker.flushed] == [[0, 1], [2, 3]]
+    # offsets are committed from the consumer position after each flush
+    assert consumer.consumer.commits == [None, None]
+
+
+def test_pipelined_flush():
+    worker = FakeWorker(pipelined=True)
+    consumer = make_consumer(worker, max_pending_flushes=2)
+    consumer.consumer.messages = [make_message(i) for i in range(4)]
+
+    for _ in range(5):
+        consumer._run_once()
+
+    # both batches have been flushed, but none has been committed
+    assert [batch for batch, _ in worker.flushed] == [[0, 1], [2, 3]]
+    assert consumer.consumer.commits == []
+
+    # batches are committed in order, once their flush has completed
+    worker.flushed[1][1].completed = True
+    consumer._run_once()
+    assert consumer.consumer.commits == []
+
+    worker.flushed[0][1].completed = True
+    consumer._run_once()
+    assert consumer.consumer.commits == [[("topic", 0, 2)], [("topic", 0, 4)]]
+
+
+def test_pipelined_flush_backpressure():
+    worker = FakeWorker(pipelined=True)
+    consumer = make_consumer(worker, max_pending_flushes=1)
+    consumer.consumer.messages = [make_message(i) for i in range(4)]
+
+    for _ in range(3):
+        consumer._run_once()
+
+    first_flush = worker.flushed[0][1]
+
+    # the second batch can only be flushed once the first one has completed
+    def wait(timeout):
+        return len(worker.flushed) == 2
+
+    first_flush.wait = wait
+    consumer._run_once()
+    consumer._run_once()
+
+    assert len(worker.flushed) == 2
+    assert consumer.consumer.commits == [[("topic", 0, 2)]]
@@ -0,0 +1,58 @@
+from sentry.utils.lru import LRUCache
+
+
+def test_get_and_set():
+    cache = LRUCache(2)
+    assert cache.get("a") is None
+    assert cache.get("a", 0) == 0
+
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+    assert cache.get_many(["a", "b", "c"]) == {"a": 1, "b": 2}
+    assert (cache.hits, cache.misses) == (3, 3)
+
+
+def test_eviction():
+    cache = LRUCache(2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")  # "b" is now the least recently used entry
+    cache.set("c", 3)
+
+    assert "b" not in cache
+    assert cache.get_many(["a", "b", "c"]) == {"a": 1, "c": 3}
+    assert cache.evictions == 1
+    assert len(cache) == 2
+
+
+def test_weigher():
+    cache = LRUCache(10, weigher=lambda key, value: len(value))
+    cache.set("a", b"12345")
+    cache.set("b", b"1234")
+    assert cache.weight == 9
+
+    cache.set("c", b"12")
+    assert "a" not in cache
+    assert cache.weight == 6
+
+    # entries that would never fit are not stored
+    cache.set("d", b"12345678901")
+    assert "d" not in cache
+    assert cache.weight == 6
+
+    cache.set("b", b"1")
+    assert cache.weight == 3
+
+    cache.delete("b")
+    assert cache.weight == 2
+
+    cache.clear()
+    assert cache.weight == 0
+    assert len(cache) == 0
+
+
+def test_disabled():
+    cache = LRUCache(0)
+    cache.set("a", 1)
+    assert cache.get("a") is None
@@ -0,0 +1,117 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from sentry.utils.stages import StageGraph, StageTimings
+
+
+def test_runs_in_declaration_order():
+    calls = []
+    graph = StageGraph("test")
+    graph.add("a", lambda results: calls.append("a") or 1)
+    graph.add("b", lambda results: calls.append("b") or results["a"] + 1, depends_on=["a"])
+    graph.add("c", lambda results: calls.append("c"))
+
+    assert graph.run() == {"a": 1, "b": 2, "c": None}
+    assert calls == ["a", "b", "c"]
+
+
+def test_runs_independent_stages_concurrently():
+    barrier = threading.Barrier(2, timeout=5)
+
+    def independent(results):
+        # Only passes if both independent stages run at the same time.
+        barrier.wait()
+        return True
+
+    graph = StageGraph("test", executor=ThreadPoolExecutor(max_workers=2))
+    graph.add("a", independent)
+    graph.add("b", independent)
+    graph.add("c", lambda results: results["a"] and results["b"], depends_on=["a", "b"])
+
+    assert graph.run() == {"a": True, "b": True, "c": True}
+
+
+def test_runs_inline_without_slots():
+    threads = {}
+
+    def record_thread(name):
+        def stage(results):
+            threads[name] = threading.current_thread()
+
+        return stage
+
+    executor = ThreadPoolExecutor(max_workers=2)
+    slots = threading.BoundedSemaphore(2)
+    graph = StageGraph("test", executor=executor, slots=slots)
+    graph.add("a", record_thread("a"))
+    graph.add("b", record_thread("b"))
+
+    assert slots.acquire(blocking=False)
+    assert slots.acquire(blocking=False)
+    graph.run()
+    # All slots are taken, so both stages run on the calling thread.
+    assert threads == {"a": threading.current_thread(), "b": threading.current_thread()}
+
+    slots.release()
+    slots.release()
+    graph.run()
+    assert threading.current_thread() not in threads.values()
+
+    # Slots are returned once stages complete.
+    executor.shutdown(wait=True)
+    assert slots.acquire(blocking=False)
+    assert slots.acquire(blocking=False)
+
+
+def test_error():
+    calls = []
+
+    def fail(results):
+        raise ValueError("failed")
+
+    graph = StageGraph("test", executor=ThreadPoolExecutor(max_workers=2))
+    graph.add("a", fail)
+    graph.add("b", lambda results: calls.append("b"), depends_on=["a"])
+
+    with pytest.raises(ValueError):
+        graph.run()
+    assert calls == []
+
+
+def test_invalid_dependencies():
+    graph = StageGraph("test")
+    graph.add("a", lambda results: None)
+    graph.add("b", lambda results: None, budget=1.0)
+
+    with pytest.raises(ValueError):
+        graph.add("a", lambda results: None)
+    with pytest.raises(ValueError):
+        graph.add("c", lambda results: None, depends_on=["d"])
+    with pytest.raises(ValueError):
+        graph.add("c", lambda results: None, depends_on=["b"])
+
+
+def test_deferral():
+    timings = StageTimings(alpha=0.5)
+    deferred = []
+    graph = StageGraph("test", timings=timings, defer=deferred.append)
+    graph.add("slow", lambda results: True, budget=1.0)
+
+    # No measurements yet, so the stage runs.
+    assert graph.run() == {"slow": True}
+    assert deferred == []
+
+    timings.record("slow", 4.0)
+    timings.record("slow", 4.0)
+    assert timings.get("slow") == pytest.approx(3.0, abs=0.01)
+    assert graph.run() == {"slow": None}
+    assert deferred == ["slow"]
+
+    # Deferring decays the average until the stage is run again.
+    assert timings.get("slow") == pytest.approx(1.5, abs=0.01)
+    assert graph.run() == {"slow": None}
+    assert timings.get("slow") == pytest.approx(0.75, abs=0.01)
+    assert graph.run() == {"slow": True}
+    assert deferred == ["slow", "slow"]
@@ -11,6 +11,7 @@ from django.conf import settings
 from django.test import override_settings
 
 from sentry.sentry_metrics.indexer.indexer_consumer import (
+    BatchDelivery,
     MetricsIndexerWorker,
     get_metrics_consumer,
 )
@@ -78,17 +79,20 @@ class MetricsIndexerWorkerTest(TestCase):
         mock_message.value = MagicMock(return_value=json.dumps(metrics_payload))
 
         parsed = metrics_worker.process_message(mock_message)
-        assert parsed["tags"] == {
-            PGStringIndexer().resolve(string=k): PGStringIndexer().resolve(string=str(v))
-            for k, v in payload["tags"].items()
-        }
-        assert parsed["metric_id"] == PGStringIndexer().resolve(string=payload["name"])
 
         if with_exception:
             with pytest.raises(Exception, match="didn't get all the callbacks: 1 left"):
                 metrics_worker.flush_batch([parsed])
         else:
             metrics_worker.flush_batch([parsed])
+
+        assert parsed["tags"] == {
+            PGStringIndexer().resolve(string=k): PGStringIndexer().resolve(string=str(v))
+            for k, v in payload["tags"].items()
+        }
+        assert parsed["metric_id"] == PGStringIndexer().resolve(string=payload["name"])
+
+        if not with_exception:
             producer.produce.assert_called_with(
                 topic="snuba-metrics",
                 key=None,
@@ -96,6 +100,63 @@ class MetricsIndexerWorkerTest(TestCase):
                 on_delivery=metrics_worker.callback,
             )
 
+    @patch("sentry.sentry_metrics.indexer.indexer_consumer.process_indexed_metrics")
+    def test_pipelined(self, mock_task):
+        producer = MagicMock()
+        producer.__len__.return_value = 0
+        callbacks = []
+        producer.produce.side_effect = lambda **kwargs: callbacks.append(kwargs["on_delivery"])
+        producer.poll.side_effect = lambda timeout: [callback(None, None) for callback in callbacks]
+
+        metrics_worker = MetricsIndexerWorker(producer=producer, pipelined=True)
+
+        mock_message = Mock()
+        mock_message.value = MagicMock(return_value=json.dumps(payload))
+        parsed = metrics_worker.process_message(mock_message)
+
+        delivery = metrics_worker.flush_batch([parsed])
+        assert not producer.flush.called
+        assert len(callbacks) == 1
+        assert delivery.remaining == 1
+        assert not mock_task.apply_async.called
+
+        # waiting polls the producer, which triggers the delivery callbacks
+        assert delivery.wait(1.0)
+        assert delivery.remaining == 0
+        mock_task.apply_async.assert_called_once_with(
+            kwargs={
+                "messages": [{"tags": parsed["tags"], "name": "session", "org_id": 1}],
+            }
+        )
+
+    def test_pipelined_delivery_completed_after_deadline(self):
+        producer = MagicMock()
+        callbacks = []
+        producer.poll.side_effect = lambda timeout: [callback(None, None) for callback in callbacks]
+
+        delivery = BatchDelivery(producer, 1, on_complete=MagicMock(), timeout=0)
+        callbacks.append(delivery.callback)
+
+        # the delivery completed before the deadline, but its callback has
+        # not been served yet
+        assert delivery.wait(0)
+        assert delivery.remaining == 0
+
+    def test_pipelined_delivery_error(self):
+        producer = MagicMock()
+        producer.__len__.return_value = 0
+        error = Mock()
+        error.str.return_value = "delivery failed"
+        producer.produce.side_effect = lambda **kwargs: kwargs["on_delivery"](error, None)
+
+        metrics_worker = MetricsIndexerWorker(producer=producer, pipelined=True)
+        mock_message = Mock()
+        mock_message.value = MagicMock(return_value=json.dumps(payload))
+        delivery = metrics_worker.flush_batch([metrics_worker.process_message(mock_message)])
+
+        with pytest.raises(Exception, match="delivery failed"):
+            delivery.wait(1.0)
+
 
 class MetricsIndexerConsumerTest(TestCase):
     def _get_producer(self, topic):
@@ -209,5 +270,28 @@ class MetricsIndexerConsumerTest(TestCase):
             def value(self):
                 return json.dumps(payload_without_tags)
 
-        translated = MetricsIndexerWorker(None).process_message(MockMessage())
+        worker = MetricsIndexerWorker(None)
+        translated = worker.process_message(MockMessage())
+        worker.index_batch([translated])
         assert translated["tags"] == {}
+
+    def test_index_batch(self):
+        """Assert that all messages of a batch are indexed with a single lookup"""
+        worker = MetricsIndexerWorker(None)
+        batch = [
+            {**payload, "tags": {**payload["tags"], "release": f"sentry-test@1.0.{i}"}}
+            for i in range(3)
+        ]
+
+        with patch(
+            "sentry.sentry_metrics.indexer.indexer_consumer.indexer.bulk_record",
+            wraps=PGStringIndexer().bulk_record,
+        ) as bulk_record:
+            worker.index_batch(batch)
+
+        assert bulk_record.call_count == 1
+        for i, message in enumerate(batch):
+            assert message["metric_id"] == PGStringIndexer().resolve(string="session")
+            assert message["tags"][PGStringIndexer().resolve(string="release")] == (
+                PGStringIndexer().resolve(string=f"sentry-test@1.0.{i}")
+            )